@@ -0,0 +1,72 @@
+"""Compare thread and process throughput of pygexml.batch.load_many.
+
+Run on a regular and on a free-threaded build (e.g. python3.13t) to compare:
+
+    python benchmarks/bench_batch.py --files 200 --lines 2000 --workers 8
+"""
+
+import argparse
+import sys
+import sysconfig
+import tempfile
+import time
+from pathlib import Path
+
+from pygexml.batch import ExecutorKind, load_many
+
+LINE = """
+            <TextLine id="l{i}">
+                <Coords points="{x},{y} {x2},{y} {x2},{y2} {x},{y2}"/>
+                <TextEquiv><Unicode>line number {i} with some text</Unicode></TextEquiv>
+            </TextLine>"""
+
+
+def write_corpus(directory: Path, files: int, lines: int) -> list[Path]:
+    body = "".join(
+        LINE.format(i=i, x=10, y=i * 20, x2=1000, y2=i * 20 + 15) for i in range(lines)
+    )
+    content = f"""<?xml version='1.0' encoding='utf-8'?>
+<PcGts xmlns="http://schema.primaresearch.org/PAGE/gts/pagecontent/2019-07-15">
+    <Page imageFilename="a.jpg" imageWidth="1100" imageHeight="{lines * 20 + 20}">
+        <TextRegion id="r">
+            <Coords points="0,0 1100,0 1100,{lines * 20} 0,{lines * 20}"/>{body}
+        </TextRegion>
+    </Page>
+</PcGts>
+"""
+    paths = [directory / f"page-{n}.xml" for n in range(files)]
+    for path in paths:
+        path.write_text(content, encoding="utf-8")
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--lines", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    print(f"Python {sys.version.split()[0]}, free-threaded build: {free_threaded}")
+    print(f"GIL enabled: {gil}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_corpus(Path(tmp), args.files, args.lines)
+        total_lines = args.files * args.lines
+        executors: list[ExecutorKind] = ["process", "thread"]
+        for executor in executors:
+            start = time.perf_counter()
+            for _, result in load_many(paths, workers=args.workers, executor=executor):
+                if isinstance(result, Exception):
+                    raise result
+            seconds = time.perf_counter() - start
+            print(
+                f"{executor:>8}: {seconds:.2f}s, {args.files / seconds:.1f} files/s, "
+                f"{total_lines / seconds:.0f} lines/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
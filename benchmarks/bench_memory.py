@@ -0,0 +1,54 @@
+"""Measure the memory footprint of the pygexml data model.
+
+Parses a synthetic PAGE-XML document and reports the Python heap used by the
+resulting Page, scaled to one million text lines:
+
+    python benchmarks/bench_memory.py --lines 100000 --points 20
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+
+from pygexml.page import Page
+
+
+def synthetic_xml(lines: int, points: int) -> bytes:
+    coords = " ".join(f"{10 + i * 5},{20 + i % 7}" for i in range(points))
+    body = "".join(
+        f'<TextLine id="l{i}"><Coords points="{coords}"/>'
+        f"<TextEquiv><Unicode>line number {i} with some text</Unicode></TextEquiv>"
+        f"</TextLine>"
+        for i in range(lines)
+    )
+    return (
+        '<PcGts><Page imageFilename="a.jpg" imageWidth="1000" imageHeight="1000">'
+        f'<TextRegion id="r"><Coords points="0,0 1000,0 1000,1000 0,1000"/>{body}'
+        "</TextRegion></Page></PcGts>"
+    ).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--points", type=int, default=4)
+    args = parser.parse_args()
+
+    xml = synthetic_xml(args.lines, args.points)
+    gc.collect()
+    tracemalloc.start()
+    page = Page.from_xml_bytes(xml)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    line = next(iter(page.regions["r"].textlines.values()))
+    print(f"Python {sys.version.split()[0]}, {args.points} points per line")
+    print(f"TextLine has __dict__: {hasattr(line, '__dict__')}")
+    # bytes per line equals megabytes per million lines
+    print(f"{current / args.lines:.0f} MB per million lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Benchmark the hot paths of parsing, serialization, SVG and geometry.
+
+Runs each benchmark on small, medium and huge synthetic pages and reports
+throughput (lines per second) and the peak Python heap traced by tracemalloc,
+plus the import time of pygexml. As tracemalloc misses the allocations of
+libxml2, the parse benchmarks also report the growth of the peak resident set
+size, measured in a separate process. Results are written as JSON for
+benchmarks/compare.py:
+
+    python benchmarks/bench_suite.py --output before.json
+    git checkout other-branch
+    python benchmarks/bench_suite.py --output after.json
+    python benchmarks/compare.py before.json after.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any
+
+from lxml import etree
+
+from documents import SIZES, line_count, make_page
+from pygexml.geometry import Box, Point, Polygon
+from pygexml.page import Coords, Page, TextRegion
+from pygexml.svg import page_to_svg_string
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None  # type: ignore
+
+FORMAT_VERSION = 1
+
+# Either a function, or a setup function and a function that is called with
+# the setup's result, for operations whose inputs cache results. The setup
+# runs before each call and isn't measured.
+Benchmark = Callable[[], object] | tuple[Callable[[], Any], Callable[[Any], object]]
+
+# Parse benchmarks whose peak resident set size is measured, with functions
+# for writing and parsing their input
+RSS_BENCHMARKS: dict[str, tuple[Callable[[Page], bytes], Callable[[bytes], Page]]] = {
+    "page_from_xml": (Page.to_xml_bytes, Page.from_xml_bytes),
+    "page_from_alto": (Page.to_alto_bytes, Page.from_alto_bytes),
+    "page_from_json": (lambda page: page.to_json().encode(), Page.from_json),
+}
+
+
+def benchmarks(size: str) -> dict[str, Benchmark]:
+    # Inputs are prepared up front, so that only the operation is measured
+    page = make_page(size)
+    page_xml = page.to_xml_bytes()
+    alto_xml = page.to_alto_bytes()
+    json_str = page.to_json()
+    points = [
+        str(line.coords)
+        for region in page.regions.values()
+        for line in region.textlines.values()
+    ]
+    region_elements = [
+        element
+        for element in etree.fromstring(page_xml).iter()
+        if etree.QName(element).localname == "TextRegion"
+    ]
+    polygons = [
+        line.coords.polygon
+        for region in page.regions.values()
+        for line in region.textlines.values()
+    ]
+    box = Box(Point(500, 0), Point(1000, page.image.height or 0))
+
+    return {
+        "coords_parse": lambda: [Coords.parse(p) for p in points],
+        "textregion_from_xml": lambda: [
+            TextRegion.from_xml(element) for element in region_elements
+        ],
+        "page_from_xml": lambda: Page.from_xml_bytes(page_xml),
+        "page_from_alto": lambda: Page.from_alto_bytes(alto_xml),
+        "page_to_xml": page.to_xml_bytes,
+        "page_to_alto": page.to_alto_bytes,
+        "page_to_json": page.to_json,
+        "page_from_json": lambda: Page.from_json(json_str),
+        # Polygons cache their string and bounding box, so these run on a
+        # fresh page and fresh polygons
+        "page_to_svg_string": (lambda: Page.from_json(json_str), page_to_svg_string),
+        # bounding boxes are cached, so this includes creating the polygons
+        "polygon_bounding_box": lambda: [
+            Polygon.from_xy(polygon.xy).bounding_box() for polygon in polygons
+        ],
+        "polygon_intersects_box": (
+            lambda: [Polygon.from_xy(polygon.xy) for polygon in polygons],
+            lambda fresh: [polygon.intersects_box(box) for polygon in fresh],
+        ),
+    }
+
+
+def prepare(benchmark: Benchmark) -> Callable[[], object]:
+    # Runs the setup, if any, and returns the call to measure
+    if isinstance(benchmark, tuple):
+        setup, function = benchmark
+        value = setup()
+        return lambda: function(value)
+    return benchmark
+
+
+def run(benchmark: Benchmark, number: int) -> float:
+    # Seconds spent in number calls, excluding setup
+    if isinstance(benchmark, tuple):
+        setup, function = benchmark
+        inputs = [setup() for _ in range(number)]
+        start = time.perf_counter()
+        for value in inputs:
+            function(value)
+    else:
+        start = time.perf_counter()
+        for _ in range(number):
+            benchmark()
+    return time.perf_counter() - start
+
+
+def measure(benchmark: Benchmark, min_time: float, repeat: int) -> float:
+    # Best of repeat rounds, each running long enough for a stable timing
+    number = 1
+    while run(benchmark, number) < min_time / repeat:
+        number *= 2
+    return min(run(benchmark, number) / number for _ in range(repeat))
+
+
+def peak_memory(benchmark: Benchmark) -> int:
+    # Peak of the Python heap, without memory allocated by libxml2
+    call = prepare(benchmark)
+    tracemalloc.start()
+    try:
+        result = call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def _max_rss() -> int:
+    # On Linux, ru_maxrss is inherited across fork and exec, so it would start
+    # at the peak of the benchmark process. VmHWM belongs to the new process.
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024  # in KiB
+    except OSError:
+        pass
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024  # KiB elsewhere
+
+
+def peak_rss(name: str, page: Page) -> int | None:
+    # Growth of the peak resident set size of a fresh process when parsing,
+    # including memory allocated by libxml2. The process only reads the input,
+    # so that preparing it doesn't raise the peak before parsing.
+    if resource is None:
+        return None
+    write, _ = RSS_BENCHMARKS[name]
+    with tempfile.TemporaryDirectory() as directory:
+        input_file = Path(directory) / "input"
+        input_file.write_bytes(write(page))
+        output = subprocess.run(
+            [sys.executable, __file__, "--rss-of", name, str(input_file)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    return int(output)
+
+
+def _print_rss_of(name: str, input_file: Path) -> None:
+    _, parse = RSS_BENCHMARKS[name]
+    data = input_file.read_bytes()
+    before = _max_rss()
+    parse(data)
+    print(_max_rss() - before)
+
+
+def import_time(module: str, repeat: int) -> float:
+    statement = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - start)"
+    )
+    return min(
+        float(
+            subprocess.run(
+                [sys.executable, "-c", statement],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        )
+        for _ in range(repeat)
+    )
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", nargs="+", choices=SIZES, default=list(SIZES))
+    parser.add_argument("--filter", default="*", help="glob for benchmark names")
+    parser.add_argument("--min-time", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="JSON file for the results")
+    parser.add_argument("--rss-of", nargs=2, help=argparse.SUPPRESS)  # peak_rss
+    args = parser.parse_args()
+    if args.rss_of is not None:
+        _print_rss_of(args.rss_of[0], Path(args.rss_of[1]))
+        return
+
+    results: dict[str, dict[str, Any]] = {}
+    for module in ("pygexml", "pygexml.page", "pygexml.svg"):
+        name = f"import/{module}"
+        if fnmatch(name, args.filter):
+            seconds = import_time(module, max(args.repeat, 5))
+            results[name] = {"seconds": seconds}
+            print(f"{name:<40} {seconds * 1000:10.1f} ms")
+
+    for size in args.sizes:
+        page = make_page(size)
+        lines = line_count(page)
+        for bench, function in benchmarks(size).items():
+            name = f"{bench}/{size}"
+            if not fnmatch(name, args.filter):
+                continue
+            seconds = measure(function, args.min_time, args.repeat)
+            peak = peak_memory(function)
+            results[name] = {
+                "seconds": seconds,
+                "lines_per_second": lines / seconds,
+                "peak_bytes": peak,
+            }
+            rss = peak_rss(bench, page) if bench in RSS_BENCHMARKS else None
+            if rss is not None:
+                results[name]["peak_rss_bytes"] = rss
+            print(
+                f"{name:<40} {seconds * 1000:10.2f} ms "
+                f"{lines / seconds:14,.0f} lines/s {peak / 2**20:10.1f} MiB heap"
+                + (f" {rss / 2**20:8.1f} MiB RSS" if rss is not None else "")
+            )
+
+    if args.output is not None:
+        document = {
+            "version": FORMAT_VERSION,
+            "created": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        args.output.write_text(json.dumps(document, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
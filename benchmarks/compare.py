@@ -0,0 +1,83 @@
+"""Compare two result files of benchmarks/bench_suite.py.
+
+Prints the time of each benchmark in both runs with the ratio new/old, and
+the ratio of peak memory, which is the resident set size where both runs
+measured it and the Python heap otherwise. Exits with status 1 if a
+benchmark got slower than the threshold allows:
+
+    python benchmarks/compare.py before.json after.json --threshold 1.1
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+FORMAT_VERSION = 1
+
+
+def load(file: Path) -> dict[str, Any]:
+    document: dict[str, Any] = json.loads(file.read_text())
+    if document.get("version") != FORMAT_VERSION:
+        sys.exit(f"{file}: unsupported format version {document.get('version')}")
+    return document
+
+
+def describe(document: dict[str, Any]) -> str:
+    commit = (document.get("commit") or "unknown commit")[:10]
+    return f"{commit}, Python {document['python']}, {document['created']}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("old", type=Path)
+    parser.add_argument("new", type=Path)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.1,
+        help="time ratio new/old above which a benchmark counts as regression",
+    )
+    args = parser.parse_args()
+
+    old, new = load(args.old), load(args.new)
+    print(f"old: {describe(old)}")
+    print(f"new: {describe(new)}")
+    print()
+    print(f"{'benchmark':<40} {'old ms':>10} {'new ms':>10} {'ratio':>7} {'mem':>7}")
+
+    regressions = []
+    for name, result in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            print(f"{name:<40} {'':>10} {result['seconds'] * 1000:10.2f}   (new)")
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        memory = ""
+        for key in ("peak_rss_bytes", "peak_bytes"):
+            if before.get(key) and key in result:
+                memory = f"{result[key] / before[key]:7.2f}"
+                break
+        marker = ""
+        if ratio > args.threshold:
+            marker = "  slower"
+            regressions.append(name)
+        elif ratio < 1 / args.threshold:
+            marker = "  faster"
+        print(
+            f"{name:<40} {before['seconds'] * 1000:10.2f} "
+            f"{result['seconds'] * 1000:10.2f} {ratio:7.2f} {memory:>7}{marker}"
+        )
+    for name in sorted(old["results"].keys() - new["results"].keys()):
+        print(f"{name:<40} (missing in new results)")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.2f}x")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
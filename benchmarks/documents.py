@@ -0,0 +1,30 @@
+"""Synthetic pages of different sizes for the benchmarks.
+
+Pages come from pygexml.synth with a fixed seed, so results of different
+commits are measured on the same content.
+"""
+
+from pygexml.page import Page
+from pygexml.synth import Layout, generate_page
+
+SIZES = {
+    "small": Layout(columns=1, regions_per_column=2, lines_per_region=10),
+    "medium": Layout(
+        columns=2, regions_per_column=5, lines_per_region=100, vertices=16
+    ),
+    "huge": Layout(
+        height=20_000,
+        columns=4,
+        regions_per_column=10,
+        lines_per_region=500,
+        vertices=24,
+    ),
+}
+
+
+def make_page(size: str) -> Page:
+    return generate_page(SIZES[size], seed=0)
+
+
+def line_count(page: Page) -> int:
+    return sum(len(region.textlines) for region in page.regions.values())
@@ -1,4 +1,74 @@
-from . import geometry, image, page, svg, strategies
-from .page import Page
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["geometry", "image", "page", "svg", "strategies", "Page"]
+if TYPE_CHECKING:
+    from . import (
+        aio,
+        archive,
+        batch,
+        cache,
+        geometry,
+        image,
+        index,
+        instrument,
+        page,
+        serialization,
+        spatial,
+        store,
+        svg,
+        strategies,
+        synth,
+    )
+    from .page import Page
+
+__all__ = [
+    "aio",
+    "archive",
+    "batch",
+    "cache",
+    "geometry",
+    "image",
+    "index",
+    "instrument",
+    "page",
+    "serialization",
+    "spatial",
+    "store",
+    "svg",
+    "strategies",
+    "synth",
+    "Page",
+]
+
+# Submodules are imported on first access, so that e.g. `from pygexml import
+# Page` doesn't pay for hypothesis (strategies) or the SVG module.
+_SUBMODULES = {
+    "aio",
+    "archive",
+    "batch",
+    "cache",
+    "geometry",
+    "image",
+    "index",
+    "instrument",
+    "page",
+    "serialization",
+    "spatial",
+    "store",
+    "svg",
+    "strategies",
+    "synth",
+}
+_MEMBERS = {"Page": "page"}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        return import_module(f".{name}", __name__)
+    if name in _MEMBERS:
+        return getattr(import_module(f".{_MEMBERS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
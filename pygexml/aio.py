@@ -0,0 +1,166 @@
+import asyncio
+import contextvars
+from collections import deque
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from threading import Lock
+from typing import Any, TypeVar, get_args, overload
+
+from .batch import (
+    Format,
+    Result,
+    ValidatedResult,
+    _check_options,
+    _load_validated,
+    load,
+)
+from .page import ValidationMode
+
+# Blocking work (parsing, rendering) runs on a shared executor, so that it
+# doesn't block the event loop. By default this is a thread pool: lxml
+# releases the GIL while parsing, and pages don't need to be pickled.
+
+T = TypeVar("T")
+
+
+class AioError(Exception):
+    pass
+
+
+_lock = Lock()
+_executor: Executor | None = None
+_owned = False
+
+
+def configure(max_workers: int | None = None, executor: Executor | None = None) -> None:
+    # Either a thread pool of the given size, or an executor owned by the
+    # caller, e.g. a process pool. A previous pool of ours is shut down.
+    global _executor, _owned
+    if executor is not None and max_workers is not None:
+        raise AioError("Either max_workers or executor can be given")
+    if max_workers is not None and max_workers < 1:
+        raise AioError("max_workers must be positive")
+    with _lock:
+        previous = _executor if _owned else None
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers, thread_name_prefix="pygexml")
+            _owned = True
+        else:
+            _owned = False
+        _executor = executor
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def get_executor() -> Executor:
+    global _executor, _owned
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(thread_name_prefix="pygexml")
+            _owned = True
+        return _executor
+
+
+def shutdown(wait: bool = True) -> None:
+    global _executor, _owned
+    with _lock:
+        executor = _executor if _owned else None
+        _executor, _owned = None, False
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+async def run(function: Callable[..., T], *args: Any) -> T:
+    # Like asyncio.to_thread, threads run the function in a copy of the
+    # caller's context, e.g. with its validation mode and recorder. Contexts
+    # can't be sent to other processes.
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    call = partial(function, *args)
+    if isinstance(executor, ThreadPoolExecutor):
+        call = partial(contextvars.copy_context().run, call)
+    return await loop.run_in_executor(executor, call)
+
+
+async def _load(path: Path, format: Format) -> Result:
+    try:
+        return path, await run(load, path, format)
+    except Exception as error:
+        return path, error
+
+
+@overload
+def aload_many(
+    paths: Iterable[Path | str],
+    format: Format = "page",
+    limit: int = 8,
+    ordered: bool = True,
+    validation: None = None,
+) -> AsyncGenerator[Result, None]: ...
+
+
+@overload
+def aload_many(
+    paths: Iterable[Path | str],
+    format: Format = "page",
+    limit: int = 8,
+    ordered: bool = True,
+    *,
+    validation: ValidationMode,
+) -> AsyncGenerator[ValidatedResult, None]: ...
+
+
+def aload_many(
+    paths: Iterable[Path | str],
+    format: Format = "page",
+    limit: int = 8,
+    ordered: bool = True,
+    validation: ValidationMode | None = None,
+) -> AsyncGenerator[Result, None] | AsyncGenerator[ValidatedResult, None]:
+    # Keeps at most limit files in flight and yields (path, page or
+    # exception), or (path, page or exception, diagnostics) with a validation
+    # mode. Closing the iterator or cancelling the consuming task cancels
+    # loads that haven't started yet; running ones are discarded.
+    _check_options("thread", format)
+    if limit < 1:
+        raise AioError("limit must be positive")
+    if validation is not None:
+        if validation not in get_args(ValidationMode):
+            raise AioError(f"Unknown validation mode: {validation}")
+        return _aload_many(
+            iter(paths),
+            lambda path: run(_load_validated, path, format, validation),
+            limit,
+            ordered,
+        )
+    return _aload_many(iter(paths), lambda path: _load(path, format), limit, ordered)
+
+
+async def _aload_many(
+    remaining: Iterator[Path | str],
+    load_one: Callable[[Path], Awaitable[T]],
+    limit: int,
+    ordered: bool,
+) -> AsyncGenerator[T, None]:
+    tasks: deque[asyncio.Task[T]] = deque()
+    try:
+        while True:
+            for path in remaining:
+                tasks.append(asyncio.ensure_future(load_one(Path(path))))
+                if len(tasks) >= limit:
+                    break
+            if not tasks:
+                return
+            if ordered:
+                task = tasks[0]
+                await asyncio.wait([task])
+            else:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                task = next(task for task in tasks if task in done)
+            tasks.remove(task)
+            yield task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
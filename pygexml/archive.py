@@ -0,0 +1,295 @@
+import mmap
+import sys
+from array import array
+from collections.abc import Iterator, Mapping
+from os import SEEK_END
+from pathlib import Path
+from struct import Struct, error as StructError
+from types import TracebackType
+from typing import BinaryIO
+
+from .geometry import GeometryError, Polygon
+from .image import Image
+from .page import Coords, Page, PageXMLError, TextLine, TextRegion
+
+# Archive layout: header, encoded pages, index, footer. The footer points to
+# the index, which maps keys to (offset, length) of the encoded pages. Readers
+# use the last valid footer, so appending leaves the previous index and footer
+# in place and an interrupted append leaves the previous contents readable.
+# All integers are little endian, coordinates are stored as int32.
+
+MAGIC = b"PGXA"
+VERSION = 1
+
+_HEADER = Struct("<4sH")
+_FOOTER = Struct("<Q4s")
+_U32 = Struct("<I")
+_OPTIONAL_INT = Struct("<?q")
+_INDEX_ENTRY = Struct("<QI")
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def _write_str(buffer: bytearray, value: str) -> None:
+    data = value.encode("utf-8")
+    buffer += _U32.pack(len(data))
+    buffer += data
+
+
+def _write_optional_int(buffer: bytearray, value: int | None) -> None:
+    buffer += _OPTIONAL_INT.pack(value is not None, value or 0)
+
+
+def _write_coords(buffer: bytearray, coords: Coords) -> None:
+    xy = array("i", coords.polygon.xy)
+    if sys.byteorder == "big":
+        xy.byteswap()
+    buffer += _U32.pack(len(xy))
+    buffer += xy.tobytes()
+
+
+def encode_page(page: Page) -> bytes:
+    # Dictionaries are restored keyed by the IDs of their values
+    buffer = bytearray()
+    try:
+        _write_str(buffer, page.image.filename)
+        _write_optional_int(buffer, page.image.width)
+        _write_optional_int(buffer, page.image.height)
+        buffer += _U32.pack(len(page.regions))
+        for region in page.regions.values():
+            _write_str(buffer, region.id)
+            _write_coords(buffer, region.coords)
+            buffer += _U32.pack(len(region.textlines))
+            for line in region.textlines.values():
+                _write_str(buffer, line.id)
+                _write_coords(buffer, line.coords)
+                _write_str(buffer, line.text)
+    except (OverflowError, StructError):
+        raise ArchiveError("Value out of range")
+    return bytes(buffer)
+
+
+class _Reader:
+    def __init__(self, data: memoryview) -> None:
+        self.data = data
+        self.offset = 0
+
+    def u32(self) -> int:
+        (value,) = _U32.unpack_from(self.data, self.offset)
+        self.offset += _U32.size
+        return int(value)
+
+    def _check(self, length: int) -> None:
+        if self.offset + length > len(self.data):
+            raise ArchiveError("Corrupt page data")
+
+    def str(self) -> str:
+        length = self.u32()
+        self._check(length)
+        value = str(self.data[self.offset : self.offset + length], "utf-8")
+        self.offset += length
+        return value
+
+    def optional_int(self) -> int | None:
+        present, value = _OPTIONAL_INT.unpack_from(self.data, self.offset)
+        self.offset += _OPTIONAL_INT.size
+        return int(value) if present else None
+
+    def coords(self) -> Coords:
+        length = self.u32()
+        xy = array("i")
+        self._check(length * xy.itemsize)
+        xy.frombytes(self.data[self.offset : self.offset + length * xy.itemsize])
+        if sys.byteorder == "big":
+            xy.byteswap()
+        self.offset += length * xy.itemsize
+        return Coords(polygon=Polygon.from_xy(xy))
+
+
+def decode_page(data: bytes | memoryview) -> Page:
+    reader = _Reader(memoryview(data))
+    try:
+        image = Image(
+            filename=reader.str(),
+            width=reader.optional_int(),
+            height=reader.optional_int(),
+        )
+        regions: dict[str, TextRegion] = {}
+        for _ in range(reader.u32()):
+            region_id = reader.str()
+            region_coords = reader.coords()
+            textlines: dict[str, TextLine] = {}
+            for _ in range(reader.u32()):
+                line = TextLine(
+                    id=reader.str(), coords=reader.coords(), text=reader.str()
+                )
+                textlines[line.id] = line
+            regions[region_id] = TextRegion(
+                id=region_id, coords=region_coords, textlines=textlines
+            )
+    except (StructError, UnicodeDecodeError, GeometryError, PageXMLError):
+        raise ArchiveError("Corrupt page data")
+    if reader.offset != len(reader.data):
+        raise ArchiveError("Corrupt page data")
+    return Page(image=image, regions=regions)
+
+
+def _read_index_at(
+    data: bytes | mmap.mmap, end: int
+) -> tuple[int, dict[str, tuple[int, int]]]:
+    # Reads the index whose footer ends at the given offset
+    index_offset, footer_magic = _FOOTER.unpack_from(data, end - _FOOTER.size)
+    if footer_magic != MAGIC or not _HEADER.size <= index_offset < end:
+        raise ArchiveError("Not a pygexml archive")
+    index: dict[str, tuple[int, int]] = {}
+    with memoryview(data) as view, view[: end - _FOOTER.size] as limited:
+        reader = _Reader(limited)
+        reader.offset = index_offset
+        try:
+            for _ in range(reader.u32()):
+                key = reader.str()
+                offset, length = _INDEX_ENTRY.unpack_from(limited, reader.offset)
+                reader.offset += _INDEX_ENTRY.size
+                index[key] = (offset, length)
+        except (StructError, UnicodeDecodeError, ArchiveError):
+            raise ArchiveError("Corrupt archive index")
+    if reader.offset != end - _FOOTER.size or any(
+        offset + length > index_offset for offset, length in index.values()
+    ):
+        raise ArchiveError("Corrupt archive index")
+    return index_offset, index
+
+
+def _read_index(
+    data: bytes | mmap.mmap,
+) -> tuple[int, int, dict[str, tuple[int, int]]]:
+    # Returns the index offset, the end of the archive and the index. An
+    # append that was interrupted leaves pages after the last footer, so
+    # without a valid footer at the end the last valid one is used.
+    if len(data) < _HEADER.size + _FOOTER.size:
+        raise ArchiveError("Not a pygexml archive")
+    magic, version = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ArchiveError("Not a pygexml archive")
+    if version != VERSION:
+        raise ArchiveError(f"Unsupported archive version: {version}")
+    try:
+        index_offset, index = _read_index_at(data, len(data))
+        return index_offset, len(data), index
+    except ArchiveError as error:
+        found = data.rfind(MAGIC, _HEADER.size)
+        while found >= _HEADER.size + _FOOTER.size - len(MAGIC):
+            end = found + len(MAGIC)
+            try:
+                index_offset, index = _read_index_at(data, end)
+                return index_offset, end, index
+            except ArchiveError:
+                found = data.rfind(MAGIC, _HEADER.size, end - 1)
+        raise error
+
+
+def _map(file: BinaryIO) -> mmap.mmap:
+    try:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:  # empty file
+        raise ArchiveError("Not a pygexml archive")
+
+
+class ArchiveWriter:
+    def __init__(self, file: Path | str, append: bool = False) -> None:
+        path = Path(file)
+        self.index: dict[str, tuple[int, int]] = {}
+        self._file: BinaryIO
+        if append and path.exists():
+            self._file = path.open("r+b")
+            try:
+                with _map(self._file) as data:
+                    _, end, self.index = _read_index(data)
+            except ArchiveError:
+                self._file.close()
+                raise
+            # New pages go after the old index and footer, which stay intact
+            # until close writes a new index and footer after the new pages.
+            # Pages of an interrupted append after the last footer are dropped.
+            self._file.truncate(end)
+            self._file.seek(0, SEEK_END)
+        else:
+            self._file = path.open("wb")
+            self._file.write(_HEADER.pack(MAGIC, VERSION))
+
+    def add(self, page: Page, key: str | None = None) -> None:
+        key = key if key is not None else page.image.filename
+        if key in self.index:
+            raise ArchiveError(f"Duplicate key: {key}")
+        data = encode_page(page)
+        self.index[key] = (self._file.tell(), len(data))
+        self._file.write(data)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        buffer = bytearray(_U32.pack(len(self.index)))
+        for key, (offset, length) in self.index.items():
+            _write_str(buffer, key)
+            buffer += _INDEX_ENTRY.pack(offset, length)
+        buffer += _FOOTER.pack(index_offset, MAGIC)
+        self._file.write(buffer)
+        self._file.close()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class Archive(Mapping[str, Page]):
+    def __init__(self, file: Path | str) -> None:
+        with Path(file).open("rb") as f:
+            self._mmap = _map(f)
+        try:
+            _, _, self.index = _read_index(self._mmap)
+        except ArchiveError:
+            self._mmap.close()
+            raise
+
+    @classmethod
+    def open(cls, file: Path | str) -> "Archive":
+        return cls(file)
+
+    def __getitem__(self, key: str) -> Page:
+        offset, length = self.index[key]
+        with memoryview(self._mmap) as view:
+            with view[offset : offset + length] as data:
+                return decode_page(data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> "Archive":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,259 @@
+import pickle
+from collections.abc import Callable, Iterable, Iterator
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from functools import partial
+from itertools import islice
+from os import cpu_count
+from pathlib import Path
+from typing import Literal, TypeAlias, TypeVar, get_args, overload
+
+from .page import Diagnostics, Page, ValidationMode, validation as validating
+
+Format: TypeAlias = Literal["page", "alto"]
+ExecutorKind: TypeAlias = Literal["process", "thread"]
+Result: TypeAlias = tuple[Path, Page | Exception]
+ValidatedResult: TypeAlias = tuple[Path, Page | Exception, Diagnostics]
+Conversion: TypeAlias = tuple[Path, Path | Exception]
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class BatchError(Exception):
+    pass
+
+
+def load(file: Path | str, format: Format = "page") -> Page:
+    match format:
+        case "page":
+            return Page.from_xml_file(file)
+        case "alto":
+            return Page.from_alto_file(file)
+    raise BatchError(f"Unknown format: {format}")
+
+
+def _check_options(executor: ExecutorKind, *formats: Format) -> None:
+    for format in formats:
+        if format not in ("page", "alto"):
+            raise BatchError(f"Unknown format: {format}")
+    if executor not in ("process", "thread"):
+        raise BatchError(f"Unknown executor: {executor}")
+
+
+def _transferable(error: Exception, process: bool) -> Exception:
+    # Some exceptions (e.g. lxml syntax errors) can't be sent back from worker
+    # processes. Threads return the original exception.
+    if not process:
+        return error
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return BatchError(f"{type(error).__name__}: {error}")
+
+
+def save(page: Page, file: Path | str, format: Format = "alto") -> None:
+    match format:
+        case "page":
+            return page.to_xml_file(file)
+        case "alto":
+            return page.to_alto_file(file)
+    raise BatchError(f"Unknown format: {format}")
+
+
+def _load_chunk(format: Format, process: bool, paths: list[Path]) -> list[Result]:
+    results: list[Result] = []
+    for path in paths:
+        try:
+            results.append((path, load(path, format)))
+        except Exception as error:
+            results.append((path, _transferable(error, process)))
+    return results
+
+
+def _load_validated(
+    path: Path, format: Format, mode: ValidationMode
+) -> ValidatedResult:
+    # The validation mode is set where the file is parsed, e.g. in a worker
+    with validating(mode) as diagnostics:
+        try:
+            return path, load(path, format), diagnostics
+        except Exception as error:
+            return path, error, diagnostics
+
+
+def _load_validated_chunk(
+    format: Format, mode: ValidationMode, process: bool, paths: list[Path]
+) -> list[ValidatedResult]:
+    results: list[ValidatedResult] = []
+    for path in paths:
+        path, result, diagnostics = _load_validated(path, format, mode)
+        if isinstance(result, Exception):
+            result = _transferable(result, process)
+        results.append((path, result, diagnostics))
+    return results
+
+
+def _convert_chunk(
+    format: Format, to: Format, process: bool, pairs: list[tuple[Path, Path]]
+) -> list[Conversion]:
+    results: list[Conversion] = []
+    for source, target in pairs:
+        try:
+            save(load(source, format), target, to)
+            results.append((source, target))
+        except Exception as error:
+            results.append((source, _transferable(error, process)))
+    return results
+
+
+def _chunks(items: list[T], workers: int, chunksize: int | None) -> list[list[T]]:
+    if chunksize is None:
+        # A few chunks per worker balance the load without too much IPC overhead
+        chunksize = max(1, len(items) // (workers * 4))
+    return [items[i : i + chunksize] for i in range(0, len(items), chunksize)]
+
+
+def _run(
+    function: Callable[[list[T]], list[R]],
+    items: list[T],
+    workers: int | None,
+    chunksize: int | None,
+    ordered: bool,
+    executor: ExecutorKind,
+) -> Iterator[R]:
+    if not items:
+        return
+    workers = workers if workers is not None else (cpu_count() or 1)
+    chunks = _chunks(items, workers, chunksize)
+
+    # lxml releases the GIL while parsing, so threads avoid pickling Pages
+    # back from worker processes at the cost of some parallelism
+    pool: Executor = (
+        ProcessPoolExecutor(max_workers=min(workers, len(chunks)))
+        if executor == "process"
+        else ThreadPoolExecutor(max_workers=min(workers, len(chunks)))
+    )
+    # Only a window of chunks is in flight, so results that were consumed
+    # (and results that wait for a slow consumer) don't pile up in memory
+    window = 2 * workers
+    remaining = iter(chunks)
+    try:
+        if ordered:
+            queue = deque(
+                pool.submit(function, chunk) for chunk in islice(remaining, window)
+            )
+            while queue:
+                results = queue.popleft().result()
+                for chunk in islice(remaining, 1):
+                    queue.append(pool.submit(function, chunk))
+                yield from results
+        else:
+            pending = {
+                pool.submit(function, chunk) for chunk in islice(remaining, window)
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for chunk in islice(remaining, len(done)):
+                    pending.add(pool.submit(function, chunk))
+                for future in done:
+                    yield from future.result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+@overload
+def load_many(
+    paths: Iterable[Path | str],
+    format: Format = "page",
+    workers: int | None = None,
+    chunksize: int | None = None,
+    ordered: bool = True,
+    executor: ExecutorKind = "process",
+    validation: None = None,
+) -> Iterator[Result]: ...
+
+
+@overload
+def load_many(
+    paths: Iterable[Path | str],
+    format: Format = "page",
+    workers: int | None = None,
+    chunksize: int | None = None,
+    ordered: bool = True,
+    executor: ExecutorKind = "process",
+    *,
+    validation: ValidationMode,
+) -> Iterator[ValidatedResult]: ...
+
+
+def load_many(
+    paths: Iterable[Path | str],
+    format: Format = "page",
+    workers: int | None = None,
+    chunksize: int | None = None,
+    ordered: bool = True,
+    executor: ExecutorKind = "process",
+    validation: ValidationMode | None = None,
+) -> Iterator[Result] | Iterator[ValidatedResult]:
+    # With a validation mode, each file is parsed in that mode and the
+    # results are (path, page or exception, diagnostics)
+    _check_options(executor, format)
+    if validation is not None:
+        if validation not in get_args(ValidationMode):
+            raise BatchError(f"Unknown validation mode: {validation}")
+        return _run(
+            partial(_load_validated_chunk, format, validation, executor == "process"),
+            [Path(path) for path in paths],
+            workers,
+            chunksize,
+            ordered,
+            executor,
+        )
+    return _run(
+        partial(_load_chunk, format, executor == "process"),
+        [Path(path) for path in paths],
+        workers,
+        chunksize,
+        ordered,
+        executor,
+    )
+
+
+def convert_directory(
+    source: Path | str,
+    target: Path | str,
+    format: Format = "page",
+    to: Format = "alto",
+    pattern: str = "*.xml",
+    workers: int | None = None,
+    chunksize: int | None = None,
+    ordered: bool = True,
+    executor: ExecutorKind = "process",
+) -> Iterator[Conversion]:
+    # Converts all matching files below source to files with the same
+    # relative paths below target. Yields (source, target or exception).
+    _check_options(executor, format, to)
+    source, target = Path(source), Path(target)
+    pairs = [
+        (path, target / path.relative_to(source))
+        for path in sorted(source.rglob(pattern))
+        if path.is_file()
+    ]
+    for directory in sorted({pair[1].parent for pair in pairs}):
+        directory.mkdir(parents=True, exist_ok=True)
+    return _run(
+        partial(_convert_chunk, format, to, executor == "process"),
+        pairs,
+        workers,
+        chunksize,
+        ordered,
+        executor,
+    )
@@ -0,0 +1,238 @@
+import hashlib
+import os
+import sys
+import tempfile
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+
+from .archive import ArchiveError, decode_page, encode_page
+from .page import Coords, Page
+
+# Bump when the cached representation changes
+CACHE_VERSION = 1
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class DiskCache:
+    # Stores parsed pages in the archive encoding, one file per entry. Entries
+    # are keyed by path, size and mtime (and optionally a content hash), are
+    # written atomically and evicted least recently used first.
+
+    def __init__(
+        self,
+        directory: Path | str,
+        max_bytes: int | None = None,
+        hash_content: bool = False,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hash_content = hash_content
+        self.stats = CacheStats()
+        self._size: int | None = None  # estimated total size of the entries
+        self._lock = Lock()
+
+    def _entry(self, file: Path, variant: str) -> Path:
+        stat = file.stat()
+        key = hashlib.sha256()
+        for part in [CACHE_VERSION, variant, file.resolve(), stat.st_size]:
+            key.update(f"{part}\0".encode("utf-8"))
+        if self.hash_content:
+            key.update(hashlib.sha256(file.read_bytes()).digest())
+        else:
+            key.update(str(stat.st_mtime_ns).encode("utf-8"))
+        return self.directory / f"{key.hexdigest()}.pgx"
+
+    def _read(self, entry: Path) -> Page | None:
+        try:
+            page = decode_page(entry.read_bytes())
+            os.utime(entry)  # mark as recently used
+            return page
+        except (OSError, ArchiveError):
+            return None
+
+    def _write(self, entry: Path, data: bytes) -> None:
+        # Write to a temporary file and rename it, so concurrent readers never
+        # see partially written entries
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_name, entry)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _scan(self) -> list[tuple[int, int, Path]]:
+        entries = []
+        for entry in self.directory.glob("*.pgx"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # evicted concurrently
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+        return entries
+
+    def _evict(self, written: int) -> None:
+        # The total size is tracked incrementally and only checked against the
+        # directory when it exceeds the budget, which then is freed down to
+        # 90%, so the directory is scanned once per many writes instead of on
+        # every miss. Overwritten entries and entries written by other
+        # processes make the estimate inexact until the next scan.
+        if self.max_bytes is None:
+            return
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._scan())
+            else:
+                self._size += written
+            if self._size <= self.max_bytes:
+                return
+            entries = self._scan()
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry in sorted(entries):
+                if total <= 0.9 * self.max_bytes:
+                    break
+                entry.unlink(missing_ok=True)
+                total -= size
+            self._size = total
+
+    def load(self, file: Path, variant: str, parse: Callable[[], Page]) -> Page:
+        entry = self._entry(file, variant)
+        page = self._read(entry)
+        with self._lock:
+            if page is not None:
+                self.stats.hits += 1
+            else:
+                self.stats.misses += 1
+        if page is not None:
+            return page
+
+        page = parse()
+        try:
+            data = encode_page(page)
+        except ArchiveError:
+            return page  # not representable, so don't cache it
+        self._write(entry, data)
+        self._evict(len(data))
+        return page
+
+    def clear(self) -> None:
+        for entry in self.directory.glob("*.pgx"):
+            entry.unlink(missing_ok=True)
+        with self._lock:
+            self._size = None
+
+
+def _coords_size(coords: Coords) -> int:
+    return (
+        sys.getsizeof(coords)
+        + sys.getsizeof(coords.polygon)
+        + sys.getsizeof(coords.polygon.xy)
+    )
+
+
+def estimate_size(page: Page) -> int:
+    # Rough footprint in bytes of the page and the objects it owns
+    size = sys.getsizeof(page) + sys.getsizeof(page.regions)
+    size += sys.getsizeof(page.image) + sys.getsizeof(page.image.filename)
+    for region in page.regions.values():
+        size += sys.getsizeof(region) + sys.getsizeof(region.id)
+        size += _coords_size(region.coords) + sys.getsizeof(region.textlines)
+        for line in region.textlines.values():
+            size += sys.getsizeof(line) + sys.getsizeof(line.id)
+            size += _coords_size(line.coords) + sys.getsizeof(line.text)
+    return size
+
+
+_Key = tuple[str, str, int, int]
+
+
+class PageCache:
+    # Thread-safe in-memory LRU cache with a memory budget. Concurrent loads of
+    # the same file wait for a single parse. Entries are keyed by path, size
+    # and mtime, so modified files are parsed again.
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.stats = CacheStats()
+        self._entries: OrderedDict[_Key, tuple[Page, int]] = OrderedDict()
+        self._loading: dict[_Key, Future[Page]] = {}
+        self._versions: dict[tuple[str, str], _Key] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: _Key) -> None:
+        _, size = self._entries.pop(key)
+        self.current_bytes -= size
+        if self._versions.get(key[:2]) == key:
+            del self._versions[key[:2]]
+
+    def _insert(self, key: _Key, page: Page, size: int) -> None:
+        # Drop outdated versions of the same file
+        outdated = self._versions.get(key[:2])
+        if outdated is not None and outdated in self._entries:
+            self._remove(outdated)
+        self._versions[key[:2]] = key
+        self._entries[key] = (page, size)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def load(self, file: Path, variant: str, parse: Callable[[], Page]) -> Page:
+        stat = file.stat()
+        key = (variant, str(file.resolve()), stat.st_size, stat.st_mtime_ns)
+
+        future: Future[Page] = Future()
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return self._entries[key][0]
+            pending = self._loading.get(key)
+            if pending is None:
+                self._loading[key] = future
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+        if pending is not None:
+            return pending.result()
+
+        try:
+            page = parse()
+        except BaseException as error:
+            with self._lock:
+                del self._loading[key]
+            future.set_exception(error)
+            raise
+
+        size = estimate_size(page)
+        with self._lock:
+            del self._loading[key]
+            if size <= self.max_bytes:
+                self._insert(key, page, size)
+        future.set_result(page)
+        return page
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.current_bytes = 0
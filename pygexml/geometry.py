@@ -1,11 +1,19 @@
-from dataclasses import dataclass
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import FrozenInstanceError, dataclass
+from math import hypot
+from typing import NoReturn
 
 
 class GeometryError(Exception):
     pass
 
 
-@dataclass
+def _immutable(self: object, name: str, value: object = None) -> NoReturn:
+    raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+
+@dataclass(slots=True)
 class Point:
     x: int
     y: int
@@ -14,7 +22,35 @@ class Point:
         return f"{self.x},{self.y}"
 
 
-@dataclass
+class FrozenPoint(Point):
+    # Immutable and hashable variant, e.g. for dict keys and shared caches.
+    # It is a Point, so it can be used wherever a Point is expected.
+    __slots__ = ()
+
+    def __init__(self, x: int, y: int) -> None:
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+
+    __setattr__ = _immutable
+    __delattr__ = _immutable
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Point):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y))
+
+    def __reduce__(self) -> tuple[type["FrozenPoint"], tuple[int, int]]:
+        return FrozenPoint, (self.x, self.y)
+
+
+def _frozen(point: Point) -> FrozenPoint:
+    return point if isinstance(point, FrozenPoint) else FrozenPoint(point.x, point.y)
+
+
+@dataclass(slots=True)
 class Box:
     top_left: Point
     bottom_right: Point
@@ -47,31 +83,220 @@ class Box:
             and self.top_left.y <= point.y <= self.bottom_right.y
         )
 
+    def contains_box(self, other: "Box") -> bool:
+        return self.contains(other.top_left) and self.contains(other.bottom_right)
+
+    def intersects(self, other: "Box") -> bool:
+        return (
+            self.top_left.x <= other.bottom_right.x
+            and other.top_left.x <= self.bottom_right.x
+            and self.top_left.y <= other.bottom_right.y
+            and other.top_left.y <= self.bottom_right.y
+        )
+
+    def corners(self) -> list[Point]:
+        tl, br = self.top_left, self.bottom_right
+        return [tl, Point(x=br.x, y=tl.y), br, Point(x=tl.x, y=br.y)]
+
+
+class FrozenBox(Box):
+    # Immutable and hashable variant with frozen corners, see FrozenPoint
+    __slots__ = ()
+
+    def __init__(self, top_left: Point, bottom_right: Point) -> None:
+        object.__setattr__(self, "top_left", _frozen(top_left))
+        object.__setattr__(self, "bottom_right", _frozen(bottom_right))
+        self.__post_init__()
+
+    __setattr__ = _immutable
+    __delattr__ = _immutable
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Box):
+            return NotImplemented
+        return (
+            self.top_left == other.top_left and self.bottom_right == other.bottom_right
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.top_left, self.bottom_right))
+
+    def __reduce__(self) -> tuple[type["FrozenBox"], tuple[Point, Point]]:
+        return FrozenBox, (self.top_left, self.bottom_right)
+
+
+def _orientation(a: Point, b: Point, c: Point) -> int:
+    cross = (b.x - a.x) * (c.y - a.y) - (b.y - a.y) * (c.x - a.x)
+    return (cross > 0) - (cross < 0)
+
+
+def _on_segment(a: Point, b: Point, p: Point) -> bool:
+    return (
+        _orientation(a, b, p) == 0
+        and min(a.x, b.x) <= p.x <= max(a.x, b.x)
+        and min(a.y, b.y) <= p.y <= max(a.y, b.y)
+    )
+
+
+def _segments_intersect(a: Point, b: Point, c: Point, d: Point) -> bool:
+    o1, o2 = _orientation(a, b, c), _orientation(a, b, d)
+    o3, o4 = _orientation(c, d, a), _orientation(c, d, b)
+    if o1 != o2 and o3 != o4:
+        return True
+    return (
+        _on_segment(a, b, c)
+        or _on_segment(a, b, d)
+        or _on_segment(c, d, a)
+        or _on_segment(c, d, b)
+    )
+
+
+def _distance_to_segment(p: Point, a: Point, b: Point) -> float:
+    dx, dy = b.x - a.x, b.y - a.y
+    length = dx * dx + dy * dy
+    if length == 0:
+        return hypot(p.x - a.x, p.y - a.y)
+    t = max(0.0, min(1.0, ((p.x - a.x) * dx + (p.y - a.y) * dy) / length))
+    return hypot(p.x - a.x - t * dx, p.y - a.y - t * dy)
+
+
+def _pack(values: Iterable[int]) -> Sequence[int]:
+    values = list(values)
+    if not values:
+        raise GeometryError("Polygon: points must not be empty")
+    if len(values) % 2:
+        raise GeometryError("Polygon: odd number of coordinates")
+    try:
+        return array("i", values)
+    except OverflowError:
+        # Valid but unusual coordinates beyond 32 bit don't fit into the array
+        return tuple(values)
+
 
-@dataclass
 class Polygon:
-    points: list[Point]
+    # Coordinates are stored flat as x0, y0, x1, y1, ... to avoid one Point
+    # instance per vertex. Points are created on demand only.
+    # Polygons are immutable, so the bounding box and the string (which
+    # writers may need repeatedly) are computed at most once
+    __slots__ = ("_xy", "_bbox", "_str")
 
-    def __post_init__(self) -> None:
-        if len(self.points) < 1:
-            raise GeometryError("Polygon: points must not be empty")
+    _xy: Sequence[int]
+    _bbox: FrozenBox | None
+    _str: str | None
+
+    def __init__(self, points: Iterable[Point]) -> None:
+        self._xy = _pack(value for point in points for value in (point.x, point.y))
+        self._bbox = None
+        self._str = None
+
+    @classmethod
+    def from_xy(cls, xy: Iterable[int]) -> "Polygon":
+        polygon = cls.__new__(cls)
+        polygon._xy = _pack(xy)
+        polygon._bbox = None
+        polygon._str = None
+        return polygon
 
     @classmethod
     def from_box(cls, box: Box) -> "Polygon":
-        return cls(
-            points=[
-                box.top_left,
-                Point(x=box.bottom_right.x, y=box.top_left.y),
-                box.bottom_right,
-                Point(x=box.top_left.x, y=box.bottom_right.y),
-            ]
-        )
+        tl, br = box.top_left, box.bottom_right
+        return cls.from_xy([tl.x, tl.y, br.x, tl.y, br.x, br.y, tl.x, br.y])
+
+    @property
+    def xy(self) -> Sequence[int]:
+        return self._xy
+
+    @property
+    def points(self) -> list[Point]:
+        return list(self)
+
+    def __iter__(self) -> Iterator[Point]:
+        return map(Point, self._xy[0::2], self._xy[1::2])
+
+    def __len__(self) -> int:
+        return len(self._xy) // 2
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Polygon):
+            return NotImplemented
+        if type(self._xy) is type(other._xy):
+            return self._xy == other._xy
+        return tuple(self._xy) == tuple(other._xy)
+
+    def __hash__(self) -> int:
+        return hash(tuple(self._xy))
+
+    def __repr__(self) -> str:
+        return f"Polygon(points={self.points!r})"
+
+    def __str__(self) -> str:
+        # Points in the format of PAGE-XML, e.g. "1,2 3,4"
+        if self._str is None:
+            xy = self._xy
+            self._str = " ".join(map("{},{}".format, xy[0::2], xy[1::2]))
+        return self._str
 
     def bounding_box(self) -> Box:
-        min_x = min(point.x for point in self.points)
-        max_x = max(point.x for point in self.points)
-        min_y = min(point.y for point in self.points)
-        max_y = max(point.y for point in self.points)
-        return Box(
-            top_left=Point(x=min_x, y=min_y), bottom_right=Point(x=max_x, y=max_y)
+        # Frozen, as it is shared by all callers
+        if self._bbox is None:
+            xs, ys = self._xy[0::2], self._xy[1::2]
+            self._bbox = FrozenBox(
+                top_left=FrozenPoint(x=min(xs), y=min(ys)),
+                bottom_right=FrozenPoint(x=max(xs), y=max(ys)),
+            )
+        return self._bbox
+
+    def simplify(self, tolerance: float) -> "Polygon":
+        # Douglas-Peucker: drops points closer than tolerance to the line
+        # between the points kept around them. First and last points are kept.
+        points = self.points
+        if tolerance <= 0 or len(points) <= 2:
+            return self
+        keep = [False] * len(points)
+        keep[0] = keep[-1] = True
+        stack = [(0, len(points) - 1)]
+        while stack:
+            first, last = stack.pop()
+            distance, farthest = 0.0, first
+            for i in range(first + 1, last):
+                d = _distance_to_segment(points[i], points[first], points[last])
+                if d > distance:
+                    distance, farthest = d, i
+            if distance > tolerance:
+                keep[farthest] = True
+                stack += [(first, farthest), (farthest, last)]
+        if all(keep):
+            return self
+        return Polygon(point for point, kept in zip(points, keep) if kept)
+
+    def edges(self) -> Iterator[tuple[Point, Point]]:
+        points = self.points
+        return zip(points[-1:] + points[:-1], points)
+
+    def contains(self, point: Point) -> bool:
+        # Even-odd rule with exact integer arithmetic, boundary points included
+        inside = False
+        for a, b in self.edges():
+            if _on_segment(a, b, point):
+                return True
+            if (a.y > point.y) != (b.y > point.y):
+                # Is point left of the edge's crossing with the horizontal line?
+                dy = b.y - a.y
+                if ((point.x - a.x) * dy < (point.y - a.y) * (b.x - a.x)) == (dy > 0):
+                    inside = not inside
+        return inside
+
+    def intersects_box(self, box: Box) -> bool:
+        if not self.bounding_box().intersects(box):
+            return False
+        if any(box.contains(point) for point in self):
+            return True
+        corners = box.corners()
+        if any(self.contains(corner) for corner in corners):
+            return True
+        box_edges = list(zip(corners[-1:] + corners[:-1], corners))
+        return any(
+            _segments_intersect(a, b, c, d)
+            for a, b in self.edges()
+            for c, d in box_edges
         )
@@ -1,9 +1,20 @@
 from dataclasses import dataclass
-from dataclasses_json import DataClassJsonMixin
+from typing import Any
 
+from .serialization import JsonMixin
 
-@dataclass
-class Image(DataClassJsonMixin):
+
+@dataclass(slots=True)
+class Image(JsonMixin):
     filename: str
     width: int | None
     height: int | None
+
+    def to_dict(self, encode_json: bool = False) -> dict[str, Any]:
+        return {"filename": self.filename, "width": self.width, "height": self.height}
+
+    @classmethod
+    def from_dict(cls, kvs: Any, *, infer_missing: bool = False) -> "Image":
+        if infer_missing:
+            return cls(kvs["filename"], kvs.get("width"), kvs.get("height"))
+        return cls(kvs["filename"], kvs["width"], kvs["height"])
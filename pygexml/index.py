@@ -0,0 +1,267 @@
+import sys
+import unicodedata
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from struct import Struct, error as StructError
+
+from .archive import ArchiveError, _Reader, _write_str
+from .geometry import GeometryError, Polygon
+from .page import Coords, Page, PageXMLError
+
+# Index file layout: header, page keys, lines table, tokens with postings.
+# Each line is stored once with its page number, IDs and coordinates.
+# Postings of a token are pairs of (line number, token offset), sorted by
+# line number and written as varints, line numbers as deltas.
+
+MAGIC = b"PGXI"
+VERSION = 1
+
+_HEADER = Struct("<4sH")
+_U32 = Struct("<I")
+
+
+class WordIndexError(Exception):
+    pass
+
+
+def normalize(word: str) -> str:
+    # Case-insensitive, without leading and trailing punctuation
+    start, end = 0, len(word)
+    while start < end and unicodedata.category(word[start]).startswith("P"):
+        start += 1
+    while end > start and unicodedata.category(word[end - 1]).startswith("P"):
+        end -= 1
+    return word[start:end].casefold()
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data: bytearray, offset: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+@dataclass(frozen=True, slots=True)
+class Hit:
+    page: str
+    region_id: str
+    line_id: str
+    offset: int
+    coords: Coords
+
+
+class _Postings:
+    __slots__ = ("data", "last_line")
+
+    def __init__(self, data: bytearray, last_line: int) -> None:
+        self.data = data
+        self.last_line = last_line
+
+    def add(self, line: int, offset: int) -> None:
+        _write_varint(self.data, line - self.last_line)
+        _write_varint(self.data, offset)
+        self.last_line = line
+
+    def decode(self) -> Iterable[tuple[int, int]]:
+        line = position = 0
+        while position < len(self.data):
+            delta, position = _read_varint(self.data, position)
+            offset, position = _read_varint(self.data, position)
+            line += delta
+            yield line, offset
+
+
+class WordIndex:
+    # Lines are kept in flat arrays rather than model objects, so that large
+    # corpora fit into memory. Coords of hits are created on demand.
+
+    def __init__(self) -> None:
+        self.pages: list[str] = []
+        self._page_numbers: dict[str, int] = {}
+        self._line_pages = array("I")
+        self._region_ids: list[str] = []
+        self._line_ids: list[str] = []
+        self._xy = array("i")
+        self._xy_ends = array("Q")
+        self._postings: dict[str, _Postings] = {}
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._page_numbers
+
+    @property
+    def line_count(self) -> int:
+        return len(self._line_ids)
+
+    def add(self, page: Page, key: str | None = None) -> None:
+        key = key if key is not None else page.image.filename
+        if key in self._page_numbers:
+            raise WordIndexError(f"Duplicate key: {key}")
+        page_number = len(self.pages)
+
+        # Check the coordinates first, to leave the index unchanged on errors
+        try:
+            xy = [
+                array("i", line.coords.polygon.xy)
+                for region in page.regions.values()
+                for line in region.textlines.values()
+            ]
+        except OverflowError:
+            raise WordIndexError("Value out of range")
+
+        self.pages.append(key)
+        self._page_numbers[key] = page_number
+        lines = (
+            (region, line)
+            for region in page.regions.values()
+            for line in region.textlines.values()
+        )
+        for (region, line), line_xy in zip(lines, xy):
+            number = len(self._line_ids)
+            self._line_pages.append(page_number)
+            self._region_ids.append(sys.intern(region.id))
+            self._line_ids.append(line.id)
+            self._xy.extend(line_xy)
+            self._xy_ends.append(len(self._xy))
+            for offset, word in enumerate(line.words()):
+                token = normalize(word)
+                if token:
+                    self._posting_list(token).add(number, offset)
+
+    def add_many(self, pages: Iterable[Page]) -> None:
+        for page in pages:
+            self.add(page)
+
+    def _posting_list(self, token: str) -> _Postings:
+        postings = self._postings.get(token)
+        if postings is None:
+            postings = self._postings[token] = _Postings(bytearray(), 0)
+        return postings
+
+    def tokens(self) -> Iterable[str]:
+        return iter(self._postings)
+
+    def _coords(self, line: int) -> Coords:
+        start = self._xy_ends[line - 1] if line > 0 else 0
+        return Coords(polygon=Polygon.from_xy(self._xy[start : self._xy_ends[line]]))
+
+    def search(self, word: str) -> list[Hit]:
+        postings = self._postings.get(normalize(word))
+        if postings is None:
+            return []
+        return [
+            Hit(
+                page=self.pages[self._line_pages[line]],
+                region_id=self._region_ids[line],
+                line_id=self._line_ids[line],
+                offset=offset,
+                coords=self._coords(line),
+            )
+            for line, offset in postings.decode()
+        ]
+
+    def count(self, word: str) -> int:
+        postings = self._postings.get(normalize(word))
+        return 0 if postings is None else sum(1 for _ in postings.decode())
+
+    def save(self, file: Path | str) -> None:
+        buffer = bytearray(_HEADER.pack(MAGIC, VERSION))
+        buffer += _U32.pack(len(self.pages))
+        for key in self.pages:
+            _write_str(buffer, key)
+
+        buffer += _U32.pack(len(self._line_ids))
+        start = 0
+        for line, end in enumerate(self._xy_ends):
+            buffer += _U32.pack(self._line_pages[line])
+            _write_str(buffer, self._region_ids[line])
+            _write_str(buffer, self._line_ids[line])
+            xy = self._xy[start:end]
+            if sys.byteorder == "big":
+                xy.byteswap()
+            buffer += _U32.pack(len(xy))
+            buffer += xy.tobytes()
+            start = end
+
+        buffer += _U32.pack(len(self._postings))
+        for token, postings in self._postings.items():
+            _write_str(buffer, token)
+            buffer += _U32.pack(len(postings.data))
+            buffer += postings.data
+
+        Path(file).write_bytes(buffer)
+
+    @classmethod
+    def load(cls, file: Path | str) -> "WordIndex":
+        data = memoryview(Path(file).read_bytes())
+        try:
+            magic, version = _HEADER.unpack_from(data, 0)
+        except StructError:
+            raise WordIndexError("Not a pygexml word index")
+        if magic != MAGIC:
+            raise WordIndexError("Not a pygexml word index")
+        if version != VERSION:
+            raise WordIndexError(f"Unsupported index version: {version}")
+        try:
+            return cls._read(_Reader(data[_HEADER.size :]))
+        except (
+            ArchiveError,
+            GeometryError,
+            IndexError,
+            PageXMLError,
+            StructError,
+            UnicodeDecodeError,
+            ValueError,
+        ):
+            raise WordIndexError("Corrupt word index")
+
+    @classmethod
+    def _read(cls, reader: _Reader) -> "WordIndex":
+        index = cls()
+        for page_number in range(reader.u32()):
+            key = reader.str()
+            index.pages.append(key)
+            index._page_numbers[key] = page_number
+
+        for _ in range(reader.u32()):
+            page_number = reader.u32()
+            if page_number >= len(index.pages):
+                raise ValueError("Page number out of range")
+            index._line_pages.append(page_number)
+            index._region_ids.append(sys.intern(reader.str()))
+            index._line_ids.append(reader.str())
+            index._xy.extend(reader.coords().polygon.xy)
+            index._xy_ends.append(len(index._xy))
+
+        for _ in range(reader.u32()):
+            token = reader.str()
+            length = reader.u32()
+            reader._check(length)
+            postings = _Postings(
+                bytearray(reader.data[reader.offset : reader.offset + length]), 0
+            )
+            reader.offset += length
+            for line, _ in postings.decode():
+                postings.last_line = line
+            if postings.last_line >= index.line_count:
+                raise ValueError("Line number out of range")
+            index._postings[token] = postings
+
+        if reader.offset != len(reader.data):
+            raise ValueError("Trailing data")
+        return index
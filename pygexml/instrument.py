@@ -0,0 +1,174 @@
+import json
+import os
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from time import perf_counter_ns
+from types import TracebackType
+from typing import Any, ParamSpec, TypeVar
+
+# Opt-in timing of parse and render phases. Instrumented functions check a
+# context variable and run unchanged when no recorder is active. Phases nest:
+# a phase's self time excludes the phases inside it, e.g. the self time of
+# TextLine.from_xml is spent in finding child elements and construction.
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_recorder: ContextVar["Recorder | None"] = ContextVar("pygexml_recorder", default=None)
+
+
+class _Stats:
+    __slots__ = ("count", "total", "children")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.children = 0
+
+
+class _Phase:
+    __slots__ = ("recorder", "name", "start", "children")
+
+    def __init__(self, recorder: "Recorder", name: str) -> None:
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.children = 0
+        self.recorder._stack().append(self)
+        self.start = perf_counter_ns()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        end = perf_counter_ns()
+        self.recorder._end(self, end)
+
+
+class Recorder:
+    # Can be shared between threads by entering instrument(recorder) in each
+
+    def __init__(self, trace: bool = True) -> None:
+        self.trace = trace
+        self.origin = perf_counter_ns()
+        self.counters: dict[str, int] = {}
+        self._stats: dict[str, _Stats] = {}
+        self._events: list[tuple[str, int, int, int]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> list[_Phase]:
+        try:
+            stack: list[_Phase] = self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+        return stack
+
+    def _end(self, phase: _Phase, end: int) -> None:
+        duration = end - phase.start
+        stack = self._stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += duration
+        with self._lock:
+            stats = self._stats.get(phase.name)
+            if stats is None:
+                stats = self._stats[phase.name] = _Stats()
+            stats.count += 1
+            stats.total += duration
+            stats.children += phase.children
+            if self.trace:
+                self._events.append(
+                    (phase.name, phase.start, duration, threading.get_ident())
+                )
+
+    def phase(self, name: str) -> _Phase:
+        return _Phase(self, name)
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "phases": {
+                    name: {
+                        "count": stats.count,
+                        "seconds": stats.total / 1e9,
+                        "self_seconds": (stats.total - stats.children) / 1e9,
+                    }
+                    for name, stats in self._stats.items()
+                },
+                "counters": dict(self.counters),
+            }
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        # Trace Event Format, for chrome://tracing and https://ui.perfetto.dev
+        pid = os.getpid()
+        with self._lock:
+            events: list[dict[str, Any]] = [
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - self.origin) / 1000,
+                    "dur": duration / 1000,
+                    "pid": pid,
+                    "tid": tid,
+                }
+                for name, start, duration, tid in self._events
+            ]
+            events += [
+                {
+                    "name": name,
+                    "ph": "C",
+                    "ts": 0,
+                    "pid": pid,
+                    "args": {name: value},
+                }
+                for name, value in self.counters.items()
+            ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, file: Path | str) -> None:
+        Path(file).write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+
+
+@contextmanager
+def instrument(
+    recorder: Recorder | None = None, trace: bool = True
+) -> Iterator[Recorder]:
+    # Records pygexml's phases in the current context (thread or task) until
+    # the block ends. Worker threads and processes don't inherit it.
+    recorder = recorder if recorder is not None else Recorder(trace=trace)
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+def current() -> Recorder | None:
+    return _recorder.get()
+
+
+def timed(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    def decorator(function: Callable[P, R]) -> Callable[P, R]:
+        @wraps(function)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            recorder = _recorder.get()
+            if recorder is None:
+                return function(*args, **kwargs)
+            with recorder.phase(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,15 +1,22 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from io import BytesIO
 from pathlib import Path
 from re import Pattern, compile
 from warnings import warn
-from dataclasses import dataclass
-from dataclasses_json import DataClassJsonMixin
-from typing import ClassVar, TypeAlias
-from collections.abc import Iterable
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import IO, Any, ClassVar, Literal, Protocol, TypeAlias
+from collections.abc import Callable, Iterable, Iterator
 from lxml import etree
 from lxml.etree import _Element as Element, QName
 
-from .geometry import Point, Box, Polygon, GeometryError
+from . import instrument
+from .geometry import Point, Box, Polygon, GeometryError, _immutable
 from .image import Image
+from .serialization import JsonMixin, encode_polygon, decode_polygon
+from .spatial import GridIndex
 
 
 def find_child(element: Element, name: str) -> Element | None:
@@ -23,6 +30,60 @@ def find_children(element: Element, name: str) -> Iterable[Element]:
     return (child for child in element if QName(child).localname == name)
 
 
+def parse_xml(source: Path | str | IO[bytes], encoding: str | None = None) -> Element:
+    # Without an explicit encoding, lxml honors the XML declaration
+    parser = etree.XMLParser(encoding=encoding) if encoding is not None else None
+    if isinstance(source, (Path, str)):
+        with Path(source).open("rb") as file:
+            return _parse(file, parser)
+    return _parse(source, parser)
+
+
+class _TimedReader:
+    # Times the reads lxml makes while parsing, so that reading is a phase
+    # inside xml_parse instead of parsing from a separately read copy
+    __slots__ = ("file", "recorder")
+
+    def __init__(self, file: IO[bytes], recorder: instrument.Recorder) -> None:
+        self.file = file
+        self.recorder = recorder
+
+    def read(self, size: int = -1) -> bytes:
+        with self.recorder.phase("read"):
+            return self.file.read(size)
+
+
+def _parse(file: IO[bytes], parser: etree.XMLParser | None = None) -> Element:
+    recorder = instrument.current()
+    if recorder is None:
+        return etree.parse(file, parser).getroot()
+    with recorder.phase("xml_parse"):
+        reader = _TimedReader(file, recorder)
+        root = etree.parse(reader, parser).getroot()  # type: ignore
+    recorder.count("elements", sum(1 for _ in root.iter()))
+    return root
+
+
+def _fromstring(data: bytes, parser: etree.XMLParser | None = None) -> Element:
+    recorder = instrument.current()
+    if recorder is None:
+        return etree.fromstring(data, parser)
+    with recorder.phase("xml_parse"):
+        root = etree.fromstring(data, parser)
+    recorder.count("elements", sum(1 for _ in root.iter()))
+    return root
+
+
+PAGE_NAMESPACE = "http://schema.primaresearch.org/PAGE/gts/pagecontent/2019-07-15"
+ALTO_NAMESPACE = "http://www.loc.gov/standards/alto/ns-v4#"
+
+
+class ParseCache(Protocol):
+    # Implemented by the caches in pygexml.cache. The variant distinguishes
+    # differently parsed versions of the same file.
+    def load(self, file: Path, variant: str, parse: Callable[[], "Page"]) -> "Page": ...
+
+
 class PageXMLError(Exception):
     pass
 
@@ -31,8 +92,88 @@ class ALTOXMLError(Exception):
     pass
 
 
-@dataclass
-class Coords(DataClassJsonMixin):
+ValidationMode: TypeAlias = Literal["strict", "loose-warn", "loose-silent", "collect"]
+
+
+@dataclass(slots=True)
+class Diagnostics:
+    # Issues found while parsing in "collect" mode: counts per kind of issue
+    # and the first few offending values as samples
+    mode: ValidationMode = "collect"
+    max_samples: int = 5
+    counts: dict[str, int] = field(default_factory=dict)
+    samples: dict[str, list[str]] = field(default_factory=dict)
+
+    def record(self, kind: str, sample: str) -> None:
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        samples = self.samples.setdefault(kind, [])
+        if len(samples) < self.max_samples:
+            samples.append(sample)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def __bool__(self) -> bool:
+        return bool(self.counts)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            kind: {"count": count, "samples": list(self.samples[kind])}
+            for kind, count in self.counts.items()
+        }
+
+
+_validation: ContextVar[Diagnostics | None] = ContextVar(
+    "pygexml_validation", default=None
+)
+
+
+@contextmanager
+def validation(mode: ValidationMode, max_samples: int = 5) -> Iterator[Diagnostics]:
+    # How parsing within the block handles values that are readable but not
+    # valid, like negative coordinates. The default is "loose-warn": accept
+    # them with a warning for each value. "strict" raises PageXMLError,
+    # "loose-silent" accepts them and "collect" records them in the yielded
+    # Diagnostics. Applies to the current thread or task.
+    if mode not in ("strict", "loose-warn", "loose-silent", "collect"):
+        raise PageXMLError(f"Unknown validation mode: {mode}")
+    diagnostics = Diagnostics(mode=mode, max_samples=max_samples)
+    token = _validation.set(diagnostics)
+    try:
+        yield diagnostics
+    finally:
+        _validation.reset(token)
+
+
+def _cache_variant(format: str, encoding: str | None) -> str | None:
+    # Pages parsed in strict mode are cached separately. In collect mode
+    # there is no caching, as cached pages would hide their issues.
+    variant = format if encoding is None else f"{format};encoding={encoding}"
+    diagnostics = _validation.get()
+    if diagnostics is None:
+        return variant
+    if diagnostics.mode == "collect":
+        return None
+    return f"{variant};strict" if diagnostics.mode == "strict" else variant
+
+
+def _invalid(kind: str, message: str, value: str) -> None:
+    diagnostics = _validation.get()
+    mode = diagnostics.mode if diagnostics is not None else "loose-warn"
+    if mode == "loose-warn":
+        recorder = instrument.current()
+        if recorder is not None:
+            recorder.count("warnings")
+        warn(f"Warning: {message}: {value}")
+    elif mode == "collect" and diagnostics is not None:
+        diagnostics.record(kind, value)
+    elif mode == "strict":
+        raise PageXMLError(f"{message}: {value}")
+
+
+@dataclass(slots=True)
+class Coords(JsonMixin):
     polygon: Polygon
 
     # Loose regex that allows for negative values that can be handled by
@@ -49,51 +190,91 @@ class Coords(DataClassJsonMixin):
     )
 
     def __post_init__(self) -> None:
-        if len(self.polygon.points) < 2:
+        if len(self.polygon) < 2:
             raise PageXMLError("At least 2 Points are required")
 
     @classmethod
     def parse(cls, points_str: str) -> "Coords":
+        recorder = instrument.current()
+        if recorder is None:
+            return cls._parse(points_str)
+        with recorder.phase("Coords.parse"):
+            coords = cls._parse(points_str)
+        recorder.count("points", len(coords.polygon))
+        return coords
 
+    @classmethod
+    def _parse(cls, points_str: str) -> "Coords":
         if not cls.LOOSE_PATTERN.match(points_str):
             raise PageXMLError("Invalid Coords XML string")
 
-        if not cls.STRICT_PATTERN.match(points_str):
-            warn(
-                "Warning: Coords XML string does not match the PAGE XMl spec: "
-                + points_str
+        # The loose pattern only differs from the strict one by allowing minus
+        # signs, so finding one is equivalent to a failed strict match
+        if "-" in points_str:
+            _invalid(
+                "coords",
+                "Coords XML string does not match the PAGE XMl spec",
+                points_str,
             )
 
-        points: list[Point] = []
-        for pair_str in points_str.split(" "):
-            [x, y] = pair_str.split(",")
-            points.append(Point(x=int(x), y=int(y)))
+        values = map(int, points_str.replace(" ", ",").split(","))
 
         try:
-            polygon = Polygon(points=points)
+            polygon = Polygon.from_xy(values)
         except GeometryError:
             raise PageXMLError("At least 2 Points are required")
 
-        return Coords(polygon=polygon)
+        return cls(polygon=polygon)
 
     @classmethod
     def from_box(cls, box: Box) -> "Coords":
         return cls(polygon=Polygon.from_box(box))
 
     def __str__(self) -> str:
-        return " ".join(str(p) for p in self.polygon.points)
+        return str(self.polygon)
+
+    def to_dict(self, encode_json: bool = False) -> dict[str, Any]:
+        return {"polygon": encode_polygon(self.polygon)}
+
+    @classmethod
+    def from_dict(cls, kvs: Any, *, infer_missing: bool = False) -> "Coords":
+        return cls(polygon=decode_polygon(kvs["polygon"]))
+
+
+class FrozenCoords(Coords):
+    # Immutable and hashable variant, see pygexml.geometry.FrozenPoint
+    __slots__ = ()
+
+    def __init__(self, polygon: Polygon) -> None:
+        object.__setattr__(self, "polygon", polygon)
+        self.__post_init__()
+
+    __setattr__ = _immutable
+    __delattr__ = _immutable
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Coords):
+            return NotImplemented
+        return self.polygon == other.polygon
+
+    def __hash__(self) -> int:
+        return hash(self.polygon)
+
+    def __reduce__(self) -> tuple[type["FrozenCoords"], tuple[Polygon]]:
+        return FrozenCoords, (self.polygon,)
 
 
 ID: TypeAlias = str
 
 
-@dataclass
-class TextLine(DataClassJsonMixin):
+@dataclass(slots=True)
+class TextLine(JsonMixin):
     id: ID
     coords: Coords
     text: str
 
     @classmethod
+    @instrument.timed("TextLine.from_xml")
     def from_xml(cls, element: Element) -> "TextLine":
         if QName(element).localname != "TextLine":
             raise PageXMLError("Wrong element given")
@@ -117,6 +298,7 @@ class TextLine(DataClassJsonMixin):
         )
 
     @classmethod
+    @instrument.timed("TextLine.from_alto")
     def from_alto(cls, element: Element) -> "TextLine":
         if QName(element).localname != "TextLine":
             raise ALTOXMLError("Wrong element given")
@@ -153,14 +335,30 @@ class TextLine(DataClassJsonMixin):
     def words(self) -> Iterable[str]:
         return self.text.split()
 
+    def to_dict(self, encode_json: bool = False) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "coords": self.coords.to_dict(),
+            "text": self.text,
+        }
 
-@dataclass
-class TextRegion(DataClassJsonMixin):
+    @classmethod
+    def from_dict(cls, kvs: Any, *, infer_missing: bool = False) -> "TextLine":
+        return cls(
+            id=kvs["id"],
+            coords=Coords.from_dict(kvs["coords"]),
+            text=kvs["text"],
+        )
+
+
+@dataclass(slots=True)
+class TextRegion(JsonMixin):
     id: ID
     coords: Coords
     textlines: dict[ID, TextLine]
 
     @classmethod
+    @instrument.timed("TextRegion.from_xml")
     def from_xml(cls, element: Element) -> "TextRegion":
         if QName(element).localname != "TextRegion":
             raise PageXMLError("Wrong element given")
@@ -182,6 +380,7 @@ class TextRegion(DataClassJsonMixin):
         )
 
     @classmethod
+    @instrument.timed("TextRegion.from_alto")
     def from_alto(cls, element: Element) -> "TextRegion":
         if QName(element).localname != "TextBlock":
             raise ALTOXMLError("Wrong element given")
@@ -223,56 +422,187 @@ class TextRegion(DataClassJsonMixin):
     def all_words(self) -> Iterable[str]:
         return (w for tl in self.textlines.values() for w in tl.words())
 
+    def to_dict(self, encode_json: bool = False) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "coords": self.coords.to_dict(),
+            "textlines": {id: tl.to_dict() for id, tl in self.textlines.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, kvs: Any, *, infer_missing: bool = False) -> "TextRegion":
+        return cls(
+            id=kvs["id"],
+            coords=Coords.from_dict(kvs["coords"]),
+            textlines={
+                id: TextLine.from_dict(tl) for id, tl in kvs["textlines"].items()
+            },
+        )
+
+
+def _image_from_xml(element: Element) -> Image:
+    if "imageFilename" not in element.attrib:
+        raise PageXMLError("No image filename found")
+    return Image(
+        filename=str(element.attrib["imageFilename"]),
+        width=(
+            int(element.attrib["imageWidth"])
+            if "imageWidth" in element.attrib
+            else None
+        ),
+        height=(
+            int(element.attrib["imageHeight"])
+            if "imageHeight" in element.attrib
+            else None
+        ),
+    )
+
+
+class _PageIndex:
+    # Lazily built lookup structures of a page. The stamp captures the page's
+    # structure, so that adding, removing or replacing regions and adding or
+    # removing lines leads to a rebuild. It is cheap rather than complete:
+    # lines replaced under their ID, or removed and added so that the count
+    # and the last line of a region stay the same, are only noticed when a
+    # query returns them. Other in-place changes, e.g. of coordinates, need
+    # Page.invalidate_index.
+
+    def __init__(self, page: "Page") -> None:
+        self.stamp = _PageIndex.stamp_of(page)
+        self._regions = page.regions
+
+    @cached_property
+    def regions(self) -> GridIndex[TextRegion]:
+        return GridIndex(
+            (region.coords.polygon.bounding_box(), region)
+            for region in self._regions.values()
+        )
+
+    @cached_property
+    def lines(self) -> GridIndex[tuple[TextRegion, TextLine]]:
+        return GridIndex(
+            (line.coords.polygon.bounding_box(), (region, line))
+            for region in self._regions.values()
+            for line in region.textlines.values()
+        )
+
+    @cached_property
+    def textlines(self) -> dict[ID, tuple[TextRegion, TextLine]]:
+        # The first line wins if IDs are not unique, as in a linear search
+        textlines: dict[ID, tuple[TextRegion, TextLine]] = {}
+        for region in reversed(self._regions.values()):
+            for id, line in reversed(region.textlines.items()):
+                textlines[id] = (region, line)
+        return textlines
+
+    def reset_textlines(self) -> None:
+        self.__dict__.pop("textlines", None)
+
+    @staticmethod
+    def stamp_of(page: "Page") -> tuple[Any, ...]:
+        return (
+            id(page.regions),
+            tuple(
+                (id(region), id(region.coords), id(region.textlines))
+                + (len(region.textlines), id(_last(region.textlines)))
+                for region in page.regions.values()
+            ),
+        )
+
+
+def _last(textlines: dict[ID, TextLine]) -> TextLine | None:
+    return next(reversed(textlines.values()), None)
+
 
 @dataclass
-class Page(DataClassJsonMixin):
+class Page(JsonMixin):
+    # The index is kept out of the dataclass fields, and thereby out of
+    # equality, repr and serialization
+    __slots__ = ("image", "regions", "_index")
+
     image: Image
     regions: dict[ID, TextRegion]
 
+    def __post_init__(self) -> None:
+        self._index: _PageIndex | None = None
+
     @classmethod
+    @instrument.timed("Page.from_xml")
     def from_xml(cls, element: Element) -> "Page":
         if QName(element).localname != "Page":
             raise PageXMLError("Wrong element given")
 
-        if "imageFilename" not in element.attrib:
-            raise PageXMLError("No image filename found")
-
         regions = find_children(element, "TextRegion")
 
         return Page(
-            image=Image(
-                filename=str(element.attrib["imageFilename"]),
-                width=(
-                    int(element.attrib["imageWidth"])
-                    if "imageWidth" in element.attrib
-                    else None
-                ),
-                height=(
-                    int(element.attrib["imageHeight"])
-                    if "imageHeight" in element.attrib
-                    else None
-                ),
-            ),
+            image=_image_from_xml(element),
             regions={
                 tr.id: tr for tr in (TextRegion.from_xml(region) for region in regions)
             },
         )
 
     @classmethod
-    def from_xml_string(cls, xml_str: str) -> "Page":
-        root = etree.fromstring(xml_str.encode("utf-8"))
+    def from_xml_root(cls, root: Element) -> "Page":
         page_element = find_child(root, "Page")
         if page_element is None:
             raise PageXMLError("No page element found")
         return cls.from_xml(page_element)
 
     @classmethod
-    def from_xml_file(cls, file: Path | str, encoding: str = "utf-8") -> "Page":
-        path = Path(file)
-        xml_string = path.read_text(encoding=encoding)
-        return Page.from_xml_string(xml_string)
+    def from_xml_bytes(cls, xml_bytes: bytes) -> "Page":
+        return cls.from_xml_root(_fromstring(xml_bytes))
+
+    @classmethod
+    def from_xml_string(cls, xml_str: str) -> "Page":
+        return cls.from_xml_bytes(xml_str.encode("utf-8"))
+
+    @classmethod
+    def from_xml_fileobj(
+        cls, fileobj: IO[bytes], encoding: str | None = None
+    ) -> "Page":
+        return cls.from_xml_root(parse_xml(fileobj, encoding=encoding))
+
+    @classmethod
+    def from_xml_file(
+        cls,
+        file: Path | str,
+        encoding: str | None = None,
+        cache: ParseCache | None = None,
+    ) -> "Page":
+        variant = _cache_variant("page", encoding)
+        if cache is not None and variant is not None:
+            return cache.load(
+                Path(file),
+                variant,
+                lambda: cls.from_xml_file(file, encoding=encoding),
+            )
+        return cls.from_xml_root(parse_xml(file, encoding=encoding))
+
+    @classmethod
+    async def afrom_xml_file(
+        cls,
+        file: Path | str,
+        encoding: str | None = None,
+        cache: ParseCache | None = None,
+    ) -> "Page":
+        from .aio import run
+
+        return await run(cls.from_xml_file, file, encoding, cache)
+
+    def to_xml_bytes(self) -> bytes:
+        buffer = BytesIO()
+        self.to_xml_fileobj(buffer)
+        return buffer.getvalue()
+
+    def to_xml_fileobj(self, fileobj: IO[bytes]) -> None:
+        write_xml(fileobj, self.image, self.regions.values())
+
+    def to_xml_file(self, file: Path | str) -> None:
+        with Path(file).open("wb") as fileobj:
+            self.to_xml_fileobj(fileobj)
 
     @classmethod
+    @instrument.timed("Page.from_alto")
     def from_alto(cls, element: Element) -> "Page":
         if QName(element).localname != "alto":
             raise ALTOXMLError("Wrong element given")
@@ -323,22 +653,319 @@ class Page(DataClassJsonMixin):
             },
         )
 
+    def to_alto_bytes(self) -> bytes:
+        buffer = BytesIO()
+        self.to_alto_fileobj(buffer)
+        return buffer.getvalue()
+
+    def to_alto_fileobj(self, fileobj: IO[bytes]) -> None:
+        write_alto(fileobj, self.image, self.regions.values())
+
+    def to_alto_file(self, file: Path | str) -> None:
+        with Path(file).open("wb") as fileobj:
+            self.to_alto_fileobj(fileobj)
+
+    @classmethod
+    def from_alto_bytes(cls, xml_bytes: bytes) -> "Page":
+        return cls.from_alto(_fromstring(xml_bytes))
+
     @classmethod
     def from_alto_string(cls, xml_str: str) -> "Page":
-        root = etree.fromstring(xml_str.encode("utf-8"))
-        return cls.from_alto(root)
+        return cls.from_alto_bytes(xml_str.encode("utf-8"))
 
     @classmethod
-    def from_alto_file(cls, file: Path | str, encoding: str = "utf-8") -> "Page":
-        path = Path(file)
-        xml_string = path.read_text(encoding=encoding)
-        return Page.from_alto_string(xml_string)
+    def from_alto_fileobj(
+        cls, fileobj: IO[bytes], encoding: str | None = None
+    ) -> "Page":
+        return cls.from_alto(parse_xml(fileobj, encoding=encoding))
+
+    @classmethod
+    def from_alto_file(
+        cls,
+        file: Path | str,
+        encoding: str | None = None,
+        cache: ParseCache | None = None,
+    ) -> "Page":
+        variant = _cache_variant("alto", encoding)
+        if cache is not None and variant is not None:
+            return cache.load(
+                Path(file),
+                variant,
+                lambda: cls.from_alto_file(file, encoding=encoding),
+            )
+        return cls.from_alto(parse_xml(file, encoding=encoding))
+
+    @classmethod
+    async def afrom_alto_file(
+        cls,
+        file: Path | str,
+        encoding: str | None = None,
+        cache: ParseCache | None = None,
+    ) -> "Page":
+        from .aio import run
+
+        return await run(cls.from_alto_file, file, encoding, cache)
 
     def lookup_region(self, id: ID) -> TextRegion | None:
         return self.regions.get(id)
 
+    def _current_index(self) -> _PageIndex:
+        if self._index is None or self._index.stamp != _PageIndex.stamp_of(self):
+            self._index = _PageIndex(self)
+        return self._index
+
+    def invalidate_index(self) -> None:
+        self._index = None
+
+    def _query_lines(self, box: Box) -> list[tuple[Box, tuple[TextRegion, TextLine]]]:
+        # Candidates that are no longer on the page reveal an outdated index
+        hits = self._current_index().lines.query(box)
+        if all(region.textlines.get(line.id) is line for _, (region, line) in hits):
+            return hits
+        self._index = None
+        return self._current_index().lines.query(box)
+
+    def lines_at(self, point: Point) -> list[TextLine]:
+        return [
+            line
+            for _, (_, line) in self._query_lines(Box(point, point))
+            if line.coords.polygon.contains(point)
+        ]
+
+    def lines_in(self, box: Box) -> list[TextLine]:
+        return [
+            line
+            for line_box, (_, line) in self._query_lines(box)
+            if box.contains_box(line_box)
+        ]
+
+    def lines_intersecting(self, box: Box) -> list[TextLine]:
+        return [
+            line
+            for _, (_, line) in self._query_lines(box)
+            if line.coords.polygon.intersects_box(box)
+        ]
+
+    def regions_intersecting(self, box: Box) -> list[TextRegion]:
+        return [
+            region
+            for _, region in self._current_index().regions.query(box)
+            if region.coords.polygon.intersects_box(box)
+        ]
+
+    @instrument.timed("Page.crop")
+    def crop(self, box: Box) -> "Page":
+        # Page with the regions and lines intersecting the box, in document
+        # order. Regions are kept if one of their lines intersects. The new
+        # page shares coordinates and lines with this one.
+        lines: dict[int, dict[ID, TextLine]] = {}
+        for _, (region, line) in self._query_lines(box):
+            if line.coords.polygon.intersects_box(box):
+                lines.setdefault(id(region), {}).setdefault(line.id, line)
+        regions = {id(region) for region in self.regions_intersecting(box)}
+        return Page(
+            image=self.image,
+            regions={
+                region.id: TextRegion(
+                    id=region.id,
+                    coords=region.coords,
+                    textlines=lines.get(id(region), {}),
+                )
+                for region in self.regions.values()
+                if id(region) in regions or id(region) in lines
+            },
+        )
+
+    def lookup_textline(self, id: ID) -> TextLine | None:
+        # Hits of a possibly outdated index are verified, which is much
+        # cheaper than checking the whole page structure. Misses are checked
+        # region by region, as the stamp doesn't catch every added line.
+        if self._index is None:
+            found = self._current_index().textlines.get(id)
+            return found[1] if found is not None else None
+        found = self._index.textlines.get(id)
+        if found is not None:
+            region, line = found
+            if (
+                self.regions.get(region.id) is region
+                and region.textlines.get(id) is line
+            ):
+                return line
+            self._index = None  # outdated, e.g. a line was replaced
+            found = self._current_index().textlines.get(id)
+            return found[1] if found is not None else None
+        for region in self.regions.values():
+            if id in region.textlines:
+                self._index.reset_textlines()
+                return region.textlines[id]
+        return None
+
+    def lookup_textlines(self, ids: Iterable[ID]) -> list[TextLine | None]:
+        return [self.lookup_textline(id) for id in ids]
+
     def all_text(self) -> Iterable[str]:
         return (line for region in self.regions.values() for line in region.all_text())
 
     def all_words(self) -> Iterable[str]:
         return (word for region in self.regions.values() for word in region.all_words())
+
+    def to_dict(self, encode_json: bool = False) -> dict[str, Any]:
+        return {
+            "image": self.image.to_dict(),
+            "regions": {id: tr.to_dict() for id, tr in self.regions.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, kvs: Any, *, infer_missing: bool = False) -> "Page":
+        return cls(
+            image=Image.from_dict(kvs["image"], infer_missing=infer_missing),
+            regions={id: TextRegion.from_dict(tr) for id, tr in kvs["regions"].items()},
+        )
+
+
+def _iterparse(file: Path | str, *names: str) -> Iterator[Element]:
+    tags = [f"{{*}}{name}" for name in names]
+    with Path(file).open("rb") as source:
+        for _, element in etree.iterparse(source, events=("end",), tag=tags):
+            yield element
+
+
+def _release(element: Element) -> None:
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def _is_top_level_region(element: Element | None) -> bool:
+    if element is None or QName(element).localname != "TextRegion":
+        return False
+    parent = element.getparent()
+    return parent is not None and QName(parent).localname == "Page"
+
+
+def iter_regions(file: Path | str) -> Iterator[TextRegion]:
+    for element in _iterparse(file, "TextRegion"):
+        # Nested regions are parsed as part of their top level region
+        if _is_top_level_region(element):
+            yield TextRegion.from_xml(element)
+            _release(element)
+
+
+def iter_textlines(file: Path | str) -> Iterator[TextLine]:
+    for element in _iterparse(file, "TextRegion", "TextLine"):
+        if QName(element).localname == "TextLine":
+            if _is_top_level_region(element.getparent()):
+                yield TextLine.from_xml(element)
+                _release(element)
+        elif _is_top_level_region(element):
+            _release(element)
+
+
+_NSMAP = {None: PAGE_NAMESPACE}
+_ALTO_NSMAP = {None: ALTO_NAMESPACE}
+
+
+def read_image(file: Path | str) -> Image:
+    # Reads only the start of the Page element, e.g. to write a transformed
+    # copy of a file with iter_regions and write_xml
+    with Path(file).open("rb") as source:
+        for _, element in etree.iterparse(source, events=("start",), tag="{*}Page"):
+            return _image_from_xml(element)
+    raise PageXMLError("No page element found")
+
+
+def write_xml(fileobj: IO[bytes], image: Image, regions: Iterable[TextRegion]) -> None:
+    # Incremental writing, no element tree is built
+    attrib = {"imageFilename": image.filename}
+    if image.width is not None:
+        attrib["imageWidth"] = str(image.width)
+    if image.height is not None:
+        attrib["imageHeight"] = str(image.height)
+
+    def element(name: str, attrib: dict[str, str] | None = None) -> Any:
+        return xf.element(f"{{{PAGE_NAMESPACE}}}{name}", attrib)
+
+    def text_element(name: str, text: str) -> None:
+        with element(name):
+            xf.write(text)
+
+    def coords_element(coords: Coords) -> None:
+        with element("Coords", {"points": str(coords)}):
+            pass
+
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with etree.xmlfile(fileobj, encoding="utf-8") as xf:
+        xf.write_declaration()
+        with xf.element(QName(PAGE_NAMESPACE, "PcGts"), nsmap=_NSMAP):
+            with element("Metadata"):
+                text_element("Creator", "pygexml")
+                text_element("Created", now)
+                text_element("LastChange", now)
+            with element("Page", attrib):
+                for region in regions:
+                    with element("TextRegion", {"id": region.id}):
+                        coords_element(region.coords)
+                        for line in region.textlines.values():
+                            with element("TextLine", {"id": line.id}):
+                                coords_element(line.coords)
+                                with element("TextEquiv"):
+                                    text_element("Unicode", line.text)
+
+
+def _alto_box(coords: Coords) -> dict[str, str]:
+    box = coords.polygon.bounding_box()
+    return {
+        "HPOS": str(box.top_left.x),
+        "VPOS": str(box.top_left.y),
+        "WIDTH": str(box.width()),
+        "HEIGHT": str(box.height()),
+    }
+
+
+def write_alto(fileobj: IO[bytes], image: Image, regions: Iterable[TextRegion]) -> None:
+    # Incremental writing like write_xml. Boxes are the polygons' bounding
+    # boxes, text is split into String and SP elements at single spaces, so
+    # that reading with from_alto restores it. Regions without lines are
+    # skipped, as from_alto rejects TextBlocks without TextLines.
+    page_attrib = {"ID": "page-1", "PHYSICAL_IMG_NR": "1"}
+    if image.width is not None:
+        page_attrib["WIDTH"] = str(image.width)
+    if image.height is not None:
+        page_attrib["HEIGHT"] = str(image.height)
+
+    def element(name: str, attrib: dict[str, str] | None = None) -> Any:
+        return xf.element(f"{{{ALTO_NAMESPACE}}}{name}", attrib)
+
+    # Tags of the most frequent elements are built once
+    string_tag = f"{{{ALTO_NAMESPACE}}}String"
+    sp_tag = f"{{{ALTO_NAMESPACE}}}SP"
+
+    def textline(line: TextLine) -> None:
+        with element("TextLine", {"ID": line.id} | _alto_box(line.coords)):
+            for n, word in enumerate(line.text.split(" ")):
+                if n > 0:
+                    with xf.element(sp_tag):
+                        pass
+                with xf.element(string_tag, {"CONTENT": word}):
+                    pass
+
+    with etree.xmlfile(fileobj, encoding="utf-8") as xf:
+        xf.write_declaration()
+        with xf.element(QName(ALTO_NAMESPACE, "alto"), nsmap=_ALTO_NSMAP):
+            with element("Description"):
+                with element("MeasurementUnit"):
+                    xf.write("pixel")
+                with element("sourceImageInformation"):
+                    with element("fileName"):
+                        xf.write(image.filename)
+            with element("Layout"), element("Page", page_attrib):
+                with element("PrintSpace"):
+                    for region in regions:
+                        if not region.textlines:
+                            continue
+                        attrib = {"ID": region.id} | _alto_box(region.coords)
+                        with element("TextBlock", attrib):
+                            for line in region.textlines.values():
+                                textline(line)
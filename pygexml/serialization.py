@@ -0,0 +1,54 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Self
+
+from .geometry import Polygon
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def encode_polygon(polygon: Polygon) -> dict[str, Any]:
+    xy = polygon.xy
+    return {"points": [{"x": x, "y": y} for x, y in zip(xy[0::2], xy[1::2])]}
+
+
+def decode_polygon(data: dict[str, Any]) -> Polygon:
+    return Polygon.from_xy(
+        value for point in data["points"] for value in (point["x"], point["y"])
+    )
+
+
+class JsonMixin(ABC):
+    # JSON in the format of dataclasses-json, which earlier versions used via
+    # DataClassJsonMixin. Subclasses implement to_dict and from_dict by hand,
+    # which is much faster than the generic machinery. Unlike
+    # DataClassJsonMixin, this mixin has empty __slots__, so slotted
+    # subclasses don't get a __dict__, and it doesn't import marshmallow.
+    __slots__ = ()
+
+    @abstractmethod
+    def to_dict(self, encode_json: bool = False) -> dict[str, Any]: ...
+
+    @classmethod
+    @abstractmethod
+    def from_dict(cls, kvs: Any, *, infer_missing: bool = False) -> Self: ...
+
+    def to_json(self, **kwargs: Any) -> str:
+        # Keyword arguments are passed to json.dumps
+        if orjson is not None and not kwargs:
+            try:
+                return orjson.dumps(self.to_dict()).decode("utf-8")
+            except TypeError:
+                pass  # orjson doesn't support integers beyond 64 bit
+        return json.dumps(self.to_dict(), **kwargs)
+
+    @classmethod
+    def from_json(
+        cls, s: str | bytes | bytearray, *, infer_missing: bool = False, **kwargs: Any
+    ) -> Self:
+        # Keyword arguments are passed to json.loads. Not orjson, which would
+        # turn integers beyond 64 bit into floats.
+        return cls.from_dict(json.loads(s, **kwargs), infer_missing=infer_missing)
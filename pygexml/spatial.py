@@ -0,0 +1,77 @@
+from collections.abc import Iterable
+from math import isqrt
+from typing import Generic, TypeVar
+
+from .geometry import Box, Point
+
+T = TypeVar("T")
+
+
+class GridIndex(Generic[T]):
+    # Uniform grid over the extent of all boxes with about one item per cell.
+    # Items are registered in every cell their box overlaps, queries return
+    # candidates by box, which callers refine against exact geometry.
+
+    def __init__(self, items: Iterable[tuple[Box, T]]) -> None:
+        self._items = list(items)
+        self._cells: dict[tuple[int, int], list[int]] = {}
+        if not self._items:
+            return
+
+        boxes = [box for box, _ in self._items]
+        self._x0 = min(box.top_left.x for box in boxes)
+        self._y0 = min(box.top_left.y for box in boxes)
+        width = max(box.bottom_right.x for box in boxes) - self._x0 + 1
+        height = max(box.bottom_right.y for box in boxes) - self._y0 + 1
+        # Cells at least as large as an average box keep the number of cells
+        # per item small, e.g. for text lines spanning the whole page
+        size = isqrt(len(boxes)) + 1
+        self._cell_width = max(
+            -(-width // size), sum(box.width() for box in boxes) // len(boxes), 1
+        )
+        self._cell_height = max(
+            -(-height // size), sum(box.height() for box in boxes) // len(boxes), 1
+        )
+        self._columns = (width - 1) // self._cell_width + 1
+        self._rows = (height - 1) // self._cell_height + 1
+
+        for number, box in enumerate(boxes):
+            for cell in self._cells_for(box):
+                self._cells.setdefault(cell, []).append(number)
+
+    def _cells_for(self, box: Box) -> Iterable[tuple[int, int]]:
+        # Clipped to the grid, as query boxes may extend beyond it
+        left = max(0, (box.top_left.x - self._x0) // self._cell_width)
+        right = min(
+            self._columns - 1, (box.bottom_right.x - self._x0) // self._cell_width
+        )
+        top = max(0, (box.top_left.y - self._y0) // self._cell_height)
+        bottom = min(
+            self._rows - 1, (box.bottom_right.y - self._y0) // self._cell_height
+        )
+        return (
+            (column, row)
+            for column in range(left, right + 1)
+            for row in range(top, bottom + 1)
+        )
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def query(self, box: Box) -> list[tuple[Box, T]]:
+        # Candidates whose boxes intersect the given box, in insertion order
+        if not self._items:
+            return []
+        numbers = {
+            number
+            for cell in self._cells_for(box)
+            for number in self._cells.get(cell, ())
+        }
+        return [
+            self._items[number]
+            for number in sorted(numbers)
+            if self._items[number][0].intersects(box)
+        ]
+
+    def query_point(self, point: Point) -> list[tuple[Box, T]]:
+        return self.query(Box(top_left=point, bottom_right=point))
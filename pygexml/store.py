@@ -0,0 +1,311 @@
+import sqlite3
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from .geometry import Box, Polygon
+from .image import Image
+from .page import Coords, Page, TextLine, TextRegion
+
+# Coordinates are stored as int32 arrays (little endian) in BLOB columns.
+# Bounding boxes are indexed in integer R*Trees with the same row IDs as the
+# regions and lines tables. lines_fts is an external content FTS5 table.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    filename TEXT NOT NULL,
+    width INTEGER,
+    height INTEGER
+);
+CREATE TABLE IF NOT EXISTS regions (
+    id INTEGER PRIMARY KEY,
+    page INTEGER NOT NULL REFERENCES pages(id),
+    xml_id TEXT NOT NULL,
+    coords BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS regions_page ON regions(page);
+CREATE TABLE IF NOT EXISTS lines (
+    id INTEGER PRIMARY KEY,
+    region INTEGER NOT NULL REFERENCES regions(id),
+    xml_id TEXT NOT NULL,
+    coords BLOB NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lines_region ON lines(region);
+CREATE VIRTUAL TABLE IF NOT EXISTS lines_fts
+    USING fts5(text, content='lines', content_rowid='id');
+CREATE VIRTUAL TABLE IF NOT EXISTS region_boxes
+    USING rtree_i32(id, x0, x1, y0, y1);
+CREATE VIRTUAL TABLE IF NOT EXISTS line_boxes
+    USING rtree_i32(id, x0, x1, y0, y1);
+"""
+
+
+class StoreError(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class StoreHit:
+    page: str
+    region_id: str
+    line: TextLine
+
+
+def _pack_coords(coords: Coords) -> tuple[bytes, tuple[int, int, int, int]]:
+    # Packed coordinates and bounding box, without creating Point objects
+    xy = array("i", coords.polygon.xy)
+    xs, ys = xy[0::2], xy[1::2]
+    box = (min(xs), max(xs), min(ys), max(ys))
+    if sys.byteorder == "big":
+        xy.byteswap()
+    return xy.tobytes(), box
+
+
+def _unpack_coords(data: bytes) -> Coords:
+    xy = array("i")
+    xy.frombytes(data)
+    if sys.byteorder == "big":
+        xy.byteswap()
+    return Coords(polygon=Polygon.from_xy(xy))
+
+
+def _box_params(box: Box) -> tuple[int, ...]:
+    # R*Tree entries intersecting the given box, clamped to the int32 range
+    bounds = (box.bottom_right.x, box.top_left.x, box.bottom_right.y, box.top_left.y)
+    return tuple(min(max(value, -(2**31)), 2**31 - 1) for value in bounds)
+
+
+_BOX_CONDITION = "b.x0 <= ? AND b.x1 >= ? AND b.y0 <= ? AND b.y1 >= ?"
+
+
+class SQLiteStore(Mapping[str, Page]):
+    def __init__(self, file: Path | str) -> None:
+        # Transactions are handled explicitly
+        self._connection = sqlite3.connect(file, isolation_level=None)
+        try:
+            self._connection.executescript(SCHEMA)
+        except sqlite3.DatabaseError as error:
+            self._connection.close()
+            raise StoreError(f"Not a pygexml store: {error}")
+
+    @classmethod
+    def open(cls, file: Path | str) -> "SQLiteStore":
+        return cls(file)
+
+    def _next_id(self, table: str) -> int:
+        (max_id,) = self._connection.execute(f"SELECT max(id) FROM {table}").fetchone()
+        return int(max_id or 0) + 1
+
+    def add(self, page: Page, key: str | None = None) -> None:
+        self.add_many([page], keys=None if key is None else [key])
+
+    def add_many(
+        self,
+        pages: Iterable[Page],
+        keys: Iterable[str] | None = None,
+        batch_size: int = 1000,
+    ) -> None:
+        # Keys default to image filenames. Each batch of pages is inserted in
+        # one transaction, so a failing batch leaves no partial pages behind.
+        keyed = (
+            ((page.image.filename, page) for page in pages)
+            if keys is None
+            else zip(keys, pages, strict=True)
+        )
+        while batch := list(islice(keyed, batch_size)):
+            self._insert(batch)
+
+    def _insert(self, batch: list[tuple[str, Page]]) -> None:
+        keys = [key for key, _ in batch]
+        if len(set(keys)) < len(keys):
+            duplicate = next(key for key in keys if keys.count(key) > 1)
+            raise StoreError(f"Duplicate key: {duplicate}")
+
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for key in keys:
+                if key in self:
+                    raise StoreError(f"Duplicate key: {key}")
+
+            page_rows: list[tuple[Any, ...]] = []
+            region_rows: list[tuple[Any, ...]] = []
+            line_rows: list[tuple[Any, ...]] = []
+            region_boxes: list[tuple[int, ...]] = []
+            line_boxes: list[tuple[int, ...]] = []
+            page_id = self._next_id("pages")
+            region_id = self._next_id("regions")
+            line_id = self._next_id("lines")
+            for key, page in batch:
+                image = page.image
+                page_rows.append(
+                    (page_id, key, image.filename, image.width, image.height)
+                )
+                for region in page.regions.values():
+                    data, box = _pack_coords(region.coords)
+                    region_rows.append((region_id, page_id, region.id, data))
+                    region_boxes.append((region_id, *box))
+                    for line in region.textlines.values():
+                        data, box = _pack_coords(line.coords)
+                        line_rows.append((line_id, region_id, line.id, data, line.text))
+                        line_boxes.append((line_id, *box))
+                        line_id += 1
+                    region_id += 1
+                page_id += 1
+
+            connection.executemany(
+                "INSERT INTO pages VALUES (?, ?, ?, ?, ?)", page_rows
+            )
+            connection.executemany(
+                "INSERT INTO regions VALUES (?, ?, ?, ?)", region_rows
+            )
+            connection.executemany(
+                "INSERT INTO lines VALUES (?, ?, ?, ?, ?)", line_rows
+            )
+            connection.executemany(
+                "INSERT INTO lines_fts (rowid, text) VALUES (?, ?)",
+                ((row[0], row[4]) for row in line_rows),
+            )
+            connection.executemany(
+                "INSERT INTO region_boxes VALUES (?, ?, ?, ?, ?)", region_boxes
+            )
+            connection.executemany(
+                "INSERT INTO line_boxes VALUES (?, ?, ?, ?, ?)", line_boxes
+            )
+        except BaseException as error:
+            connection.execute("ROLLBACK")
+            if isinstance(error, OverflowError):
+                raise StoreError("Value out of range")
+            raise
+        connection.execute("COMMIT")
+
+    def __getitem__(self, key: str) -> Page:
+        found = self._connection.execute(
+            "SELECT id, filename, width, height FROM pages WHERE key = ?", (key,)
+        ).fetchone()
+        if found is None:
+            raise KeyError(key)
+        page_id, filename, width, height = found
+
+        regions: dict[str, TextRegion] = {}
+        rows = self._connection.execute(
+            "SELECT r.id, r.xml_id, r.coords, l.xml_id, l.coords, l.text "
+            "FROM regions r LEFT JOIN lines l ON l.region = r.id "
+            "WHERE r.page = ? ORDER BY r.id, l.id",
+            (page_id,),
+        )
+        region = None
+        current = None
+        for row_id, region_id, region_coords, line_id, line_coords, text in rows:
+            if row_id != current:
+                current = row_id
+                region = TextRegion(
+                    id=region_id, coords=_unpack_coords(region_coords), textlines={}
+                )
+                regions[region_id] = region
+            if line_id is not None and region is not None:
+                region.textlines[line_id] = TextLine(
+                    id=line_id, coords=_unpack_coords(line_coords), text=text
+                )
+        return Page(
+            image=Image(filename=filename, width=width, height=height),
+            regions=regions,
+        )
+
+    def __contains__(self, key: object) -> bool:
+        found = self._connection.execute(
+            "SELECT 1 FROM pages WHERE key = ?", (key,)
+        ).fetchone()
+        return found is not None
+
+    def __iter__(self) -> Iterator[str]:
+        keys = self._connection.execute("SELECT key FROM pages ORDER BY id")
+        return (key for (key,) in keys.fetchall())
+
+    def __len__(self) -> int:
+        (count,) = self._connection.execute("SELECT count(*) FROM pages").fetchone()
+        return int(count)
+
+    def search(
+        self,
+        query: str,
+        box: Box | None = None,
+        page: str | None = None,
+        limit: int | None = None,
+    ) -> list[StoreHit]:
+        # Full-text query in FTS5 syntax, optionally restricted to lines whose
+        # bounding boxes intersect the given box and to a single page
+        sql = (
+            "SELECT p.key, r.xml_id, l.xml_id, l.coords, l.text "
+            "FROM lines_fts f "
+            "JOIN lines l ON l.id = f.rowid "
+            "JOIN regions r ON r.id = l.region "
+            "JOIN pages p ON p.id = r.page "
+        )
+        params: list[Any] = []
+        if box is not None:
+            sql += f"JOIN line_boxes b ON b.id = l.id AND {_BOX_CONDITION} "
+            params += _box_params(box)
+        sql += "WHERE lines_fts MATCH ? "
+        params.append(query)
+        if page is not None:
+            sql += "AND p.key = ? "
+            params.append(page)
+        sql += "ORDER BY l.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        try:
+            rows = self._connection.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as error:
+            raise StoreError(f"Invalid query: {error}")
+        return [
+            StoreHit(
+                page=key,
+                region_id=region_id,
+                line=TextLine(id=line_id, coords=_unpack_coords(coords), text=text),
+            )
+            for key, region_id, line_id, coords, text in rows
+        ]
+
+    def regions_intersecting(
+        self, box: Box, page: str | None = None
+    ) -> list[tuple[str, str]]:
+        # (page key, region ID) of regions whose bounding boxes intersect
+        sql = (
+            "SELECT p.key, r.xml_id FROM region_boxes b "
+            "JOIN regions r ON r.id = b.id "
+            f"JOIN pages p ON p.id = r.page WHERE {_BOX_CONDITION} "
+        )
+        params: list[Any] = list(_box_params(box))
+        if page is not None:
+            sql += "AND p.key = ? "
+            params.append(page)
+        sql += "ORDER BY r.id"
+        return [
+            (key, region_id)
+            for key, region_id in self._connection.execute(sql, params).fetchall()
+        ]
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "SQLiteStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -1,11 +1,21 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import IO, Any
+
 from lxml import etree
 from lxml.etree import _Element as Element
 
-from .page import Page, TextRegion, TextLine
+from . import instrument
+from .geometry import Box, Point
+from .page import Coords, Page, TextRegion, TextLine
 
 SVG_NS = "http://www.w3.org/2000/svg"
 XLINK_NS = "http://www.w3.org/1999/xlink"
 
+_NSMAP = {None: SVG_NS, "xlink": XLINK_NS}
+
 
 class SVGError(Exception):
     pass
@@ -21,31 +31,111 @@ def _baseline_path_d(line: TextLine) -> str:
     return f"M {box.top_left.x},{y_baseline} {box.bottom_right.x},{y_baseline}"
 
 
-def _line_to_svg(line: TextLine) -> Element:
-    g = etree.Element(f"{{{SVG_NS}}}g", attrib={"id": line.id, "class": "TextLine"})
-    etree.SubElement(
-        g,
-        f"{{{SVG_NS}}}path",
-        attrib={
-            "d": _coords_path(str(line.coords)),
-            "class": "Coords",
-        },
-    )
-    etree.SubElement(
-        g,
-        f"{{{SVG_NS}}}path",
-        attrib={
-            "id": f"bl-{line.id}",
-            "d": _baseline_path_d(line),
-            "class": "Baseline",
-        },
+def _dimensions(page: Page) -> tuple[int, int]:
+    if page.image.width is None:
+        raise SVGError("Image width is required for SVG generation")
+    if page.image.height is None:
+        raise SVGError("Image height is required for SVG generation")
+    return page.image.width, page.image.height
+
+
+@dataclass(frozen=True, slots=True)
+class Tile:
+    level: int
+    column: int
+    row: int
+    box: Box
+
+
+class _View:
+    # Part of a page to render and the level of detail: with a tile size,
+    # the viewport is scaled to fit and polygons are simplified to half an
+    # output pixel. Tiles of a pyramid are scaled by the extent of their
+    # level instead, so that tiles cut at the page edges match the others.
+
+    def __init__(
+        self,
+        page: Page,
+        viewport: Box | None = None,
+        tile_size: int | None = None,
+        extent: int | None = None,
+    ) -> None:
+        self.width, self.height = _dimensions(page)
+        if viewport is None:
+            viewport = Box(Point(0, 0), Point(self.width, self.height))
+            self.page = page
+        else:
+            self.page = page.crop(viewport)
+        if viewport.width() <= 0 or viewport.height() <= 0:
+            raise SVGError("Viewport must not be empty")
+        if tile_size is not None and tile_size <= 0:
+            raise SVGError("Tile size must be positive")
+
+        scale = 1.0
+        self.tolerance = 0.0
+        if tile_size is not None:
+            if extent is None:
+                extent = max(viewport.width(), viewport.height())
+            scale = tile_size / extent
+            self.tolerance = 0.5 / scale
+        x, y = viewport.top_left.x, viewport.top_left.y
+        self.attrib = {
+            "width": str(max(1, round(viewport.width() * scale))),
+            "height": str(max(1, round(viewport.height() * scale))),
+            "viewBox": f"{x} {y} {viewport.width()} {viewport.height()}",
+        }
+
+
+def _image_attrib(page: Page, width: int, height: int) -> dict[str, str]:
+    return {
+        "x": "0",
+        "y": "0",
+        "width": str(width),
+        "height": str(height),
+        f"{{{XLINK_NS}}}href": page.image.filename,
+        "preserveAspectRatio": "none",
+    }
+
+
+def _style_text(width: int, height: int) -> str:
+    font_size = max(width, height) // 60
+    return (
+        f"\n"
+        f"    path.Coords {{ fill: rgba(100,160,255,0.12); stroke: steelblue; stroke-width: {max(width, height) // 1500}; }}\n"
+        f"    path.Baseline {{ stroke: #e74c3c; stroke-width: {max(width, height) // 2000}; fill: none; }}\n"
+        f"    .TextLine text {{ font-size: {font_size}px; font-family: serif; fill: #000; opacity: 0; transition: opacity 0.15s; }}\n"
+        f"    .TextLine:hover text {{ opacity: 1; }}\n"
+        f"  "
     )
+
+
+def _coords_attrib(
+    element: TextRegion | TextLine, tolerance: float = 0.0
+) -> dict[str, str]:
+    coords = element.coords
+    if tolerance > 0:
+        polygon = coords.polygon.simplify(tolerance)
+        if polygon is not coords.polygon:
+            coords = Coords(polygon=polygon)
+    return {"d": _coords_path(str(coords)), "class": "Coords"}
+
+
+def _baseline_attrib(line: TextLine) -> dict[str, str]:
+    return {"id": f"bl-{line.id}", "d": _baseline_path_d(line), "class": "Baseline"}
+
+
+def _text_path_attrib(line: TextLine) -> dict[str, str]:
+    return {f"{{{XLINK_NS}}}href": f"#bl-{line.id}", "textLength": "100%"}
+
+
+def _line_to_svg(line: TextLine, tolerance: float = 0.0) -> Element:
+    g = etree.Element(f"{{{SVG_NS}}}g", attrib={"id": line.id, "class": "TextLine"})
+    etree.SubElement(g, f"{{{SVG_NS}}}path", attrib=_coords_attrib(line, tolerance))
+    etree.SubElement(g, f"{{{SVG_NS}}}path", attrib=_baseline_attrib(line))
     if line.text:
         text = etree.SubElement(g, f"{{{SVG_NS}}}text")
         text_path = etree.SubElement(
-            text,
-            f"{{{SVG_NS}}}textPath",
-            attrib={f"{{{XLINK_NS}}}href": f"#bl-{line.id}", "textLength": "100%"},
+            text, f"{{{SVG_NS}}}textPath", attrib=_text_path_attrib(line)
         )
         tspan = etree.SubElement(
             text_path, f"{{{SVG_NS}}}tspan", attrib={"class": "Text"}
@@ -54,80 +144,236 @@ def _line_to_svg(line: TextLine) -> Element:
     return g
 
 
-def _region_to_svg(region: TextRegion) -> Element:
+def _region_to_svg(region: TextRegion, tolerance: float = 0.0) -> Element:
     g = etree.Element(f"{{{SVG_NS}}}g", attrib={"id": region.id, "class": "TextRegion"})
-    etree.SubElement(
-        g,
-        f"{{{SVG_NS}}}path",
-        attrib={
-            "d": _coords_path(str(region.coords)),
-            "class": "Coords",
-        },
-    )
+    etree.SubElement(g, f"{{{SVG_NS}}}path", attrib=_coords_attrib(region, tolerance))
     for line in region.textlines.values():
-        g.append(_line_to_svg(line))
+        g.append(_line_to_svg(line, tolerance))
     return g
 
 
 def _default_style(width: int, height: int) -> Element:
-    font_size = max(width, height) // 60
     style = etree.Element(f"{{{SVG_NS}}}style")
-    style.text = (
-        f"\n"
-        f"    path.Coords {{ fill: rgba(100,160,255,0.12); stroke: steelblue; stroke-width: {max(width, height) // 1500}; }}\n"
-        f"    path.Baseline {{ stroke: #e74c3c; stroke-width: {max(width, height) // 2000}; fill: none; }}\n"
-        f"    .TextLine text {{ font-size: {font_size}px; font-family: serif; fill: #000; opacity: 0; transition: opacity 0.15s; }}\n"
-        f"    .TextLine:hover text {{ opacity: 1; }}\n"
-        f"  "
-    )
+    style.text = _style_text(width, height)
     return style
 
 
-def page_to_svg(page: Page, include_style: bool = True) -> Element:
-    if page.image.width is None:
-        raise SVGError("Image width is required for SVG generation")
-    if page.image.height is None:
-        raise SVGError("Image height is required for SVG generation")
-
-    width = page.image.width
-    height = page.image.height
+@instrument.timed("svg.page_to_svg")
+def page_to_svg(
+    page: Page,
+    include_style: bool = True,
+    viewport: Box | None = None,
+    tile_size: int | None = None,
+    include_image: bool = True,
+) -> Element:
+    view = _View(page, viewport, tile_size)
+    width, height = view.width, view.height
 
     svg = etree.Element(
         f"{{{SVG_NS}}}svg",
         # the official way to do it although stubs are wrong:
-        nsmap={None: SVG_NS, "xlink": XLINK_NS},  # type: ignore
-        attrib={
-            "width": str(width),
-            "height": str(height),
-            "viewBox": f"0 0 {width} {height}",
-        },
+        nsmap=_NSMAP,  # type: ignore
+        attrib=view.attrib,
     )
 
-    etree.SubElement(
-        svg,
-        f"{{{SVG_NS}}}image",
-        attrib={
-            "x": "0",
-            "y": "0",
-            "width": str(width),
-            "height": str(height),
-            f"{{{XLINK_NS}}}href": page.image.filename,
-            "preserveAspectRatio": "none",
-        },
-    )
+    if include_image:
+        etree.SubElement(
+            svg, f"{{{SVG_NS}}}image", attrib=_image_attrib(page, width, height)
+        )
 
     if include_style:
         svg.insert(0, _default_style(width, height))
 
-    for region in page.regions.values():
-        svg.append(_region_to_svg(region))
+    for region in view.page.regions.values():
+        svg.append(_region_to_svg(region, view.tolerance))
 
     return svg
 
 
-def page_to_svg_string(page: Page, include_style: bool = True) -> str:
+@instrument.timed("svg.page_to_svg_string")
+def page_to_svg_string(
+    page: Page,
+    include_style: bool = True,
+    viewport: Box | None = None,
+    tile_size: int | None = None,
+    include_image: bool = True,
+) -> str:
     return etree.tostring(
-        page_to_svg(page, include_style=include_style),
+        page_to_svg(
+            page,
+            include_style=include_style,
+            viewport=viewport,
+            tile_size=tile_size,
+            include_image=include_image,
+        ),
         encoding="unicode",
         pretty_print=True,
     )
+
+
+async def apage_to_svg_string(
+    page: Page,
+    include_style: bool = True,
+    viewport: Box | None = None,
+    tile_size: int | None = None,
+    include_image: bool = True,
+) -> str:
+    from .aio import run
+
+    return await run(
+        page_to_svg_string, page, include_style, viewport, tile_size, include_image
+    )
+
+
+def write_svg(
+    fileobj: IO[bytes],
+    page: Page,
+    include_style: bool = True,
+    pretty: bool = False,
+    viewport: Box | None = None,
+    tile_size: int | None = None,
+    include_image: bool = True,
+) -> None:
+    # Same document as page_to_svg, written incrementally without a tree.
+    # Pretty printing indents elements but keeps text elements on one line.
+    view = _View(page, viewport, tile_size)
+    _write_svg(fileobj, page, view, include_style, pretty, include_image)
+
+
+@instrument.timed("svg.write_svg")
+def _write_svg(
+    fileobj: IO[bytes],
+    page: Page,
+    view: _View,
+    include_style: bool,
+    pretty: bool,
+    include_image: bool,
+) -> None:
+    width, height, tolerance = view.width, view.height, view.tolerance
+
+    def element(name: str, attrib: dict[str, str] | None = None) -> Any:
+        return xf.element(f"{{{SVG_NS}}}{name}", attrib)
+
+    def empty_element(name: str, attrib: dict[str, str]) -> None:
+        with element(name, attrib):
+            pass
+
+    def indent(level: int) -> None:
+        if pretty:
+            xf.write("\n" + "  " * level)
+
+    def textline(line: TextLine) -> None:
+        with element("g", {"id": line.id, "class": "TextLine"}):
+            indent(3)
+            empty_element("path", _coords_attrib(line, tolerance))
+            indent(3)
+            empty_element("path", _baseline_attrib(line))
+            if line.text:
+                indent(3)
+                with (
+                    element("text"),
+                    element("textPath", _text_path_attrib(line)),
+                    element("tspan", {"class": "Text"}),
+                ):
+                    xf.write(line.text)
+            indent(2)
+
+    with etree.xmlfile(fileobj, encoding="utf-8") as xf:
+        xf.write_declaration()
+        with xf.element(f"{{{SVG_NS}}}svg", view.attrib, nsmap=_NSMAP):
+            if include_style:
+                indent(1)
+                with element("style"):
+                    xf.write(_style_text(width, height))
+            if include_image:
+                indent(1)
+                empty_element("image", _image_attrib(page, width, height))
+            for region in view.page.regions.values():
+                indent(1)
+                with element("g", {"id": region.id, "class": "TextRegion"}):
+                    indent(2)
+                    empty_element("path", _coords_attrib(region, tolerance))
+                    for line in region.textlines.values():
+                        indent(2)
+                        textline(line)
+                    indent(1)
+            indent(0)
+
+
+def page_to_svg_file(
+    page: Page,
+    file: Path | str | IO[bytes],
+    pretty: bool = False,
+    include_style: bool = True,
+    viewport: Box | None = None,
+    tile_size: int | None = None,
+    include_image: bool = True,
+) -> None:
+    options: dict[str, Any] = {
+        "include_style": include_style,
+        "pretty": pretty,
+        "viewport": viewport,
+        "tile_size": tile_size,
+        "include_image": include_image,
+    }
+    if isinstance(file, (Path, str)):
+        with Path(file).open("wb") as fileobj:
+            write_svg(fileobj, page, **options)
+    else:
+        write_svg(file, page, **options)
+
+
+def _levels(width: int, height: int, tile_size: int) -> int:
+    levels = 1
+    while tile_size << (levels - 1) < max(width, height):
+        levels += 1
+    return levels
+
+
+def tiles(page: Page, tile_size: int = 256) -> Iterator[Tile]:
+    # Tile pyramid as in Deep Zoom: level 0 shows the whole page in a single
+    # tile, each further level doubles the resolution, up to full resolution.
+    # Tiles at the right and bottom edges are cut to the page.
+    width, height = _dimensions(page)
+    if tile_size <= 0:
+        raise SVGError("Tile size must be positive")
+    levels = _levels(width, height, tile_size)
+    for level in range(levels):
+        extent = tile_size << (levels - 1 - level)
+        for row in range(max(1, -(-height // extent))):
+            for column in range(max(1, -(-width // extent))):
+                top_left = Point(column * extent, row * extent)
+                bottom_right = Point(
+                    min(top_left.x + extent, width), min(top_left.y + extent, height)
+                )
+                yield Tile(level, column, row, Box(top_left, bottom_right))
+
+
+def tile_pyramid(
+    page: Page, tile_size: int = 256, include_style: bool = False
+) -> Iterator[tuple[Tile, bytes]]:
+    # SVG overlays of all tiles, without the image, each containing only the
+    # regions and lines intersecting the tile, simplified to its resolution
+    width, height = _dimensions(page)
+    for tile in tiles(page, tile_size):
+        extent = tile_size << (_levels(width, height, tile_size) - 1 - tile.level)
+        buffer = BytesIO()
+        view = _View(page, tile.box, tile_size, extent)
+        _write_svg(buffer, page, view, include_style, False, False)
+        yield tile, buffer.getvalue()
+
+
+def write_tiles(
+    page: Page,
+    directory: Path | str,
+    tile_size: int = 256,
+    include_style: bool = False,
+) -> list[Path]:
+    # Files are named <level>/<column>_<row>.svg
+    files = []
+    for tile, svg in tile_pyramid(page, tile_size, include_style):
+        file = Path(directory) / str(tile.level) / f"{tile.column}_{tile.row}.svg"
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_bytes(svg)
+        files.append(file)
+    return files
@@ -0,0 +1,213 @@
+from array import array
+from bisect import bisect
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import partial
+from itertools import accumulate
+from pathlib import Path
+from random import Random
+from typing import TypeAlias
+
+from .batch import ExecutorKind, Format, _check_options, _run, save
+from .geometry import Polygon
+from .image import Image
+from .page import Coords, Page, TextLine, TextRegion
+
+# Seeded generator of realistic looking pages for benchmarks and load tests.
+# Unlike pygexml.strategies, which is built for shrinking, it produces pages
+# of a given size quickly and reproducibly: page n of a seed is always the
+# same, no matter which other pages are generated.
+
+Span: TypeAlias = int | tuple[int, int]
+
+
+class SynthError(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Layout:
+    # Defaults resemble a two-column A4 page scanned at 300 dpi.
+    # Spans are fixed values or inclusive (min, max) ranges.
+    width: int = 2480
+    height: int = 3508
+    columns: int = 2
+    regions_per_column: int = 2
+    lines_per_region: Span = (20, 30)
+    vertices: int = 8
+    words_per_line: Span = (6, 10)
+    margin: int = 150
+    gutter: int = 60
+
+
+def _vocabulary(size: int = 5000) -> tuple[list[str], list[float]]:
+    # Pseudo words with Zipf distributed frequencies
+    random = Random(0)
+    syllables = [c + v for c in "bdfgklmnprstvz" for v in "aeiou"]
+    words = list(
+        dict.fromkeys(
+            "".join(random.choices(syllables, k=random.randint(1, 4)))
+            for _ in range(size)
+        )
+    )
+    weights = accumulate(1 / rank for rank in range(1, len(words) + 1))
+    return words, list(weights)
+
+
+_WORDS, _CUM_WEIGHTS = _vocabulary()
+
+
+def _span(random: Random, span: Span) -> int:
+    return span if isinstance(span, int) else random.randint(*span)
+
+
+def _check(layout: Layout) -> None:
+    for name in ("width", "height", "columns", "regions_per_column"):
+        if getattr(layout, name) < 1:
+            raise SynthError(f"{name} must be positive")
+    for name in ("lines_per_region", "words_per_line"):
+        span = getattr(layout, name)
+        low, high = (span, span) if isinstance(span, int) else span
+        if low < 0 or low > high:
+            raise SynthError(f"Invalid {name}: {span}")
+    if layout.vertices < 4:
+        raise SynthError("At least 4 vertices are required")
+
+
+def _text(random: Random, words: int) -> str:
+    total = _CUM_WEIGHTS[-1]
+    return " ".join(
+        _WORDS[bisect(_CUM_WEIGHTS, random.random() * total)] for _ in range(words)
+    )
+
+
+def _line_polygon(
+    random: Random, x: int, y: int, width: int, height: int, vertices: int
+) -> Polygon:
+    # Upper edge left to right and lower edge back, with some jitter
+    upper, lower = (vertices + 1) // 2, vertices // 2
+    jitter = max(height // 8, 1)
+    xy = array("q")
+    for i in range(upper):
+        xy.append(x + width * i // (upper - 1))
+        xy.append(y + random.randint(0, jitter))
+    for i in reversed(range(lower)):
+        xy.append(x + width * i // max(lower - 1, 1))
+        xy.append(y + height - random.randint(0, jitter))
+    return Polygon.from_xy(xy)
+
+
+def _region_coords(x: int, y: int, width: int, height: int) -> Coords:
+    return Coords(
+        polygon=Polygon.from_xy(
+            [x, y, x + width, y, x + width, y + height, x, y + height]
+        )
+    )
+
+
+def generate_page(layout: Layout = Layout(), seed: int = 0, number: int = 0) -> Page:
+    _check(layout)
+    random = Random(f"{seed}/{number}")
+    columns, per_column = layout.columns, layout.regions_per_column
+    column_width = (
+        layout.width - 2 * layout.margin - (columns - 1) * layout.gutter
+    ) // columns
+    region_height = (
+        layout.height - 2 * layout.margin - (per_column - 1) * layout.gutter
+    ) // per_column
+    if column_width < 1 or region_height < 1:
+        raise SynthError("Page too small for the layout")
+
+    regions = {}
+    for column in range(columns):
+        x = layout.margin + column * (column_width + layout.gutter)
+        for index in range(per_column):
+            y = layout.margin + index * (region_height + layout.gutter)
+            region_id = f"r{column}_{index}"
+            count = _span(random, layout.lines_per_region)
+            textlines = {}
+            if count > 0:
+                line_height = region_height // count
+                if line_height < 2:
+                    raise SynthError("Too many lines for the region height")
+                for n in range(count):
+                    line_id = f"{region_id}_l{n}"
+                    textlines[line_id] = TextLine(
+                        id=line_id,
+                        coords=Coords(
+                            polygon=_line_polygon(
+                                random,
+                                x,
+                                y + n * line_height,
+                                column_width,
+                                line_height * 3 // 4,
+                                layout.vertices,
+                            )
+                        ),
+                        text=_text(random, _span(random, layout.words_per_line)),
+                    )
+            regions[region_id] = TextRegion(
+                id=region_id,
+                coords=_region_coords(x, y, column_width, region_height),
+                textlines=textlines,
+            )
+
+    return Page(
+        image=Image(
+            filename=f"page-{number:06d}.jpg", width=layout.width, height=layout.height
+        ),
+        regions=regions,
+    )
+
+
+def generate_pages(
+    count: int, layout: Layout = Layout(), seed: int = 0
+) -> Iterator[Page]:
+    _check(layout)
+    return (generate_page(layout, seed, number) for number in range(count))
+
+
+def _write_chunk(
+    directory: Path,
+    layout: Layout,
+    seed: int,
+    formats: tuple[Format, ...],
+    numbers: list[int],
+) -> list[Path]:
+    files = []
+    for number in numbers:
+        page = generate_page(layout, seed, number)
+        for format in formats:
+            file = directory / format / f"page-{number:06d}.xml"
+            save(page, file, format)
+            files.append(file)
+    return files
+
+
+def write_corpus(
+    directory: Path | str,
+    count: int,
+    layout: Layout = Layout(),
+    seed: int = 0,
+    formats: tuple[Format, ...] = ("page",),
+    workers: int | None = None,
+    chunksize: int | None = None,
+    executor: ExecutorKind = "process",
+) -> list[Path]:
+    # Writes <directory>/<format>/page-<number>.xml for each format, generated
+    # and written in parallel. Returns the files in page order.
+    _check_options(executor, *formats)
+    _check(layout)
+    directory = Path(directory)
+    for format in formats:
+        (directory / format).mkdir(parents=True, exist_ok=True)
+    return list(
+        _run(
+            partial(_write_chunk, directory, layout, seed, tuple(formats)),
+            list(range(count)),
+            workers,
+            chunksize,
+            True,
+            executor,
+        )
+    )
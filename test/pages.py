@@ -0,0 +1,28 @@
+from pygexml.image import Image
+from pygexml.page import Coords, Page, TextLine, TextRegion
+
+
+def make_page(filename: str, *texts: str) -> Page:
+    # One region with a line per text, one below the other, and an empty region
+    return Page(
+        image=Image(filename=filename, width=800, height=None),
+        regions={
+            "r1": TextRegion(
+                id="r1",
+                coords=Coords.parse("0,0 100,0 100,100 0,100"),
+                textlines={
+                    f"l{n}": TextLine(
+                        id=f"l{n}",
+                        coords=Coords.parse(f"0,{n * 10} 100,{n * 10 + 5}"),
+                        text=text,
+                    )
+                    for n, text in enumerate(texts)
+                },
+            ),
+            "r2": TextRegion(
+                id="r2",
+                coords=Coords.parse("200,0 300,0 300,100"),
+                textlines={},
+            ),
+        },
+    )
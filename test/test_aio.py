@@ -0,0 +1,233 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from pygexml import aio
+from pygexml.aio import AioError, aload_many, configure, get_executor, run, shutdown
+from pygexml.batch import BatchError, load
+from pygexml.instrument import instrument
+from pygexml.page import Page, validation
+from pygexml.svg import apage_to_svg_string, page_to_svg_string
+
+PAGE_XML = """<?xml version='1.0' encoding='utf-8'?>
+    <PcGts xmlns="http://schema.primaresearch.org/PAGE/gts/pagecontent/2019-07-15">
+        <Page imageFilename="{name}.jpg" imageWidth="800" imageHeight="600">
+            <TextRegion id="r1">
+                <Coords points="0,0 10,0 10,10 0,10"/>
+                <TextLine id="l1">
+                    <Coords points="1,1 9,1 9,9 1,9"/>
+                    <TextEquiv><Unicode>{name}</Unicode></TextEquiv>
+                </TextLine>
+            </TextRegion>
+        </Page>
+    </PcGts>
+"""
+
+ALTO_XML = """
+    <alto>
+        <Description>
+            <sourceImageInformation>
+                <fileName>page.jpg</fileName>
+            </sourceImageInformation>
+        </Description>
+        <Layout>
+            <Page>
+                <PrintSpace>
+                    <TextBlock ID="tr-1" HPOS="1" VPOS="2" WIDTH="3" HEIGHT="4">
+                        <TextLine ID="tl-1" HPOS="2" VPOS="3" WIDTH="4" HEIGHT="5">
+                            <String CONTENT="page"/>
+                        </TextLine>
+                    </TextBlock>
+                </PrintSpace>
+            </Page>
+        </Layout>
+    </alto>
+"""
+
+
+def write_files(directory: Path, count: int) -> list[Path]:
+    paths = []
+    for i in range(count):
+        path = directory / f"file-{i}.xml"
+        path.write_text(PAGE_XML.format(name=f"page-{i}"), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+@pytest.fixture(autouse=True)
+def fresh_executor() -> Iterator[None]:
+    shutdown()
+    yield
+    shutdown()
+
+
+def test_afrom_files(tmp_path: Path) -> None:
+    (page_file,) = write_files(tmp_path, 1)
+    alto_file = tmp_path / "alto.xml"
+    alto_file.write_text(ALTO_XML, encoding="utf-8")
+
+    async def main() -> tuple[Page, Page, str]:
+        page = await Page.afrom_xml_file(page_file)
+        alto = await Page.afrom_alto_file(str(alto_file))
+        return page, alto, await apage_to_svg_string(page, include_style=False)
+
+    page, alto, svg = asyncio.run(main())
+    assert page == Page.from_xml_file(page_file)
+    assert alto == Page.from_alto_file(alto_file)
+    assert svg == page_to_svg_string(page, include_style=False)
+
+
+def test_run_uses_configured_executor() -> None:
+    configure(max_workers=2)
+    executor = get_executor()
+    assert isinstance(executor, ThreadPoolExecutor)
+    assert executor._max_workers == 2
+    assert asyncio.run(run(threading.current_thread)).name.startswith("pygexml")
+
+    with ThreadPoolExecutor(thread_name_prefix="own") as own:
+        configure(executor=own)
+        assert get_executor() is own
+        assert asyncio.run(run(threading.current_thread)).name.startswith("own")
+        shutdown()  # leaves executors of callers alone
+        assert own.submit(int, "1").result() == 1
+    assert get_executor() is not own
+
+
+def test_run_copies_context(tmp_path: Path) -> None:
+    (page_file,) = write_files(tmp_path, 1)
+    page_file.write_text(
+        page_file.read_text(encoding="utf-8").replace("1,1 9,1", "-1,1 9,1"),
+        encoding="utf-8",
+    )
+
+    async def main() -> None:
+        with validation("collect") as diagnostics, instrument() as recorder:
+            await Page.afrom_xml_file(page_file)
+        assert diagnostics.counts == {"coords": 1}
+        assert "Page.from_xml" in recorder.to_dict()["phases"]
+
+    asyncio.run(main())
+
+
+def test_configure_invalid() -> None:
+    with pytest.raises(AioError):
+        configure(max_workers=0)
+    with ThreadPoolExecutor() as own, pytest.raises(AioError):
+        configure(max_workers=2, executor=own)
+
+
+def test_aload_many(tmp_path: Path) -> None:
+    paths = write_files(tmp_path, 10)
+    (tmp_path / "broken.xml").write_text("<nope", encoding="utf-8")
+    paths.insert(3, tmp_path / "broken.xml")
+
+    async def collect(ordered: bool) -> list[tuple[Path, Page | Exception]]:
+        return [result async for result in aload_many(paths, limit=3, ordered=ordered)]
+
+    results = asyncio.run(collect(ordered=True))
+    assert [path for path, _ in results] == paths
+    assert isinstance(results[3][1], Exception)
+    assert [
+        result.image.filename for _, result in results if isinstance(result, Page)
+    ] == [f"page-{i}.jpg" for i in range(10)]
+
+    results = asyncio.run(collect(ordered=False))
+    assert sorted(path for path, _ in results) == sorted(paths)
+
+
+def test_aload_many_limit(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    paths = write_files(tmp_path, 20)
+    running = peak = 0
+    lock = threading.Lock()
+
+    def counting_load(path: Path, format: str) -> Page:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        try:
+            return load(path, "page")
+        finally:
+            with lock:
+                running -= 1
+
+    monkeypatch.setattr(aio, "load", counting_load)
+    configure(max_workers=16)
+
+    async def main() -> int:
+        return len([result async for result in aload_many(paths, limit=4)])
+
+    assert asyncio.run(main()) == 20
+    assert 1 <= peak <= 4
+
+
+def test_aload_many_cancellation(tmp_path: Path) -> None:
+    paths = write_files(tmp_path, 20)
+
+    async def main() -> list[asyncio.Task[object]]:
+        iterator = aload_many(paths, limit=5)
+        async for _ in iterator:
+            break
+        await iterator.aclose()
+        await asyncio.sleep(0)
+        return [
+            task
+            for task in asyncio.all_tasks()
+            if task is not asyncio.current_task() and not task.done()
+        ]
+
+    assert asyncio.run(main()) == []
+
+
+def test_aload_many_cancelled_consumer(tmp_path: Path) -> None:
+    paths = write_files(tmp_path, 20)
+
+    async def main() -> bool:
+        async def consume() -> None:
+            async for _ in aload_many(paths, limit=5):
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+        return all(
+            task.done()
+            for task in asyncio.all_tasks()
+            if task is not asyncio.current_task()
+        )
+
+    assert asyncio.run(main())
+
+
+def test_aload_many_validation(tmp_path: Path) -> None:
+    paths = write_files(tmp_path, 3)
+    paths[1].write_text(
+        paths[1].read_text(encoding="utf-8").replace("1,1 9,1", "-1,1 9,1"),
+        encoding="utf-8",
+    )
+
+    async def main() -> list[tuple[Path, Page | Exception, int]]:
+        return [
+            (path, page, diagnostics.total)
+            async for path, page, diagnostics in aload_many(paths, validation="collect")
+        ]
+
+    results = asyncio.run(main())
+    assert [(path, total) for path, _, total in results] == list(zip(paths, [0, 1, 0]))
+    assert all(isinstance(page, Page) for _, page, _ in results)
+
+
+def test_aload_many_invalid_options() -> None:
+    with pytest.raises(BatchError, match="Unknown format"):
+        aload_many([], format="nope")  # type: ignore[call-overload]
+    with pytest.raises(AioError, match="limit"):
+        aload_many([], limit=0)
+    with pytest.raises(AioError, match="Unknown validation mode"):
+        aload_many([], validation="nope")  # type: ignore
@@ -0,0 +1,147 @@
+from pathlib import Path
+
+import pytest
+from hypothesis import given
+
+from pygexml.strategies import st_pages
+from pygexml.page import Coords, Page, TextRegion
+from pygexml.archive import (
+    Archive,
+    ArchiveError,
+    ArchiveWriter,
+    decode_page,
+    encode_page,
+)
+
+from .pages import make_page
+
+############## Tests for the page encoding ####################
+
+
+def test_encoding_example() -> None:
+    page = make_page("a.jpg", "Grüße")
+    assert decode_page(encode_page(page)) == page
+
+
+@given(st_pages())
+def test_encoding_roundtrip(page: Page) -> None:
+    try:
+        data = encode_page(page)
+    except ArchiveError:
+        return  # values beyond the archive's integer range
+    assert decode_page(data) == page
+
+
+def test_encoding_out_of_range() -> None:
+    page = make_page("a.jpg", "foo")
+    page.regions["r1"] = TextRegion(
+        id="r1", coords=Coords.parse(f"0,0 {2**40},0"), textlines={}
+    )
+    with pytest.raises(ArchiveError, match="Value out of range"):
+        encode_page(page)
+
+
+def test_decode_corrupt_data() -> None:
+    with pytest.raises(ArchiveError, match="Corrupt page data"):
+        decode_page(encode_page(make_page("a.jpg", "foo"))[:-3])
+
+
+############## Tests for archives ####################
+
+
+def test_archive_roundtrip(tmp_path: Path) -> None:
+    path = tmp_path / "corpus.pgxa"
+    pages = [make_page(f"{i}.jpg", f"line {i}") for i in range(5)]
+    with ArchiveWriter(path) as writer:
+        for page in pages:
+            writer.add(page)
+        writer.add(pages[0], key="custom")
+
+    with Archive.open(path) as archive:
+        assert len(archive) == 6
+        assert list(archive) == [f"{i}.jpg" for i in range(5)] + ["custom"]
+        assert archive["3.jpg"] == pages[3]
+        assert archive["custom"] == pages[0]
+        assert "nope" not in archive
+        with pytest.raises(KeyError):
+            archive["nope"]
+
+
+def test_archive_contains_does_not_decode(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "corpus.pgxa"
+    with ArchiveWriter(path) as writer:
+        writer.add(make_page("a.jpg", "foo"))
+    with Archive.open(path) as archive:
+        monkeypatch.setattr("pygexml.archive.decode_page", None)
+        assert "a.jpg" in archive
+        assert "b.jpg" not in archive
+
+
+def test_archive_append(tmp_path: Path) -> None:
+    path = tmp_path / "corpus.pgxa"
+    with ArchiveWriter(path) as writer:
+        writer.add(make_page("a.jpg", "foo"))
+    with ArchiveWriter(path, append=True) as writer:
+        writer.add(make_page("b.jpg", "foo"))
+    with Archive.open(path) as archive:
+        assert dict(archive) == {
+            "a.jpg": make_page("a.jpg", "foo"),
+            "b.jpg": make_page("b.jpg", "foo"),
+        }
+
+
+def test_archive_append_keeps_previous_contents(tmp_path: Path) -> None:
+    path = tmp_path / "corpus.pgxa"
+    with ArchiveWriter(path) as writer:
+        writer.add(make_page("a.jpg", "foo"))
+    before = path.read_bytes()
+    writer = ArchiveWriter(path, append=True)
+    writer.add(make_page("b.jpg", "foo"))
+    writer._file.flush()
+    # Until the new index is written, the old archive is intact
+    assert path.read_bytes().startswith(before)
+    writer.close()
+    with Archive.open(path) as archive:
+        assert list(archive) == ["a.jpg", "b.jpg"]
+
+
+def test_archive_interrupted_append(tmp_path: Path) -> None:
+    path = tmp_path / "corpus.pgxa"
+    with ArchiveWriter(path) as writer:
+        writer.add(make_page("a.jpg", "foo"))
+    writer = ArchiveWriter(path, append=True)
+    writer.add(make_page("b.jpg", "foo"))
+    writer._file.flush()
+    # Pages without an index after the last footer are ignored
+    with Archive.open(path) as archive:
+        assert dict(archive) == {"a.jpg": make_page("a.jpg", "foo")}
+    # Appending again drops them
+    with ArchiveWriter(path, append=True) as other:
+        other.add(make_page("c.jpg", "foo"))
+    writer._file.close()
+    with Archive.open(path) as archive:
+        assert dict(archive) == {
+            "a.jpg": make_page("a.jpg", "foo"),
+            "c.jpg": make_page("c.jpg", "foo"),
+        }
+
+
+def test_archive_duplicate_key(tmp_path: Path) -> None:
+    with ArchiveWriter(tmp_path / "corpus.pgxa") as writer:
+        writer.add(make_page("a.jpg", "foo"))
+        with pytest.raises(ArchiveError, match="Duplicate key: a.jpg"):
+            writer.add(make_page("a.jpg", "foo"))
+
+
+def test_archive_invalid_file(tmp_path: Path) -> None:
+    path = tmp_path / "corpus.pgxa"
+    path.write_bytes(b"")
+    with pytest.raises(ArchiveError, match="Not a pygexml archive"):
+        Archive.open(path)
+    path.write_bytes(b"<PcGts>no archive at all</PcGts>")
+    with pytest.raises(ArchiveError, match="Not a pygexml archive"):
+        Archive.open(path)
+    with pytest.raises(ArchiveError, match="Not a pygexml archive"):
+        ArchiveWriter(path, append=True)
@@ -0,0 +1,207 @@
+from pathlib import Path
+
+import pytest
+from lxml import etree
+
+from pygexml.batch import (
+    BatchError,
+    ExecutorKind,
+    _run,
+    convert_directory,
+    load,
+    load_many,
+    save,
+)
+from pygexml.page import Diagnostics, Page
+
+PAGE_XML = """<?xml version='1.0' encoding='utf-8'?>
+    <PcGts xmlns="http://schema.primaresearch.org/PAGE/gts/pagecontent/2019-07-15">
+        <Page imageFilename="{name}.jpg" imageWidth="800" imageHeight="600">
+            <TextRegion id="r1">
+                <Coords points="0,0 10,0 10,10 0,10"/>
+                <TextLine id="l1">
+                    <Coords points="1,1 9,1 9,9 1,9"/>
+                    <TextEquiv><Unicode>{name}</Unicode></TextEquiv>
+                </TextLine>
+            </TextRegion>
+        </Page>
+    </PcGts>
+"""
+
+ALTO_XML = """
+    <alto>
+        <Description>
+            <sourceImageInformation>
+                <fileName>{name}.jpg</fileName>
+            </sourceImageInformation>
+        </Description>
+        <Layout>
+            <Page>
+                <PrintSpace>
+                    <TextBlock ID="tr-1" HPOS="1" VPOS="2" WIDTH="3" HEIGHT="4">
+                        <TextLine ID="tl-1" HPOS="2" VPOS="3" WIDTH="4" HEIGHT="5">
+                            <String CONTENT="{name}"/>
+                        </TextLine>
+                    </TextBlock>
+                </PrintSpace>
+            </Page>
+        </Layout>
+    </alto>
+"""
+
+
+def write_files(directory: Path, template: str, count: int) -> list[Path]:
+    paths = []
+    for i in range(count):
+        path = directory / f"file-{i}.xml"
+        path.write_text(template.format(name=f"page-{i}"), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_load_formats(tmp_path: Path) -> None:
+    [page_path] = write_files(tmp_path, PAGE_XML, 1)
+    assert load(page_path) == Page.from_xml_file(page_path)
+    alto_path = tmp_path / "alto.xml"
+    alto_path.write_text(ALTO_XML.format(name="a"), encoding="utf-8")
+    assert load(alto_path, format="alto") == Page.from_alto_file(alto_path)
+
+
+def test_load_unknown_format(tmp_path: Path) -> None:
+    with pytest.raises(BatchError, match="Unknown format"):
+        load(tmp_path / "a.xml", format="hocr")  # type: ignore
+    with pytest.raises(BatchError, match="Unknown format"):
+        list(load_many([tmp_path / "a.xml"], format="hocr"))  # type: ignore
+
+
+def test_load_many_unknown_executor(tmp_path: Path) -> None:
+    with pytest.raises(BatchError, match="Unknown executor"):
+        list(load_many([tmp_path / "a.xml"], executor="fibers"))  # type: ignore
+
+
+def test_load_many_ordered(tmp_path: Path) -> None:
+    paths = write_files(tmp_path, PAGE_XML, 10)
+    results = list(load_many(paths, workers=2, chunksize=3))
+    assert [path for path, _ in results] == paths
+    for path, page in results:
+        assert page == Page.from_xml_file(path)
+
+
+def test_load_many_unordered(tmp_path: Path) -> None:
+    paths = write_files(tmp_path, ALTO_XML, 10)
+    results = dict(load_many(paths, format="alto", workers=2, ordered=False))
+    assert results.keys() == set(paths)
+    for path, page in results.items():
+        assert page == Page.from_alto_file(path)
+
+
+def test_load_many_threads(tmp_path: Path) -> None:
+    paths = write_files(tmp_path, PAGE_XML, 10)
+    results = list(load_many(paths, workers=4, executor="thread"))
+    assert [path for path, _ in results] == paths
+    for path, page in results:
+        assert page == Page.from_xml_file(path)
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_load_many_captures_errors(tmp_path: Path, executor: ExecutorKind) -> None:
+    [good] = write_files(tmp_path, PAGE_XML, 1)
+    broken = tmp_path / "broken.xml"
+    broken.write_text("<PcGts><Page>", encoding="utf-8")
+    invalid = tmp_path / "invalid.xml"
+    invalid.write_text("<PcGts><Page/></PcGts>", encoding="utf-8")
+    missing = tmp_path / "missing.xml"
+
+    paths = [good, broken, invalid, missing]
+    results = dict(load_many(paths, workers=2, executor=executor))
+    assert isinstance(results[good], Page)
+    if executor == "process":
+        # lxml syntax errors can't be sent back from worker processes
+        assert isinstance(results[broken], BatchError)
+        assert "XMLSyntaxError" in str(results[broken])
+    else:
+        assert isinstance(results[broken], etree.XMLSyntaxError)
+    assert "No image filename found" in str(results[invalid])
+    assert isinstance(results[missing], FileNotFoundError)
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_run_bounds_chunks_in_flight(ordered: bool) -> None:
+    submitted: list[int] = []
+
+    def record(chunk: list[int]) -> list[int]:
+        submitted.extend(chunk)
+        return chunk
+
+    results = _run(record, list(range(20)), 2, 1, ordered, "thread")
+    first = next(results)
+    assert len(submitted) <= 2 * 2 + 1
+    assert sorted([first, *results]) == list(range(20))
+
+
+INVALID_XML = PAGE_XML.replace("1,1 9,1", "-1,1 9,-1")
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_load_many_validation(tmp_path: Path, executor: ExecutorKind) -> None:
+    [good] = write_files(tmp_path, PAGE_XML, 1)
+    (tmp_path / "invalid").mkdir()
+    [invalid] = write_files(tmp_path / "invalid", INVALID_XML, 1)
+    paths = [good, invalid]
+
+    results = list(load_many(paths, executor=executor, validation="collect"))
+    assert [(path, type(page)) for path, page, _ in results] == [
+        (good, Page),
+        (invalid, Page),
+    ]
+    assert results[0][2] == Diagnostics()
+    assert results[1][2].counts == {"coords": 1}
+
+    results = list(load_many(paths, executor=executor, validation="strict"))
+    assert isinstance(results[0][1], Page)
+    assert "does not match" in str(results[1][1])
+
+
+def test_load_many_unknown_validation_mode(tmp_path: Path) -> None:
+    with pytest.raises(BatchError, match="Unknown validation mode"):
+        load_many([tmp_path / "a.xml"], validation="nope")  # type: ignore
+
+
+def test_load_many_empty() -> None:
+    assert list(load_many([])) == []
+
+
+def test_save_formats(tmp_path: Path) -> None:
+    [page_path] = write_files(tmp_path, PAGE_XML, 1)
+    page = load(page_path)
+    save(page, tmp_path / "page.xml", format="page")
+    assert load(tmp_path / "page.xml") == page
+    save(page, tmp_path / "alto.xml")
+    assert load(tmp_path / "alto.xml", format="alto") == page
+    with pytest.raises(BatchError, match="Unknown format"):
+        save(page, tmp_path / "a.xml", format="hocr")  # type: ignore
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_convert_directory(tmp_path: Path, executor: ExecutorKind) -> None:
+    source, target = tmp_path / "page", tmp_path / "alto"
+    (source / "sub").mkdir(parents=True)
+    paths = write_files(source, PAGE_XML, 3) + write_files(source / "sub", PAGE_XML, 2)
+    (source / "broken.xml").write_text("<PcGts><Page/></PcGts>", encoding="utf-8")
+    (source / "other.txt").write_text("not converted", encoding="utf-8")
+
+    results = dict(convert_directory(source, target, workers=2, executor=executor))
+    assert "No image filename found" in str(results.pop(source / "broken.xml"))
+    assert results == {path: target / path.relative_to(source) for path in paths}
+    for path in paths:
+        converted = Page.from_alto_file(target / path.relative_to(source))
+        assert converted == Page.from_xml_file(path)
+    assert not (target / "broken.xml").exists()
+    assert not (target / "other.txt").exists()
+
+
+def test_convert_directory_unknown_format(tmp_path: Path) -> None:
+    with pytest.raises(BatchError, match="Unknown format: hocr"):
+        convert_directory(tmp_path, tmp_path / "out", to="hocr")  # type: ignore
+    with pytest.raises(BatchError, match="Unknown executor"):
+        convert_directory(tmp_path, tmp_path / "out", executor="fibers")  # type: ignore
@@ -0,0 +1,294 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from pygexml.cache import CacheStats, DiskCache, PageCache, estimate_size
+from pygexml.page import Page, PageXMLError, validation
+
+PAGE_XML = """<?xml version='1.0' encoding='utf-8'?>
+    <PcGts xmlns="http://schema.primaresearch.org/PAGE/gts/pagecontent/2019-07-15">
+        <Page imageFilename="a.jpg" imageWidth="800" imageHeight="600">
+            <TextRegion id="r1">
+                <Coords points="0,0 10,0 10,10 0,10"/>
+                <TextLine id="l1">
+                    <Coords points="1,1 9,1 9,9 1,9"/>
+                    <TextEquiv><Unicode>{text}</Unicode></TextEquiv>
+                </TextLine>
+            </TextRegion>
+        </Page>
+    </PcGts>
+"""
+
+ALTO_XML = """
+    <alto>
+        <Description>
+            <sourceImageInformation><fileName>a.jpg</fileName></sourceImageInformation>
+        </Description>
+        <Layout>
+            <Page>
+                <PrintSpace>
+                    <TextBlock ID="tr-1" HPOS="1" VPOS="2" WIDTH="3" HEIGHT="4">
+                        <TextLine ID="tl-1" HPOS="2" VPOS="3" WIDTH="4" HEIGHT="5">
+                            <String CONTENT="foo"/>
+                        </TextLine>
+                    </TextBlock>
+                </PrintSpace>
+            </Page>
+        </Layout>
+    </alto>
+"""
+
+
+def write_page(path: Path, text: str = "foo") -> Path:
+    path.write_text(PAGE_XML.format(text=text), encoding="utf-8")
+    return path
+
+
+############## Tests for CacheStats ####################
+
+
+def test_cache_stats_hit_rate() -> None:
+    assert CacheStats().hit_rate == 0.0
+    assert CacheStats(hits=3, misses=1).hit_rate == 0.75
+
+
+############## Tests for DiskCache ####################
+
+
+def test_disk_cache_hit_and_miss(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path / "cache")
+    path = write_page(tmp_path / "page.xml")
+    first = Page.from_xml_file(path, cache=cache)
+    second = Page.from_xml_file(path, cache=cache)
+    assert first == second == Page.from_xml_file(path)
+    assert cache.stats == CacheStats(hits=1, misses=1)
+
+
+def test_disk_cache_skips_parsing_on_hit(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path / "cache")
+    path = write_page(tmp_path / "page.xml")
+    expected = Page.from_xml_file(path, cache=cache)
+
+    def fail() -> Page:
+        raise AssertionError("parsed again")
+
+    assert cache.load(path, "page", fail) == expected
+
+
+def test_disk_cache_alto(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path / "cache")
+    path = tmp_path / "alto.xml"
+    path.write_text(ALTO_XML, encoding="utf-8")
+    Page.from_alto_file(path, cache=cache)
+    assert Page.from_alto_file(path, cache=cache) == Page.from_alto_file(path)
+    # the same file parsed as PAGE-XML would be a different entry
+    with pytest.raises(Exception, match="No page element found"):
+        Page.from_xml_file(path, cache=cache)
+    assert cache.stats == CacheStats(hits=1, misses=2)
+
+
+def test_disk_cache_invalidated_by_modification(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path / "cache")
+    path = write_page(tmp_path / "page.xml", text="foo")
+    assert list(Page.from_xml_file(path, cache=cache).all_text()) == ["foo"]
+    write_page(path, text="foobar")
+    assert list(Page.from_xml_file(path, cache=cache).all_text()) == ["foobar"]
+    assert cache.stats.misses == 2
+
+
+def test_disk_cache_content_hash(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path / "cache", hash_content=True)
+    path = write_page(tmp_path / "page.xml", text="foo")
+    stat = path.stat()
+    Page.from_xml_file(path, cache=cache)
+    write_page(path, text="bar")  # same size and mtime, different content
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert list(Page.from_xml_file(path, cache=cache).all_text()) == ["bar"]
+    assert cache.stats.misses == 2
+
+
+def test_disk_cache_corrupt_entry(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path / "cache")
+    path = write_page(tmp_path / "page.xml")
+    Page.from_xml_file(path, cache=cache)
+    [entry] = (tmp_path / "cache").glob("*.pgx")
+    entry.write_bytes(b"garbage")
+    assert Page.from_xml_file(path, cache=cache) == Page.from_xml_file(path)
+    assert cache.stats.misses == 2
+    assert Page.from_xml_file(path, cache=cache) == Page.from_xml_file(path)
+    assert cache.stats.hits == 1
+
+
+def test_disk_cache_eviction(tmp_path: Path) -> None:
+    paths = [write_page(tmp_path / f"page-{i}.xml", text=str(i)) for i in range(4)]
+    unbounded = DiskCache(tmp_path / "sizing")
+    Page.from_xml_file(paths[0], cache=unbounded)
+    [entry] = (tmp_path / "sizing").glob("*.pgx")
+    entry_size = entry.stat().st_size
+
+    cache = DiskCache(tmp_path / "cache", max_bytes=2 * entry_size)
+    for path in paths:
+        Page.from_xml_file(path, cache=cache)
+    assert len(list((tmp_path / "cache").glob("*.pgx"))) == 2
+    assert not list((tmp_path / "cache").glob("*.tmp"))
+
+    Page.from_xml_file(paths[3], cache=cache)
+    assert cache.stats == CacheStats(hits=1, misses=4)
+    Page.from_xml_file(paths[0], cache=cache)
+    assert cache.stats == CacheStats(hits=1, misses=5)
+
+
+def test_disk_cache_eviction_is_amortized(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    paths = [write_page(tmp_path / f"page-{i}.xml", text=str(i)) for i in range(20)]
+    cache = DiskCache(tmp_path / "cache", max_bytes=10**6)
+    scans = 0
+    scan = cache._scan
+
+    def counting_scan() -> list[tuple[int, int, Path]]:
+        nonlocal scans
+        scans += 1
+        return scan()
+
+    monkeypatch.setattr(cache, "_scan", counting_scan)
+    for path in paths:
+        Page.from_xml_file(path, cache=cache)
+    assert scans == 1  # only the initial one, the budget is never exceeded
+
+    entry_size = max(size for _, size, _ in scan())
+    cache.max_bytes = 10 * entry_size
+    scans = 0
+    for path in paths:
+        path.touch()
+        Page.from_xml_file(path, cache=cache)
+    assert sum(size for _, size, _ in scan()) <= cache.max_bytes
+    # Each eviction frees 10% of the budget, enough for the next write
+    assert scans <= len(paths) // 2
+
+
+def test_disk_cache_missing_file(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path / "cache")
+    with pytest.raises(FileNotFoundError):
+        Page.from_xml_file(tmp_path / "does_not_exist.xml", cache=cache)
+
+
+def test_disk_cache_clear(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path / "cache")
+    Page.from_xml_file(write_page(tmp_path / "page.xml"), cache=cache)
+    cache.clear()
+    assert not list((tmp_path / "cache").glob("*.pgx"))
+
+
+############## Tests for PageCache ####################
+
+
+def test_estimate_size_grows_with_content(tmp_path: Path) -> None:
+    small = Page.from_xml_file(write_page(tmp_path / "small.xml", text="a"))
+    large = Page.from_xml_file(write_page(tmp_path / "large.xml", text="a" * 1000))
+    assert 0 < estimate_size(small) < estimate_size(large)
+
+
+def test_page_cache_hit_and_miss(tmp_path: Path) -> None:
+    cache = PageCache(max_bytes=10**6)
+    path = write_page(tmp_path / "page.xml")
+    first = Page.from_xml_file(path, cache=cache)
+    assert Page.from_xml_file(path, cache=cache) is first
+    assert cache.stats == CacheStats(hits=1, misses=1)
+    assert len(cache) == 1
+    assert cache.current_bytes == estimate_size(first)
+
+
+def test_page_cache_validation_modes(tmp_path: Path) -> None:
+    cache = PageCache(max_bytes=10**6)
+    path = tmp_path / "page.xml"
+    path.write_text(PAGE_XML.replace("0,0 10,0", "0,-1 10,0"), encoding="utf-8")
+    with pytest.warns(UserWarning):
+        Page.from_xml_file(path, cache=cache)
+    # strict parses are cached separately, collect mode doesn't use the cache
+    with validation("strict"), pytest.raises(PageXMLError):
+        Page.from_xml_file(path, cache=cache)
+    with validation("collect") as diagnostics:
+        Page.from_xml_file(path, cache=cache)
+    assert diagnostics.counts == {"coords": 1}
+    assert cache.stats == CacheStats(hits=0, misses=2)
+
+
+def test_page_cache_lru_eviction(tmp_path: Path) -> None:
+    paths = [write_page(tmp_path / f"page-{i}.xml", text=str(i)) for i in range(3)]
+    size = estimate_size(Page.from_xml_file(paths[0]))
+    cache = PageCache(max_bytes=2 * size)
+    Page.from_xml_file(paths[0], cache=cache)
+    Page.from_xml_file(paths[1], cache=cache)
+    Page.from_xml_file(paths[0], cache=cache)  # paths[1] is now least recent
+    Page.from_xml_file(paths[2], cache=cache)
+    assert len(cache) == 2
+    assert cache.current_bytes <= cache.max_bytes
+    Page.from_xml_file(paths[0], cache=cache)
+    assert cache.stats == CacheStats(hits=2, misses=3)
+    Page.from_xml_file(paths[1], cache=cache)
+    assert cache.stats == CacheStats(hits=2, misses=4)
+
+
+def test_page_cache_too_large_page(tmp_path: Path) -> None:
+    cache = PageCache(max_bytes=10)
+    path = write_page(tmp_path / "page.xml")
+    Page.from_xml_file(path, cache=cache)
+    assert len(cache) == 0
+    assert cache.current_bytes == 0
+
+
+def test_page_cache_reloads_modified_file(tmp_path: Path) -> None:
+    cache = PageCache(max_bytes=10**6)
+    path = write_page(tmp_path / "page.xml", text="foo")
+    Page.from_xml_file(path, cache=cache)
+    write_page(path, text="foobar")
+    assert list(Page.from_xml_file(path, cache=cache).all_text()) == ["foobar"]
+    assert len(cache) == 1
+
+
+def test_page_cache_single_flight(tmp_path: Path) -> None:
+    cache = PageCache(max_bytes=10**6)
+    path = write_page(tmp_path / "page.xml")
+    started = threading.Event()
+    release = threading.Event()
+    parses = []
+
+    def parse() -> Page:
+        parses.append(1)
+        started.set()
+        release.wait(timeout=10)
+        return Page.from_xml_file(path)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        first = executor.submit(cache.load, path, "page", parse)
+        started.wait(timeout=10)
+        others = [executor.submit(cache.load, path, "page", parse) for _ in range(3)]
+        release.set()
+        results = [first.result()] + [future.result() for future in others]
+
+    assert len(parses) == 1
+    assert all(result is results[0] for result in results)
+    assert cache.stats == CacheStats(hits=3, misses=1)
+
+
+def test_page_cache_failed_parse(tmp_path: Path) -> None:
+    cache = PageCache(max_bytes=10**6)
+    path = tmp_path / "broken.xml"
+    path.write_text("<PcGts><Page/></PcGts>", encoding="utf-8")
+    for _ in range(2):
+        with pytest.raises(Exception, match="No image filename found"):
+            Page.from_xml_file(path, cache=cache)
+    assert len(cache) == 0
+    assert cache.stats.misses == 2
+
+
+def test_page_cache_clear(tmp_path: Path) -> None:
+    cache = PageCache(max_bytes=10**6)
+    Page.from_xml_file(write_page(tmp_path / "page.xml"), cache=cache)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.current_bytes == 0
@@ -1,3 +1,6 @@
+import pickle
+from dataclasses import FrozenInstanceError
+
 import pytest
 from hypothesis import given, strategies as st
 
@@ -20,6 +23,23 @@ def test_point_stringification(x: int, y: int) -> None:
     assert str(point) == f"{x},{y}"
 
 
+def test_point_is_mutable() -> None:
+    point = Point(17, 42)
+    point.x = 23
+    assert point == Point(23, 42)
+
+
+def test_frozen_point() -> None:
+    point = FrozenPoint(17, 42)
+    with pytest.raises(FrozenInstanceError):
+        point.x = 23
+    assert isinstance(point, Point)
+    assert point == Point(17, 42) and Point(17, 42) == point
+    assert {point: "foo"}[FrozenPoint(17, 42)] == "foo"
+    assert pickle.loads(pickle.dumps(point)) == point
+    assert repr(point) == "FrozenPoint(x=17, y=42)"
+
+
 ############## Tests for Box ####################
 
 
@@ -48,6 +68,19 @@ def test_box_construction_exception(pp: tuple[Point, Point]) -> None:
         Box(top_left=br, bottom_right=tl)  # flipped points!
 
 
+@given(st_box_points())
+def test_frozen_box(pp: tuple[Point, Point]) -> None:
+    box = FrozenBox(*pp)
+    assert box == Box(*pp)
+    assert isinstance(box.top_left, FrozenPoint)
+    with pytest.raises(FrozenInstanceError):
+        box.top_left = pp[0]
+    assert {box: "foo"}[FrozenBox(*pp)] == "foo"
+    assert pickle.loads(pickle.dumps(box)) == box
+    with pytest.raises(GeometryError, match="top left is not top left"):
+        FrozenBox(Point(1, 1), Point(0, 0))
+
+
 def test_box_construction_width_height_example() -> None:
     tl = Point(17, 17)
     box = Box.from_top_left_width_height(top_left=tl, width=25, height=25)
@@ -89,6 +122,27 @@ def test_box_containment(point: Point, box: Box) -> None:
     )
 
 
+def test_box_intersects_example() -> None:
+    box = Box(Point(17, 17), Point(42, 42))
+    assert box.intersects(Box(Point(0, 0), Point(17, 17)))
+    assert box.intersects(Box(Point(20, 0), Point(30, 100)))
+    assert not box.intersects(Box(Point(43, 17), Point(50, 42)))
+
+
+@given(st_boxes, st_boxes)
+def test_box_intersects(b1: Box, b2: Box) -> None:
+    assert b1.intersects(b2) == b2.intersects(b1)
+    assert b1.intersects(b1)
+    if any(b1.contains(corner) for corner in b2.corners()):
+        assert b1.intersects(b2)
+
+
+@given(st_boxes, st_boxes)
+def test_box_contains_box(b1: Box, b2: Box) -> None:
+    assert b1.contains_box(b1)
+    assert b1.contains_box(b2) == all(b1.contains(c) for c in b2.corners())
+
+
 ############## Tests for Polygon ####################
 
 
@@ -147,3 +201,138 @@ def test_polygon_bounding_box_roundtrip(polygon: Polygon) -> None:
     bounding_box = polygon.bounding_box()
     box_polygon = Polygon.from_box(bounding_box)
     assert box_polygon.bounding_box() == bounding_box
+
+
+def test_polygon_from_xy_example() -> None:
+    polygon = Polygon.from_xy([17, 42, 1, 2])
+    assert polygon.points == [Point(17, 42), Point(1, 2)]
+    assert list(polygon.xy) == [17, 42, 1, 2]
+    assert len(polygon) == 2
+    assert polygon == Polygon(points=[Point(17, 42), Point(1, 2)])
+
+
+def test_polygon_from_xy_invalid() -> None:
+    with pytest.raises(GeometryError, match="points must not be empty"):
+        Polygon.from_xy([])
+    with pytest.raises(GeometryError, match="odd number of coordinates"):
+        Polygon.from_xy([1, 2, 3])
+
+
+def test_polygon_huge_coordinates() -> None:
+    points = [Point(2**40, 1), Point(1, -(2**40))]
+    polygon = Polygon(points=points)
+    assert polygon.points == points
+    assert polygon == Polygon.from_xy([2**40, 1, 1, -(2**40)])
+    assert polygon.bounding_box() == Box(Point(1, -(2**40)), Point(2**40, 1))
+
+
+@given(st_polygons)
+def test_polygon_iteration(polygon: Polygon) -> None:
+    assert list(polygon) == polygon.points
+    assert len(polygon) == len(polygon.points)
+    assert Polygon.from_xy(polygon.xy) == polygon
+
+
+@given(st_polygons, st_polygons)
+def test_polygon_equality(p1: Polygon, p2: Polygon) -> None:
+    assert (p1 == p2) == (p1.points == p2.points)
+
+
+def test_polygon_repr() -> None:
+    polygon = Polygon(points=[Point(1, 2)])
+    assert repr(polygon) == "Polygon(points=[Point(x=1, y=2)])"
+
+
+@given(st_polygons)
+def test_polygon_bounding_box_is_frozen(polygon: Polygon) -> None:
+    assert isinstance(polygon.bounding_box(), FrozenBox)
+    assert polygon.bounding_box() is polygon.bounding_box()
+
+
+@given(st_polygons)
+def test_polygon_stringification(polygon: Polygon) -> None:
+    assert str(polygon) == " ".join(map(str, polygon.points))
+    assert str(polygon) is str(polygon)
+
+
+@given(st_polygons)
+def test_polygon_hash(polygon: Polygon) -> None:
+    assert hash(polygon) == hash(Polygon.from_xy(polygon.xy))
+    assert {polygon: "foo"}[Polygon(points=polygon.points)] == "foo"
+
+
+def test_polygon_contains_example() -> None:
+    triangle = Polygon.from_xy([0, 0, 10, 0, 0, 10])
+    assert triangle.contains(Point(2, 3))
+    assert triangle.contains(Point(5, 5))  # on the boundary
+    assert triangle.contains(Point(0, 0))
+    assert not triangle.contains(Point(6, 6))
+    assert not triangle.contains(Point(11, 0))
+
+
+def test_polygon_contains_concave() -> None:
+    u_shape = Polygon.from_xy([0, 0, 3, 0, 3, 10, 7, 10, 7, 0, 10, 0, 10, 12, 0, 12])
+    assert u_shape.contains(Point(1, 5))
+    assert not u_shape.contains(Point(5, 5))
+    assert u_shape.contains(Point(5, 11))
+
+
+@given(st_polygons, st_points)
+def test_polygon_contains(polygon: Polygon, point: Point) -> None:
+    assert all(polygon.contains(p) for p in polygon)
+    if polygon.contains(point):
+        assert polygon.bounding_box().contains(point)
+
+
+@given(st_boxes)
+def test_polygon_from_box_contains(box: Box) -> None:
+    polygon = Polygon.from_box(box)
+    assert all(polygon.contains(corner) for corner in box.corners())
+    center = Point(
+        (box.top_left.x + box.bottom_right.x) // 2,
+        (box.top_left.y + box.bottom_right.y) // 2,
+    )
+    assert polygon.contains(center)
+
+
+def test_polygon_intersects_box_example() -> None:
+    triangle = Polygon.from_xy([0, 0, 10, 0, 0, 10])
+    assert triangle.intersects_box(Box(Point(4, 4), Point(9, 9)))
+    assert not triangle.intersects_box(Box(Point(7, 7), Point(9, 9)))
+    assert triangle.intersects_box(Box(Point(1, 1), Point(2, 2)))  # inside
+    assert triangle.intersects_box(Box(Point(0, 0), Point(20, 20)))  # around
+    line = Polygon.from_xy([0, 5, 10, 5])
+    assert line.intersects_box(Box(Point(4, 0), Point(6, 10)))  # crossing
+
+
+@given(st_polygons, st_boxes)
+def test_polygon_intersects_box(polygon: Polygon, box: Box) -> None:
+    intersects = polygon.intersects_box(box)
+    if any(box.contains(point) for point in polygon):
+        assert intersects
+    if not polygon.bounding_box().intersects(box):
+        assert not intersects
+
+
+@given(st_polygons)
+def test_polygon_bounding_box_is_cached(polygon: Polygon) -> None:
+    assert polygon.bounding_box() is polygon.bounding_box()
+    assert Polygon.from_xy(polygon.xy).bounding_box() == polygon.bounding_box()
+
+
+def test_polygon_simplify_example() -> None:
+    polygon = Polygon.from_xy([0, 0, 5, 1, 10, 0, 10, 10, 5, 9, 0, 10])
+    assert polygon.simplify(0) is polygon
+    assert polygon.simplify(0.5) is polygon
+    assert polygon.simplify(2) == Polygon.from_xy([0, 0, 10, 0, 10, 10, 0, 10])
+    assert polygon.simplify(100) == Polygon.from_xy([0, 0, 0, 10])
+
+
+@given(st_polygons, st.floats(min_value=0, max_value=1000))
+def test_polygon_simplify(polygon: Polygon, tolerance: float) -> None:
+    simplified = polygon.simplify(tolerance)
+    assert len(simplified) >= min(2, len(polygon))
+    assert simplified.points[0] == polygon.points[0]
+    assert simplified.points[-1] == polygon.points[-1]
+    assert all(point in polygon.points for point in simplified)
+    assert polygon.bounding_box().contains_box(simplified.bounding_box())
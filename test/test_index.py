@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import pytest
+from hypothesis import given, strategies as st
+
+from pygexml.strategies import st_pages
+from pygexml.page import Coords, Page
+from pygexml.index import Hit, WordIndex, WordIndexError, normalize
+
+from .pages import make_page
+
+
+def test_normalize() -> None:
+    assert normalize("Straße,") == "strasse"
+    assert normalize("«Foo»") == "foo"
+    assert normalize("don't!") == "don't"
+    assert normalize("...") == ""
+
+
+def test_index_search_example() -> None:
+    index = WordIndex()
+    index.add(make_page("a.jpg", "The quick fox", "jumps over the dog."))
+    index.add(make_page("b.jpg", "Another dog"))
+    assert len(index) == 2
+    assert index.line_count == 3
+    assert "a.jpg" in index
+    assert index.search("the") == [
+        Hit("a.jpg", "r1", "l0", 0, Coords.parse("0,0 100,5")),
+        Hit("a.jpg", "r1", "l1", 2, Coords.parse("0,10 100,15")),
+    ]
+    assert [(hit.page, hit.line_id, hit.offset) for hit in index.search("DOG")] == [
+        ("a.jpg", "l1", 3),
+        ("b.jpg", "l0", 1),
+    ]
+    assert index.count("dog") == 2
+    assert index.search("cat") == []
+
+
+def test_index_duplicate_key() -> None:
+    index = WordIndex()
+    index.add(make_page("a.jpg", "foo"))
+    with pytest.raises(WordIndexError, match="Duplicate key: a.jpg"):
+        index.add(make_page("a.jpg", "bar"))
+    index.add(make_page("a.jpg", "bar"), key="other")
+    assert [hit.page for hit in index.search("bar")] == ["other"]
+
+
+def test_index_out_of_range() -> None:
+    index = WordIndex()
+    page = make_page("a.jpg", "foo")
+    page.regions["r1"].textlines["l0"].coords = Coords.parse(f"0,0 {2**40},0")
+    with pytest.raises(WordIndexError, match="Value out of range"):
+        index.add(page)
+    assert len(index) == 0
+    assert index.search("foo") == []
+
+
+def test_index_save_load(tmp_path: Path) -> None:
+    index = WordIndex()
+    index.add_many(
+        make_page(f"{n}.jpg", f"word{n} common " * 200, "common") for n in range(50)
+    )
+    file = tmp_path / "words.pgxi"
+    index.save(file)
+    loaded = WordIndex.load(file)
+    assert loaded.pages == index.pages
+    assert sorted(loaded.tokens()) == sorted(index.tokens())
+    assert loaded.search("common") == index.search("common")
+    assert loaded.search("word7") == index.search("word7")
+    # Delta-encoded postings need at most three bytes each here
+    postings = sum(index.count(token) for token in index.tokens())
+    assert file.stat().st_size < 3 * postings + 10_000
+
+
+def test_index_load_and_extend(tmp_path: Path) -> None:
+    index = WordIndex()
+    index.add(make_page("a.jpg", "foo bar"))
+    index.save(tmp_path / "words.pgxi")
+    loaded = WordIndex.load(tmp_path / "words.pgxi")
+    loaded.add(make_page("b.jpg", "bar"))
+    assert [hit.page for hit in loaded.search("bar")] == ["a.jpg", "b.jpg"]
+
+
+def test_index_load_invalid(tmp_path: Path) -> None:
+    file = tmp_path / "words.pgxi"
+    file.write_bytes(b"")
+    with pytest.raises(WordIndexError, match="Not a pygexml word index"):
+        WordIndex.load(file)
+    file.write_bytes(b"PGXA\x01\x00")
+    with pytest.raises(WordIndexError, match="Not a pygexml word index"):
+        WordIndex.load(file)
+
+    index = WordIndex()
+    index.add(make_page("a.jpg", "foo bar"))
+    index.save(file)
+    data = file.read_bytes()
+    for end in range(6, len(data)):
+        file.write_bytes(data[:end])
+        with pytest.raises(WordIndexError, match="Corrupt word index"):
+            WordIndex.load(file)
+
+
+@given(st.lists(st_pages(), max_size=5), st.text(max_size=5))
+def test_index_arbitrary_pages(pages: list[Page], word: str) -> None:
+    index = WordIndex()
+    expected = []
+    for number, page in enumerate(pages):
+        try:
+            index.add(page, key=str(number))
+        except WordIndexError:
+            continue  # coordinates beyond the index's integer range
+        for region in page.regions.values():
+            for line in region.textlines.values():
+                for offset, w in enumerate(line.words()):
+                    if normalize(w) and normalize(w) == normalize(word):
+                        expected.append((str(number), region.id, line.id, offset))
+    hits = index.search(word)
+    assert [(h.page, h.region_id, h.line_id, h.offset) for h in hits] == expected
@@ -1,9 +1,61 @@
 import pkgutil
+import subprocess
+import sys
+
+import pytest
+
 import pygexml
 
+# Upper bound for importing everything parsing needs, including lxml, to
+# catch accidental heavy imports. Importing takes about 0.1 to 0.2 seconds,
+# the rest is headroom for slow CI machines.
+IMPORT_BUDGET_SECONDS = 0.5
+
 
 def test_all_submodules_in_init() -> None:
     discovered = {m.name for m in pkgutil.iter_modules(pygexml.__path__)}
-    exported = {name for name in vars(pygexml) if not name.startswith("_")}
+    exported = set(pygexml.__all__)
     missing = discovered - exported
     assert not missing, f"Missing in __init__.py: {missing}"
+
+
+def test_all_exports_accessible() -> None:
+    for name in pygexml.__all__:
+        assert getattr(pygexml, name) is not None
+        assert name in dir(pygexml)
+
+
+def test_unknown_attribute() -> None:
+    with pytest.raises(AttributeError, match="no attribute 'nope'"):
+        getattr(pygexml, "nope")
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True
+    )
+
+
+def test_import_page_is_lazy() -> None:
+    statement = "import sys; from pygexml import Page; print(*sys.modules)"
+    modules = set(run_python("-c", statement).stdout.split())
+    assert "pygexml.page" in modules
+    heavy_modules = [
+        "hypothesis",
+        "pygexml.strategies",
+        "pygexml.svg",
+        "dataclasses_json",
+        "marshmallow",
+    ]
+    for heavy in heavy_modules:
+        assert heavy not in modules
+
+
+def test_import_page_time_budget() -> None:
+    result = run_python("-X", "importtime", "-c", "import pygexml.page")
+    total_us = 0
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if line.startswith("import time:") and "self [us]" not in line:
+            total_us += int(line.removeprefix("import time:").split("|")[0])
+    assert total_us / 1_000_000 < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,119 @@
+import json
+import threading
+import warnings
+from pathlib import Path
+
+from pygexml.instrument import Recorder, current, instrument, timed
+from pygexml.page import Page
+from pygexml.svg import page_to_svg_string
+from pygexml.synth import Layout, generate_page
+
+LAYOUT = Layout(columns=1, regions_per_column=2, lines_per_region=3, vertices=6)
+
+
+def test_instrument_is_scoped() -> None:
+    assert current() is None
+    with instrument() as recorder:
+        assert current() is recorder
+        with instrument() as inner:
+            assert current() is inner
+        assert current() is recorder
+    assert current() is None
+
+
+def test_instrument_parse_phases(tmp_path: Path) -> None:
+    file = tmp_path / "page.xml"
+    generate_page(LAYOUT).to_xml_file(file)
+    with instrument() as recorder:
+        page = Page.from_xml_file(file)
+    assert page == Page.from_xml_file(file)
+
+    result = recorder.to_dict()
+    phases = result["phases"]
+    # lxml reads the file in chunks, at least once more to find its end
+    assert phases["read"]["count"] >= 2
+    assert phases["read"]["seconds"] <= phases["xml_parse"]["seconds"]
+    assert phases["xml_parse"]["self_seconds"] < phases["xml_parse"]["seconds"]
+    assert {name: phases[name]["count"] for name in phases if name != "read"} == {
+        "xml_parse": 1,
+        "Page.from_xml": 1,
+        "TextRegion.from_xml": 2,
+        "TextLine.from_xml": 6,
+        "Coords.parse": 8,
+    }
+    for stats in phases.values():
+        assert 0 <= stats["self_seconds"] <= stats["seconds"]
+    assert result["counters"]["points"] == 2 * 4 + 6 * 6
+    # PcGts, Metadata with 3 children, Page, regions and lines with children
+    assert result["counters"]["elements"] == 1 + 4 + 1 + 2 * 2 + 6 * 4
+
+
+def test_instrument_alto_and_svg() -> None:
+    page = generate_page(LAYOUT)
+    with instrument() as recorder:
+        Page.from_alto_bytes(page.to_alto_bytes())
+        page_to_svg_string(page)
+    phases = recorder.to_dict()["phases"]
+    assert phases["Page.from_alto"]["count"] == 1
+    assert phases["TextLine.from_alto"]["count"] == 6
+    assert phases["svg.page_to_svg_string"]["count"] == 1
+    assert phases["svg.page_to_svg"]["count"] == 1
+    assert "read" not in phases
+
+
+def test_instrument_counts_warnings() -> None:
+    xml = generate_page(LAYOUT).to_xml_bytes().replace(b'points="', b'points="-1,-1 ')
+    with instrument() as recorder, warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        Page.from_xml_bytes(xml)
+    assert recorder.counters["warnings"] == 8
+
+
+def test_chrome_trace(tmp_path: Path) -> None:
+    with instrument() as recorder:
+        Page.from_xml_bytes(generate_page(LAYOUT).to_xml_bytes())
+    recorder.write_chrome_trace(tmp_path / "trace.json")
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert len(events) == 1 + 1 + 2 + 6 + 8
+    page = next(event for event in events if event["name"] == "Page.from_xml")
+    for event in events:
+        assert event["ts"] >= 0 and event["dur"] >= 0
+        if event["name"] != "xml_parse":
+            assert page["ts"] <= event["ts"]
+            assert event["ts"] + event["dur"] <= page["ts"] + page["dur"]
+    counters = [event for event in trace["traceEvents"] if event["ph"] == "C"]
+    assert {event["name"] for event in counters} == {"elements", "points"}
+
+
+def test_recorder_without_trace() -> None:
+    with instrument(trace=False) as recorder:
+        Page.from_xml_bytes(generate_page(LAYOUT).to_xml_bytes())
+    assert recorder.to_dict()["phases"]["TextLine.from_xml"]["count"] == 6
+    assert recorder.to_chrome_trace()["traceEvents"][0]["ph"] == "C"
+
+
+def test_recorder_shared_between_threads() -> None:
+    recorder = Recorder()
+
+    @timed("work")
+    def work() -> None:
+        with recorder.phase("inner"):
+            recorder.count("calls")
+
+    def run() -> None:
+        with instrument(recorder):
+            for _ in range(100):
+                work()
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    result = recorder.to_dict()
+    assert result["phases"]["work"]["count"] == 400
+    assert result["phases"]["inner"]["count"] == 400
+    assert result["counters"] == {"calls": 400}
+    work()  # not recorded outside of instrument
+    assert recorder.to_dict()["phases"]["work"]["count"] == 400
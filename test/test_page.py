@@ -1,3 +1,7 @@
+import dataclasses
+import pickle
+import warnings
+from dataclasses import FrozenInstanceError
 from pathlib import Path
 
 import pytest
@@ -5,11 +9,28 @@ from hypothesis import given, assume
 import hypothesis.strategies as st
 
 from lxml import etree
+from lxml.etree import QName
 
 from pygexml.strategies import *
 from pygexml.geometry import Point, Box, Polygon
 from pygexml.image import Image
-from pygexml.page import Coords, ID, TextLine, TextRegion, Page
+from pygexml.page import (
+    Coords,
+    Diagnostics,
+    FrozenCoords,
+    ID,
+    TextLine,
+    TextRegion,
+    Page,
+    PAGE_NAMESPACE,
+    PageXMLError,
+    iter_regions,
+    iter_textlines,
+    read_image,
+    write_xml,
+    validation,
+    ALTO_NAMESPACE,
+)
 
 ############## Tests for Coords ####################
 
@@ -52,6 +73,93 @@ def test_coords_allow_for_simple_negative_coordinates() -> None:
         assert coords.polygon.points == [Point(1, -2), Point(-3, 4)]
 
 
+def test_coords_parse_strict_does_not_warn() -> None:
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        coords = Coords.parse("0,2 17,42 3,4")
+    assert coords.polygon.points == [Point(0, 2), Point(17, 42), Point(3, 4)]
+
+
+@given(
+    st.lists(st.tuples(st.integers(), st.integers()), min_size=2, max_size=10).map(
+        lambda pairs: " ".join(f"{x},{y}" for x, y in pairs)
+    )
+)
+def test_coords_parse_warns_iff_not_strict(points_str: str) -> None:
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        coords = Coords.parse(points_str)
+    assert bool(caught) == (Coords.STRICT_PATTERN.match(points_str) is None)
+    assert str(coords) == points_str
+
+
+def test_validation_strict() -> None:
+    with validation("strict"):
+        with pytest.raises(PageXMLError, match="PAGE XMl spec: 1,-2 -3,4"):
+            Coords.parse("1,-2 -3,4")
+        assert Coords.parse("1,2 3,4") == Coords.parse("1,2 3,4")
+    with pytest.warns(UserWarning):
+        assert Coords.parse("1,-2 -3,4").polygon.points == [
+            Point(1, -2),
+            Point(-3, 4),
+        ]
+
+
+def test_validation_loose_modes() -> None:
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        with validation("loose-silent") as diagnostics:
+            coords = Coords.parse("1,-2 -3,4")
+        assert coords.polygon.points == [Point(1, -2), Point(-3, 4)]
+        assert not diagnostics
+    with validation("loose-warn"), pytest.warns(UserWarning, match="1,-2 -3,4"):
+        Coords.parse("1,-2 -3,4")
+
+
+def test_validation_collect() -> None:
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        with validation("collect", max_samples=2) as diagnostics:
+            for x in range(5):
+                Coords.parse(f"-{x},0 1,1")
+            Coords.parse("1,2 3,4")
+    assert diagnostics.total == 5
+    assert diagnostics.counts == {"coords": 5}
+    assert diagnostics.samples == {"coords": ["-0,0 1,1", "-1,0 1,1"]}
+    assert diagnostics.to_dict() == {
+        "coords": {"count": 5, "samples": ["-0,0 1,1", "-1,0 1,1"]}
+    }
+    with validation("collect") as other:
+        pass
+    assert other == Diagnostics() and not other
+
+
+def test_validation_collect_per_file(tmp_path: Path) -> None:
+    xml = """
+        <PcGts><Page imageFilename="a.jpg">
+            <TextRegion id="r1">
+                <Coords points="0,-1 10,0 10,10 0,10"/>
+                <TextLine id="l1">
+                    <Coords points="-1,1 9,1 9,9 1,9"/>
+                    <TextEquiv><Unicode>foo</Unicode></TextEquiv>
+                </TextLine>
+            </TextRegion>
+        </Page></PcGts>
+    """
+    (tmp_path / "page.xml").write_text(xml, encoding="utf-8")
+    with validation("collect") as diagnostics:
+        page = Page.from_xml_file(tmp_path / "page.xml")
+    assert diagnostics.counts == {"coords": 2}
+    with validation("loose-silent"):
+        assert page == Page.from_xml_file(tmp_path / "page.xml")
+
+
+def test_validation_invalid_mode() -> None:
+    with pytest.raises(PageXMLError, match="Unknown validation mode: nope"):
+        with validation("nope"):  # type: ignore[arg-type]
+            pass
+
+
 @given(st_coords)
 def test_coords_parse_arbitrary(coords: Coords) -> None:
     assert Coords.parse(str(coords)) == coords
@@ -80,6 +188,49 @@ def test_coords_stringify_arbitrary(coords_str: str) -> None:
     assert str(coords_object) == coords_str
 
 
+@given(st_coords)
+def test_coords_stringification_is_cached(coords: Coords) -> None:
+    assert str(coords) is str(coords)
+    assert str(coords) == str(Coords(polygon=coords.polygon))
+    assert coords == Coords.parse(str(coords))
+
+
+def test_coords_stringification_follows_changes() -> None:
+    coords = Coords.parse("1,2 3,4")
+    assert str(coords) == "1,2 3,4"
+    coords.polygon = Polygon.from_xy([5, 6, 7, 8])
+    assert str(coords) == "5,6 7,8"
+
+
+@given(st_coords)
+def test_frozen_coords(coords: Coords) -> None:
+    frozen = FrozenCoords.parse(str(coords))
+    assert isinstance(frozen, FrozenCoords)
+    assert frozen == coords and coords == frozen
+    with pytest.raises(FrozenInstanceError):
+        frozen.polygon = coords.polygon
+    assert {frozen: "foo"}[FrozenCoords(polygon=coords.polygon)] == "foo"
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    assert FrozenCoords.from_dict(coords.to_dict()) == frozen
+
+
+def test_model_has_no_instance_dict() -> None:
+    coords = Coords.parse("1,2 3,4")
+    line = TextLine(id="l1", coords=coords, text="foo")
+    region = TextRegion(id="r1", coords=coords, textlines={"l1": line})
+    image = Image(filename="a.jpg", width=None, height=None)
+    page = Page(image=image, regions={"r1": region})
+    for value in (coords, line, region, image, page, coords.polygon):
+        assert not hasattr(value, "__dict__"), type(value).__name__
+
+
+def test_coords_serialization_format() -> None:
+    coords = Coords.parse("1,2 17,42")
+    expected = {"polygon": {"points": [{"x": 1, "y": 2}, {"x": 17, "y": 42}]}}
+    assert coords.to_dict() == expected
+    assert Coords.from_dict(expected) == coords
+
+
 ############## Tests for TextLines ####################
 
 
@@ -546,6 +697,45 @@ def test_from_missing_xml_file(tmp_path: Path) -> None:
         Page.from_xml_file(missing_file)
 
 
+def test_from_xml_bytes_and_fileobj(tmp_path: Path) -> None:
+    content = STREAMING_XML.encode("utf-8")
+    xml_filepath = tmp_path / "test.xml"
+    xml_filepath.write_bytes(content)
+    expected = Page.from_xml_string(STREAMING_XML)
+    assert Page.from_xml_bytes(content) == expected
+    with xml_filepath.open("rb") as fileobj:
+        assert Page.from_xml_fileobj(fileobj) == expected
+
+
+def test_from_xml_file_honors_encoding_declaration(tmp_path: Path) -> None:
+    content = """<?xml version='1.0' encoding='iso-8859-1'?>
+        <PcGts>
+            <Page imageFilename="ä.jpg">
+                <TextRegion id="r">
+                    <Coords points="1,2 3,4"/>
+                    <TextLine id="l">
+                        <Coords points="1,2 3,4"/>
+                        <TextEquiv><Unicode>Grüße</Unicode></TextEquiv>
+                    </TextLine>
+                </TextRegion>
+            </Page>
+        </PcGts>
+    """
+    xml_filepath = tmp_path / "latin1.xml"
+    xml_filepath.write_bytes(content.encode("iso-8859-1"))
+    page = Page.from_xml_file(xml_filepath)
+    assert page.image.filename == "ä.jpg"
+    assert list(page.all_text()) == ["Grüße"]
+
+
+def test_from_xml_file_encoding_override(tmp_path: Path) -> None:
+    content = """<PcGts><Page imageFilename="ä.jpg"></Page></PcGts>"""
+    xml_filepath = tmp_path / "latin1.xml"
+    xml_filepath.write_bytes(content.encode("iso-8859-1"))
+    page = Page.from_xml_file(xml_filepath, encoding="iso-8859-1")
+    assert page.image.filename == "ä.jpg"
+
+
 def test_page_from_alto_example() -> None:
     pa = Page.from_alto(etree.fromstring("""
         <alto>
@@ -784,6 +974,36 @@ def test_page_alto_from_file_example(tmp_path: Path) -> None:
     assert result == Page.from_alto_string(alto_string)
 
 
+def test_page_alto_from_bytes_and_fileobj(tmp_path: Path) -> None:
+    alto_bytes = b"""
+        <alto xmlns="http://www.loc.gov/standards/alto/ns-v4#">
+            <Description>
+                <sourceImageInformation>
+                    <fileName>a.jpg</fileName>
+                </sourceImageInformation>
+            </Description>
+            <Layout>
+                <Page>
+                    <PrintSpace>
+                        <TextBlock ID="tr-1" HPOS="1" VPOS="2" WIDTH="3" HEIGHT="4">
+                            <TextLine ID="tl-1" HPOS="2" VPOS="3" WIDTH="4" HEIGHT="5">
+                                <String CONTENT="foo"/>
+                            </TextLine>
+                        </TextBlock>
+                    </PrintSpace>
+                </Page>
+            </Layout>
+        </alto>
+    """
+    expected = Page.from_alto_string(alto_bytes.decode("utf-8"))
+    assert Page.from_alto_bytes(alto_bytes) == expected
+    alto_filepath = tmp_path / "alto.xml"
+    alto_filepath.write_bytes(alto_bytes)
+    with alto_filepath.open("rb") as fileobj:
+        assert Page.from_alto_fileobj(fileobj) == expected
+    assert Page.from_alto_file(alto_filepath) == expected
+
+
 def test_page_alto_from_missing_file(tmp_path: Path) -> None:
     missing_file = tmp_path / "does_not_exist.xml"
     assert not missing_file.exists()
@@ -804,6 +1024,68 @@ def test_page_region_lookup_not_found(id: str, page: Page) -> None:
     assert page.lookup_region(id) is None
 
 
+def test_page_textline_lookup() -> None:
+    page = spatial_example_page()
+    l1, l3 = page.regions["r1"].textlines["l1"], page.regions["r2"].textlines["l3"]
+    assert page.lookup_textline("l1") is l1
+    assert page.lookup_textline("l3") is l3
+    assert page.lookup_textline("nope") is None
+    assert page.lookup_textlines(["l3", "nope", "l1"]) == [l3, None, l1]
+
+
+def test_page_textline_lookup_follows_changes() -> None:
+    page = spatial_example_page()
+    assert page.lookup_textline("l4") is None
+    line = TextLine(id="l4", coords=Coords.parse("1,2 3,4"), text="x")
+    page.regions["r2"].textlines["l4"] = line
+    assert page.lookup_textline("l4") is line
+    replacement = TextLine(id="l4", coords=Coords.parse("1,2 3,4"), text="y")
+    page.regions["r2"].textlines["l4"] = replacement
+    assert page.lookup_textline("l4") is replacement
+    del page.regions["r2"]
+    assert page.lookup_textline("l4") is None
+    assert page.lookup_textlines(["l3", "l1"]) == [None, page.lookup_textline("l1")]
+
+
+def test_page_textline_lookup_after_remove_and_add() -> None:
+    page = spatial_example_page()
+    assert page.lookup_textline("l1") is not None
+    # The number of lines and the last line of the region stay the same
+    textlines = page.regions["r1"].textlines
+    l2 = textlines.pop("l2")
+    del textlines["l1"]
+    line = TextLine(id="new", coords=Coords.parse("1,2 3,4"), text="x")
+    textlines["new"] = line
+    textlines["l2"] = l2
+    assert page.lookup_textline("new") is line
+    assert page.lookup_textline("l1") is None
+    assert page.lookup_textline("l2") is l2
+
+
+def test_page_textline_lookup_miss_keeps_index() -> None:
+    page = spatial_example_page()
+    assert page.lookup_textline("l1") is not None
+    index = page._index
+    assert index is not None
+    table = index.textlines
+    assert page.lookup_textlines(["nope", "other"]) == [None, None]
+    assert page._index is index and index.textlines is table
+
+
+@given(st_pages(), st.text())
+def test_page_textline_lookup_arbitrary(page: Page, id: str) -> None:
+    lines = [r.lookup_textline(id) for r in page.regions.values()]
+    expected = next((line for line in lines if line is not None), None)
+    assert page.lookup_textline(id) is expected
+    for region in page.regions.values():
+        for line_id in region.textlines:
+            assert page.lookup_textline(line_id) is not None
+            assert page.lookup_textlines([line_id, id]) == [
+                page.lookup_textline(line_id),
+                expected,
+            ]
+
+
 def test_page_all_text_and_words() -> None:
     pa = Page(
         image=Image(filename="a", width=None, height=None),
@@ -842,6 +1124,124 @@ def test_page_all_arbitrary_text_and_words(page: Page) -> None:
     ]
 
 
+def spatial_example_page() -> Page:
+    def line(id: str, points: str) -> TextLine:
+        return TextLine(id=id, coords=Coords.parse(points), text=id)
+
+    return Page(
+        image=Image(filename="a.jpg", width=200, height=200),
+        regions={
+            "r1": TextRegion(
+                id="r1",
+                coords=Coords.parse("0,0 100,0 100,100 0,100"),
+                textlines={
+                    "l1": line("l1", "10,10 90,10 90,20 10,20"),
+                    "l2": line("l2", "10,30 90,30 10,60"),  # triangle
+                },
+            ),
+            "r2": TextRegion(
+                id="r2",
+                coords=Coords.parse("100,100 200,100 200,200 100,200"),
+                textlines={"l3": line("l3", "110,110 190,110 190,120 110,120")},
+            ),
+        },
+    )
+
+
+def test_page_lines_at() -> None:
+    page = spatial_example_page()
+    assert [line.id for line in page.lines_at(Point(50, 15))] == ["l1"]
+    assert [line.id for line in page.lines_at(Point(20, 35))] == ["l2"]
+    assert page.lines_at(Point(80, 55)) == []  # in bounding box of l2 only
+    assert page.lines_at(Point(150, 50)) == []
+
+
+def test_page_lines_in_and_intersecting() -> None:
+    page = spatial_example_page()
+    box = Box(Point(0, 0), Point(95, 25))
+    assert [line.id for line in page.lines_in(box)] == ["l1"]
+    assert [line.id for line in page.lines_intersecting(box)] == ["l1"]
+    box = Box(Point(50, 15), Point(150, 115))
+    assert page.lines_in(box) == []
+    assert [line.id for line in page.lines_intersecting(box)] == ["l1", "l2", "l3"]
+    box = Box(Point(70, 50), Point(90, 60))  # corner of l2's bounding box
+    assert page.lines_intersecting(box) == []
+
+
+def test_page_regions_intersecting() -> None:
+    page = spatial_example_page()
+    regions = page.regions_intersecting(Box(Point(90, 90), Point(110, 110)))
+    assert [region.id for region in regions] == ["r1", "r2"]
+    regions = page.regions_intersecting(Box(Point(150, 0), Point(200, 50)))
+    assert regions == []
+
+
+def test_page_crop() -> None:
+    page = spatial_example_page()
+    cropped = page.crop(Box(Point(50, 15), Point(95, 25)))
+    assert cropped.image == page.image
+    assert list(cropped.regions) == ["r1"]
+    assert list(cropped.regions["r1"].textlines) == ["l1"]
+    assert cropped.regions["r1"].textlines["l1"] is page.regions["r1"].textlines["l1"]
+    cropped = page.crop(Box(Point(150, 0), Point(200, 50)))
+    assert cropped.regions == {}
+    cropped = page.crop(Box(Point(95, 95), Point(105, 105)))
+    assert [len(region.textlines) for region in cropped.regions.values()] == [0, 0]
+    assert page.crop(Box(Point(0, 0), Point(200, 200))) == page
+
+
+def test_page_spatial_index_follows_changes() -> None:
+    page = spatial_example_page()
+    assert page.lines_at(Point(150, 50)) == []
+    line = TextLine(id="l4", coords=Coords.parse("140,40 160,60"), text="x")
+    page.regions["r2"].textlines["l4"] = line
+    assert page.lines_at(Point(150, 50)) == [line]
+    del page.regions["r1"]
+    assert page.lines_at(Point(50, 15)) == []
+    line.coords = Coords.parse("0,0 10,10")
+    page.invalidate_index()
+    assert page.lines_at(Point(5, 5)) == [line]
+
+
+def test_page_spatial_index_follows_replaced_lines() -> None:
+    page = spatial_example_page()
+    assert [line.id for line in page.lines_at(Point(50, 15))] == ["l1"]
+    # Same number of lines in the region, with the last one unchanged
+    textlines = page.regions["r1"].textlines
+    l2 = textlines.pop("l2")
+    del textlines["l1"]
+    line = TextLine(id="l5", coords=Coords.parse("10,10 90,10 90,20 10,20"), text="")
+    textlines["l5"] = line
+    textlines["l2"] = l2
+    assert page.lines_at(Point(50, 15)) == [line]
+
+
+def test_page_index_is_not_a_field() -> None:
+    page = spatial_example_page()
+    page.lines_at(Point(50, 15))
+    assert [field.name for field in dataclasses.fields(Page)] == ["image", "regions"]
+    assert page == spatial_example_page()
+    assert "_index" not in repr(page)
+
+
+@given(st_pages(), st_boxes)
+def test_page_spatial_queries(page: Page, box: Box) -> None:
+    lines = [
+        line for region in page.regions.values() for line in region.textlines.values()
+    ]
+    assert page.lines_in(box) == [
+        line for line in lines if box.contains_box(line.coords.polygon.bounding_box())
+    ]
+    assert page.lines_intersecting(box) == [
+        line for line in lines if line.coords.polygon.intersects_box(box)
+    ]
+    assert page.regions_intersecting(box) == [
+        region
+        for region in page.regions.values()
+        if region.coords.polygon.intersects_box(box)
+    ]
+
+
 def test_page_serialization_roundtrip() -> None:
     pa = Page(
         image=Image(filename="a.jpg", width=1920, height=1080),
@@ -858,3 +1258,243 @@ def test_page_serialization_roundtrip() -> None:
         },
     )
     assert Page.from_dict(pa.to_dict()) == pa
+
+
+############### Tests for streaming ####################
+
+STREAMING_XML = """<?xml version='1.0' encoding='utf-8'?>
+    <PcGts xmlns="http://schema.primaresearch.org/PAGE/gts/pagecontent/2019-07-15">
+        <Page imageFilename="a.jpg" imageWidth="800" imageHeight="600">
+            <ReadingOrder/>
+            <TextRegion id="r1">
+                <Coords points="0,0 10,0 10,10 0,10"/>
+                <TextLine id="l1">
+                    <Coords points="1,1 9,1 9,4 1,4"/>
+                    <TextEquiv><Unicode>foo</Unicode></TextEquiv>
+                </TextLine>
+                <TextRegion id="nested">
+                    <Coords points="1,5 9,5 9,9 1,9"/>
+                    <TextLine id="nested-line">
+                        <Coords points="1,5 9,5 9,9 1,9"/>
+                        <TextEquiv><Unicode>nested</Unicode></TextEquiv>
+                    </TextLine>
+                </TextRegion>
+                <TextLine id="l2">
+                    <Coords points="1,5 9,5 9,9 1,9"/>
+                    <TextEquiv><Unicode>bar</Unicode></TextEquiv>
+                </TextLine>
+            </TextRegion>
+            <TextRegion id="r2">
+                <Coords points="20,20 30,20 30,30 20,30"/>
+                <TextLine id="l3">
+                    <Coords points="21,21 29,21 29,29 21,29"/>
+                    <TextEquiv><Unicode>baz</Unicode></TextEquiv>
+                </TextLine>
+            </TextRegion>
+        </Page>
+    </PcGts>
+"""
+
+
+def test_iter_regions_example(tmp_path: Path) -> None:
+    xml_filepath = tmp_path / "test.xml"
+    xml_filepath.write_text(STREAMING_XML, encoding="utf-8")
+    page = Page.from_xml_file(xml_filepath)
+    assert list(iter_regions(xml_filepath)) == list(page.regions.values())
+
+
+def test_iter_textlines_example(tmp_path: Path) -> None:
+    xml_filepath = tmp_path / "test.xml"
+    xml_filepath.write_text(STREAMING_XML, encoding="utf-8")
+    page = Page.from_xml_file(xml_filepath)
+    lines = list(iter_textlines(xml_filepath))
+    assert [line.id for line in lines] == ["l1", "l2", "l3"]
+    assert lines == [
+        line for region in page.regions.values() for line in region.textlines.values()
+    ]
+
+
+def test_iter_regions_invalid_region(tmp_path: Path) -> None:
+    xml_filepath = tmp_path / "test.xml"
+    xml_filepath.write_text(
+        """<PcGts><Page imageFilename="a.jpg"><TextRegion/></Page></PcGts>""",
+        encoding="utf-8",
+    )
+    with pytest.raises(Exception, match="No id found"):
+        list(iter_regions(xml_filepath))
+
+
+def test_iter_regions_missing_file(tmp_path: Path) -> None:
+    missing_file = tmp_path / "does_not_exist.xml"
+    with pytest.raises(FileNotFoundError):
+        list(iter_regions(missing_file))
+
+
+@given(st_pages())
+def test_page_json_roundtrip_arbitrary(page: Page) -> None:
+    assert Page.from_json(page.to_json()) == page
+
+
+############### Tests for writing ####################
+
+
+def test_page_to_xml_example() -> None:
+    page = Page.from_xml_string(STREAMING_XML)
+    xml = page.to_xml_bytes()
+    root = etree.fromstring(xml)
+    assert root.tag == f"{{{PAGE_NAMESPACE}}}PcGts"
+    assert (
+        root.find(f"{{{PAGE_NAMESPACE}}}Metadata/{{{PAGE_NAMESPACE}}}Creator")
+        is not None
+    )
+    page_element = root.find(f"{{{PAGE_NAMESPACE}}}Page")
+    assert page_element is not None
+    assert page_element.get("imageFilename") == "a.jpg"
+    assert page_element.get("imageWidth") == "800"
+    assert page_element.get("imageHeight") == "600"
+    assert Page.from_xml_string(xml.decode("utf-8")) == page
+
+
+def test_page_to_xml_escaping_and_empty() -> None:
+    page = Page(
+        image=Image(filename="a & b.jpg", width=None, height=None),
+        regions={
+            "r": TextRegion(
+                id="r",
+                coords=Coords.parse("1,2 3,4"),
+                textlines={
+                    "l": TextLine(id="l", coords=Coords.parse("1,2 3,4"), text="<&>"),
+                    "e": TextLine(id="e", coords=Coords.parse("1,2 3,4"), text=""),
+                },
+            ),
+            "empty": TextRegion(
+                id="empty", coords=Coords.parse("1,2 3,4"), textlines={}
+            ),
+        },
+    )
+    xml = page.to_xml_bytes()
+    assert b"imageWidth" not in xml
+    assert Page.from_xml_bytes(xml) == page
+
+
+def test_page_to_xml_file(tmp_path: Path) -> None:
+    page = Page.from_xml_string(STREAMING_XML)
+    xml_filepath = tmp_path / "out.xml"
+    page.to_xml_file(xml_filepath)
+    assert Page.from_xml_file(xml_filepath) == page
+    assert read_image(xml_filepath) == page.image
+
+
+def test_streaming_transform(tmp_path: Path) -> None:
+    source = tmp_path / "in.xml"
+    source.write_text(STREAMING_XML, encoding="utf-8")
+    target = tmp_path / "out.xml"
+    with target.open("wb") as fileobj:
+        write_xml(
+            fileobj,
+            read_image(source),
+            (region for region in iter_regions(source) if region.id != "r1"),
+        )
+    page = Page.from_xml_file(target)
+    assert list(page.regions) == ["r2"]
+    assert page.image == Image(filename="a.jpg", width=800, height=600)
+
+
+def test_read_image_invalid(tmp_path: Path) -> None:
+    xml_filepath = tmp_path / "test.xml"
+    xml_filepath.write_text("<PcGts/>", encoding="utf-8")
+    with pytest.raises(PageXMLError, match="No page element found"):
+        read_image(xml_filepath)
+    xml_filepath.write_text("<PcGts><Page/></PcGts>", encoding="utf-8")
+    with pytest.raises(PageXMLError, match="No image filename found"):
+        read_image(xml_filepath)
+
+
+@given(st_pages())
+def test_page_to_xml_roundtrip_arbitrary(page: Page) -> None:
+    assert Page.from_xml_bytes(page.to_xml_bytes()) == page
+
+
+def test_page_to_alto_example() -> None:
+    page = Page.from_xml_string(STREAMING_XML)
+    xml = page.to_alto_bytes()
+    root = etree.fromstring(xml)
+    assert root.tag == f"{{{ALTO_NAMESPACE}}}alto"
+    line = root.find(f".//{{{ALTO_NAMESPACE}}}TextLine")
+    assert line is not None
+    assert line.get("ID") == "l1"
+    assert [line.get(attr) for attr in ("HPOS", "VPOS", "WIDTH", "HEIGHT")] == [
+        "1",
+        "1",
+        "8",
+        "3",
+    ]
+    assert Page.from_alto_bytes(xml) == page
+
+
+def test_page_to_alto_text() -> None:
+    page = Page(
+        image=Image(filename="a.jpg", width=800, height=None),
+        regions={
+            "r": TextRegion(
+                id="r",
+                coords=Coords.parse("0,0 10,5 3,20"),
+                textlines={
+                    "l": TextLine(
+                        id="l", coords=Coords.parse("1,2 3,4"), text=" foo  <bar> "
+                    ),
+                    "e": TextLine(id="e", coords=Coords.parse("1,2 3,4"), text=""),
+                },
+            )
+        },
+    )
+    xml = page.to_alto_bytes()
+    root = etree.fromstring(xml)
+    first_line = root.find(f".//{{{ALTO_NAMESPACE}}}TextLine")
+    assert first_line is not None
+    assert [QName(child).localname for child in first_line] == [
+        "String",
+        "SP",
+        "String",
+        "SP",
+        "String",
+        "SP",
+        "String",
+        "SP",
+        "String",
+    ]
+    converted = Page.from_alto_bytes(xml)
+    assert converted.image == page.image
+    assert list(converted.all_text()) == [" foo  <bar> ", ""]
+    assert converted.regions["r"].coords == Coords.parse("0,0 10,0 10,20 0,20")
+
+
+def test_page_to_alto_file(tmp_path: Path) -> None:
+    page = Page.from_xml_string(STREAMING_XML)
+    alto_filepath = tmp_path / "alto.xml"
+    page.to_alto_file(alto_filepath)
+    assert Page.from_alto_file(alto_filepath) == page
+
+
+def test_page_to_alto_empty_region() -> None:
+    page = Page.from_xml_string(STREAMING_XML)
+    empty = TextRegion(id="empty", coords=Coords.parse("0,0 5,0 5,5"), textlines={})
+    with_empty = Page(image=page.image, regions=page.regions | {"empty": empty})
+    assert Page.from_alto_bytes(with_empty.to_alto_bytes()) == page
+
+
+@given(st_pages())
+def test_page_to_alto_roundtrip_arbitrary(page: Page) -> None:
+    converted = Page.from_alto_bytes(page.to_alto_bytes())
+    assert converted.image == page.image
+    # Regions without lines are skipped
+    assert list(converted.regions) == [
+        id for id, region in page.regions.items() if region.textlines
+    ]
+    assert list(converted.all_text()) == list(page.all_text())
+    for region in page.regions.values():
+        for line in region.textlines.values():
+            box = line.coords.polygon.bounding_box()
+            assert converted.regions[region.id].textlines[line.id].coords == (
+                Coords.from_box(box)
+            )
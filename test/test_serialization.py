@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from hypothesis import given
+
+from pygexml import serialization
+from pygexml.strategies import st_pages, st_polygons
+from pygexml.geometry import Point, Polygon
+from pygexml.image import Image
+from pygexml.page import Coords, TextLine, TextRegion, Page
+from pygexml.serialization import decode_polygon, encode_polygon
+
+# As written by the generic dataclasses-json serialization of earlier versions
+LEGACY_JSON = (
+    '{"image": {"filename": "a.jpg", "width": 800, "height": null}, '
+    '"regions": {"r1": {"id": "r1", "coords": {"polygon": {"points": '
+    '[{"x": 0, "y": 0}, {"x": 10, "y": 10}]}}, "textlines": {"l1": {"id": "l1", '
+    '"coords": {"polygon": {"points": [{"x": 1, "y": 1}, {"x": 9, "y": 9}]}}, '
+    '"text": "f\\u00f6\\u00f6"}}}}}'
+)
+
+LEGACY_PAGE = Page(
+    image=Image(filename="a.jpg", width=800, height=None),
+    regions={
+        "r1": TextRegion(
+            id="r1",
+            coords=Coords.parse("0,0 10,10"),
+            textlines={
+                "l1": TextLine(id="l1", coords=Coords.parse("1,1 9,9"), text="föö")
+            },
+        )
+    },
+)
+
+
+def test_polygon_encoding_example() -> None:
+    polygon = Polygon(points=[Point(1, 2), Point(3, 4)])
+    encoded = {"points": [{"x": 1, "y": 2}, {"x": 3, "y": 4}]}
+    assert encode_polygon(polygon) == encoded
+    assert decode_polygon(encoded) == polygon
+
+
+@given(st_polygons)
+def test_polygon_encoding_roundtrip(polygon: Polygon) -> None:
+    assert decode_polygon(encode_polygon(polygon)) == polygon
+
+
+def test_load_legacy_json() -> None:
+    assert Page.from_json(LEGACY_JSON) == LEGACY_PAGE
+
+
+def test_json_format_unchanged() -> None:
+    assert json.loads(LEGACY_PAGE.to_json()) == json.loads(LEGACY_JSON)
+    assert LEGACY_PAGE.to_dict() == json.loads(LEGACY_JSON)
+
+
+def test_to_json_formatting_options() -> None:
+    assert LEGACY_PAGE.to_json(indent=2, ensure_ascii=False) == json.dumps(
+        json.loads(LEGACY_JSON), indent=2, ensure_ascii=False
+    )
+
+
+def test_image_from_dict_infer_missing() -> None:
+    image = Image.from_dict({"filename": "a.jpg"}, infer_missing=True)
+    assert image == Image(filename="a.jpg", width=None, height=None)
+    with pytest.raises(KeyError):
+        Image.from_dict({"filename": "a.jpg"})
+
+
+@given(st_pages())
+def test_json_roundtrip_without_orjson(page: Page) -> None:
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(serialization, "orjson", None)
+        assert json.loads(page.to_json()) == page.to_dict()
+        assert Page.from_json(page.to_json()) == page
@@ -0,0 +1,42 @@
+from hypothesis import given, strategies as st
+
+from pygexml.strategies import *
+from pygexml.geometry import Box, Point
+from pygexml.spatial import GridIndex
+
+
+def test_empty_grid_index() -> None:
+    index: GridIndex[str] = GridIndex([])
+    assert len(index) == 0
+    assert index.query(Box(Point(0, 0), Point(100, 100))) == []
+    assert index.query_point(Point(17, 42)) == []
+
+
+def test_grid_index_example() -> None:
+    boxes = [
+        Box.from_top_left_width_height(Point(x * 10, y * 10), width=5, height=5)
+        for y in range(10)
+        for x in range(10)
+    ]
+    index = GridIndex((box, n) for n, box in enumerate(boxes))
+    assert len(index) == 100
+    assert index.query_point(Point(23, 33)) == [(boxes[32], 32)]
+    assert index.query_point(Point(27, 37)) == []
+    query = Box(Point(15, 15), Point(30, 20))
+    assert [n for _, n in index.query(query)] == [11, 12, 13, 21, 22, 23]
+    outside = Box(Point(-100, -100), Point(1000, 1000))
+    assert [n for _, n in index.query(outside)] == list(range(100))
+
+
+@given(st.lists(st_boxes), st_boxes)
+def test_grid_index_query(boxes: list[Box], query: Box) -> None:
+    index = GridIndex((box, n) for n, box in enumerate(boxes))
+    expected = [(box, n) for n, box in enumerate(boxes) if box.intersects(query)]
+    assert index.query(query) == expected
+
+
+@given(st.lists(st_boxes, min_size=1), st_points)
+def test_grid_index_query_point(boxes: list[Box], point: Point) -> None:
+    index = GridIndex((box, n) for n, box in enumerate(boxes))
+    expected = [n for n, box in enumerate(boxes) if box.contains(point)]
+    assert [n for _, n in index.query_point(point)] == expected
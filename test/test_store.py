@@ -0,0 +1,125 @@
+from pathlib import Path
+
+import pytest
+from hypothesis import given
+
+from pygexml.strategies import st_pages
+from pygexml.geometry import Box, Point
+from pygexml.page import Coords, Page, TextLine, TextRegion
+from pygexml.store import SQLiteStore, StoreError, StoreHit
+
+from .pages import make_page
+
+
+def test_store_roundtrip(tmp_path: Path) -> None:
+    pages = [make_page(f"{n}.jpg", "foo bar", f"baz {n}") for n in range(5)]
+    with SQLiteStore(tmp_path / "store.db") as store:
+        store.add_many(pages, batch_size=2)
+        assert len(store) == 5
+        assert list(store) == [f"{n}.jpg" for n in range(5)]
+        assert "3.jpg" in store
+        assert "nope" not in store
+    with SQLiteStore.open(tmp_path / "store.db") as store:
+        assert store["3.jpg"] == pages[3]
+        assert list(store["3.jpg"].regions) == ["r1", "r2"]
+        with pytest.raises(KeyError):
+            store["nope"]
+
+
+def test_store_keys(tmp_path: Path) -> None:
+    with SQLiteStore(tmp_path / "store.db") as store:
+        store.add(make_page("a.jpg", "foo"))
+        store.add(make_page("a.jpg", "bar"), key="other")
+        assert list(store) == ["a.jpg", "other"]
+        with pytest.raises(StoreError, match="Duplicate key: a.jpg"):
+            store.add(make_page("a.jpg", "baz"))
+        with pytest.raises(StoreError, match="Duplicate key: b.jpg"):
+            store.add_many([make_page("b.jpg"), make_page("b.jpg")])
+        assert list(store) == ["a.jpg", "other"]
+        assert store.search("baz") == []
+
+
+def test_store_failing_batch_is_rolled_back(tmp_path: Path) -> None:
+    huge = make_page("huge.jpg", "foo")
+    huge.regions["r2"] = TextRegion(
+        id="r2", coords=Coords.parse(f"0,0 {2**40},0"), textlines={}
+    )
+    with SQLiteStore(tmp_path / "store.db") as store:
+        with pytest.raises(StoreError, match="Value out of range"):
+            store.add_many([make_page("a.jpg", "foo"), huge])
+        assert len(store) == 0
+        assert store.search("foo") == []
+        store.add(make_page("a.jpg", "foo"))
+        assert [hit.page for hit in store.search("foo")] == ["a.jpg"]
+
+
+def test_store_search(tmp_path: Path) -> None:
+    with SQLiteStore(tmp_path / "store.db") as store:
+        store.add(make_page("a.jpg", "The quick fox", "jumps over the dog"))
+        store.add(make_page("b.jpg", "Another dog"))
+        assert store.search("dog") == [
+            StoreHit(
+                page="a.jpg",
+                region_id="r1",
+                line=TextLine(
+                    id="l1",
+                    coords=Coords.parse("0,10 100,15"),
+                    text="jumps over the dog",
+                ),
+            ),
+            StoreHit(
+                page="b.jpg",
+                region_id="r1",
+                line=TextLine(
+                    id="l0", coords=Coords.parse("0,0 100,5"), text="Another dog"
+                ),
+            ),
+        ]
+        assert [hit.page for hit in store.search("dog", page="b.jpg")] == ["b.jpg"]
+        assert len(store.search("dog", limit=1)) == 1
+        assert [hit.line.id for hit in store.search("quick OR jumps")] == ["l0", "l1"]
+        assert store.search("fox AND dog") == []
+        with pytest.raises(StoreError, match="Invalid query"):
+            store.search('"unbalanced')
+
+
+def test_store_search_in_box(tmp_path: Path) -> None:
+    with SQLiteStore(tmp_path / "store.db") as store:
+        store.add(make_page("a.jpg", "foo", "foo bar", "foo"))
+        hits = store.search("foo", box=Box(Point(50, 8), Point(60, 16)))
+        assert [hit.line.id for hit in hits] == ["l1"]
+        hits = store.search("foo", box=Box(Point(0, 0), Point(2**40, 2**40)))
+        assert [hit.line.id for hit in hits] == ["l0", "l1", "l2"]
+        assert store.search("foo", box=Box(Point(150, 0), Point(160, 100))) == []
+
+
+def test_store_regions_intersecting(tmp_path: Path) -> None:
+    with SQLiteStore(tmp_path / "store.db") as store:
+        store.add_many([make_page("a.jpg"), make_page("b.jpg")])
+        box = Box(Point(90, 50), Point(210, 60))
+        assert store.regions_intersecting(box) == [
+            ("a.jpg", "r1"),
+            ("a.jpg", "r2"),
+            ("b.jpg", "r1"),
+            ("b.jpg", "r2"),
+        ]
+        assert store.regions_intersecting(
+            Box(Point(250, 0), Point(260, 10)), "b.jpg"
+        ) == [("b.jpg", "r2")]
+
+
+def test_store_invalid_file(tmp_path: Path) -> None:
+    file = tmp_path / "store.db"
+    file.write_bytes(b"not a database" * 100)
+    with pytest.raises(StoreError, match="Not a pygexml store"):
+        SQLiteStore(file)
+
+
+@given(st_pages())
+def test_store_arbitrary_roundtrip(page: Page) -> None:
+    with SQLiteStore(":memory:") as store:
+        try:
+            store.add(page, key="page")
+        except StoreError:
+            return  # values beyond the store's integer range
+        assert store["page"] == page
@@ -1,3 +1,5 @@
+from io import BytesIO
+from pathlib import Path
 from typing import Any
 
 import pytest
@@ -6,9 +8,19 @@ from lxml import etree
 from lxml.etree import _Element as Element
 
 from pygexml.strategies import st_pages_with_dimensions
+from pygexml.geometry import Box, Point
 from pygexml.image import Image
 from pygexml.page import Coords, TextLine, TextRegion, Page
-from pygexml.svg import SVGError, page_to_svg, page_to_svg_string
+from pygexml.svg import (
+    SVGError,
+    Tile,
+    page_to_svg,
+    page_to_svg_file,
+    page_to_svg_string,
+    tile_pyramid,
+    tiles,
+    write_tiles,
+)
 
 SVG_NS = "http://www.w3.org/2000/svg"
 XLINK_NS = "http://www.w3.org/1999/xlink"
@@ -219,3 +231,183 @@ def test_page_to_svg_line_text_content() -> None:
 def test_page_to_svg_line_no_text_element_when_empty() -> None:
     line_g = get_line_g(make_page_with_line(""))
     assert line_g.find(f"{{{SVG_NS}}}text") is None
+
+
+############## Tests for page_to_svg_file ####################
+
+
+def canonical(xml: bytes) -> bytes:
+    parser = etree.XMLParser(remove_blank_text=True)
+    return etree.tostring(etree.fromstring(xml, parser), method="c14n")
+
+
+def test_page_to_svg_file_matches_page_to_svg(tmp_path: Path) -> None:
+    page = make_page_with_line("Hallo & Welt")
+    expected = canonical(etree.tostring(page_to_svg(page)))
+    page_to_svg_file(page, tmp_path / "page.svg")
+    assert canonical((tmp_path / "page.svg").read_bytes()) == expected
+    page_to_svg_file(page, str(tmp_path / "pretty.svg"), pretty=True)
+    assert canonical((tmp_path / "pretty.svg").read_bytes()) == expected
+
+
+def test_page_to_svg_file_pretty() -> None:
+    buffer = BytesIO()
+    page_to_svg_file(make_page_with_line(), buffer, pretty=True)
+    lines = buffer.getvalue().decode("utf-8").splitlines()
+    assert lines[0] == "<?xml version='1.0' encoding='utf-8'?>"
+    assert lines[-1] == "</svg>"
+    assert '    <g id="l1" class="TextLine">' in lines
+    buffer = BytesIO()
+    page_to_svg_file(make_page_with_line(), buffer)
+    assert len(buffer.getvalue().decode("utf-8").splitlines()) < 10
+
+
+def test_page_to_svg_file_no_style() -> None:
+    buffer = BytesIO()
+    page_to_svg_file(make_page(), buffer, include_style=False)
+    assert b"<style" not in buffer.getvalue()
+
+
+def test_page_to_svg_file_raises_without_dimensions(tmp_path: Path) -> None:
+    page = make_page(image=Image(filename="a.jpg", width=None, height=None))
+    with pytest.raises(SVGError):
+        page_to_svg_file(page, BytesIO())
+
+
+@given(st_pages_with_dimensions())
+def test_page_to_svg_file_arbitrary(page: Page) -> None:
+    expected = canonical(etree.tostring(page_to_svg(page)))
+    for pretty in (False, True):
+        buffer = BytesIO()
+        page_to_svg_file(page, buffer, pretty=pretty)
+        assert canonical(buffer.getvalue()) == expected
+
+
+############## Tests for viewports and tiles ####################
+
+
+def make_tiled_page() -> Page:
+    def region(id: str, x: int, y: int) -> TextRegion:
+        return TextRegion(
+            id=id,
+            coords=Coords.parse(
+                f"{x},{y} {x + 100},{y} {x + 100},{y + 50} {x},{y + 50}"
+            ),
+            textlines={
+                f"{id}l": TextLine(
+                    id=f"{id}l",
+                    # wavy upper edge, flattened at low resolution
+                    coords=Coords.parse(
+                        f"{x},{y} {x + 25},{y + 1} {x + 50},{y} {x + 75},{y + 1} "
+                        f"{x + 100},{y} {x + 100},{y + 20} {x},{y + 20}"
+                    ),
+                    text=id,
+                )
+            },
+        )
+
+    return make_page(
+        image=Image(filename="a.jpg", width=1000, height=500),
+        regions={"r1": region("r1", 0, 0), "r2": region("r2", 700, 300)},
+    )
+
+
+def svg_ids(svg: Element) -> list[str]:
+    return [str(g.get("id")) for g in svg.iter(f"{{{SVG_NS}}}g")]
+
+
+def test_page_to_svg_viewport() -> None:
+    page = make_tiled_page()
+    svg = page_to_svg(page, viewport=Box(Point(600, 250), Point(1000, 500)))
+    assert svg.attrib["viewBox"] == "600 250 400 250"
+    assert svg.attrib["width"] == "400"
+    assert svg.attrib["height"] == "250"
+    assert svg_ids(svg) == ["r2", "r2l"]
+    svg = page_to_svg(page, viewport=Box(Point(0, 0), Point(1000, 500)))
+    assert canonical(etree.tostring(svg)) == canonical(
+        etree.tostring(page_to_svg(page))
+    )
+    with pytest.raises(SVGError, match="Viewport"):
+        page_to_svg(page, viewport=Box(Point(10, 10), Point(10, 20)))
+
+
+def test_page_to_svg_tile_size_simplifies() -> None:
+    page = make_tiled_page()
+    svg = page_to_svg(page, tile_size=250, include_image=False)
+    assert svg.attrib["viewBox"] == "0 0 1000 500"
+    assert (svg.attrib["width"], svg.attrib["height"]) == ("250", "125")
+    assert svg.findall(f"{{{SVG_NS}}}image") == []
+    line = svg.find(f".//{{{SVG_NS}}}g[@id='r1l']/{{{SVG_NS}}}path[@class='Coords']")
+    assert line is not None
+    assert line.attrib["d"] == "M 0,0 100,0 100,20 0,20 Z"
+    svg = page_to_svg(page)
+    line = svg.find(f".//{{{SVG_NS}}}g[@id='r1l']/{{{SVG_NS}}}path[@class='Coords']")
+    assert line is not None
+    assert str(line.get("d")).startswith("M 0,0 25,1 50,0")
+
+
+def test_page_to_svg_file_viewport_matches_page_to_svg() -> None:
+    page = make_tiled_page()
+    options: dict[str, Any] = {
+        "viewport": Box(Point(0, 0), Point(400, 400)),
+        "tile_size": 100,
+        "include_image": False,
+    }
+    buffer = BytesIO()
+    page_to_svg_file(page, buffer, **options)
+    expected = canonical(etree.tostring(page_to_svg(page, **options)))
+    assert canonical(buffer.getvalue()) == expected
+
+
+def test_tiles() -> None:
+    page = make_tiled_page()
+    pyramid = list(tiles(page, tile_size=256))
+    assert pyramid[0] == Tile(0, 0, 0, Box(Point(0, 0), Point(1000, 500)))
+    assert [tile for tile in pyramid if tile.level == 1] == [
+        Tile(1, 0, 0, Box(Point(0, 0), Point(512, 500))),
+        Tile(1, 1, 0, Box(Point(512, 0), Point(1000, 500))),
+    ]
+    assert len([tile for tile in pyramid if tile.level == 2]) == 4 * 2
+    assert max(tile.level for tile in pyramid) == 2
+    with pytest.raises(SVGError, match="Tile size"):
+        list(tiles(page, tile_size=0))
+
+
+def test_tile_pyramid_contains_intersecting_elements() -> None:
+    page = make_tiled_page()
+    contents = {
+        (tile.level, tile.column, tile.row): svg_ids(etree.fromstring(svg))
+        for tile, svg in tile_pyramid(page, tile_size=256)
+    }
+    assert contents[(0, 0, 0)] == ["r1", "r1l", "r2", "r2l"]
+    assert contents[(1, 0, 0)] == ["r1", "r1l"]
+    assert contents[(1, 1, 0)] == ["r2", "r2l"]
+    assert contents[(2, 1, 1)] == []
+    assert contents[(2, 2, 1)] == ["r2", "r2l"]
+
+
+def test_tile_pyramid_edge_tiles_keep_the_level_scale() -> None:
+    page = make_page(image=Image(filename="a.jpg", width=600, height=300), regions={})
+    sizes = {
+        (tile.level, tile.column, tile.row): (
+            etree.fromstring(svg).attrib["width"],
+            etree.fromstring(svg).attrib["height"],
+        )
+        for tile, svg in tile_pyramid(page, tile_size=256)
+    }
+    assert sizes[(0, 0, 0)] == ("150", "75")
+    assert sizes[(1, 0, 0)] == ("256", "150")
+    assert sizes[(1, 1, 0)] == ("44", "150")
+    assert sizes[(2, 0, 0)] == ("256", "256")
+    assert sizes[(2, 2, 1)] == ("88", "44")
+
+
+def test_write_tiles(tmp_path: Path) -> None:
+    files = write_tiles(make_tiled_page(), tmp_path, tile_size=512)
+    assert sorted(file.relative_to(tmp_path).as_posix() for file in files) == [
+        "0/0_0.svg",
+        "1/0_0.svg",
+        "1/1_0.svg",
+    ]
+    svg = etree.parse(str(tmp_path / "1" / "1_0.svg")).getroot()
+    assert svg.attrib["viewBox"] == "512 0 488 500"
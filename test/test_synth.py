@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from pygexml.batch import BatchError
+from pygexml.page import Page
+from pygexml.synth import (
+    Layout,
+    SynthError,
+    generate_page,
+    generate_pages,
+    write_corpus,
+)
+
+
+def lines_of(page: Page) -> list[tuple[str, int]]:
+    return [(region.id, len(region.textlines)) for region in page.regions.values()]
+
+
+def test_generate_page_is_deterministic() -> None:
+    assert generate_page(seed=1, number=5) == generate_page(seed=1, number=5)
+    assert generate_page(seed=1, number=5) != generate_page(seed=2, number=5)
+    assert generate_page(seed=1, number=5) != generate_page(seed=1, number=6)
+    assert list(generate_pages(3, seed=1))[2] == generate_page(seed=1, number=2)
+
+
+def test_generate_page_layout() -> None:
+    layout = Layout(
+        width=1000,
+        height=2000,
+        columns=3,
+        regions_per_column=2,
+        lines_per_region=10,
+        vertices=6,
+        words_per_line=(2, 4),
+    )
+    page = generate_page(layout, number=7)
+    assert page.image.filename == "page-000007.jpg"
+    assert (page.image.width, page.image.height) == (1000, 2000)
+    assert len(page.regions) == 6
+    assert all(count == 10 for _, count in lines_of(page))
+    for region in page.regions.values():
+        region_box = region.coords.polygon.bounding_box()
+        assert 0 <= region_box.top_left.x and region_box.bottom_right.x <= 1000
+        assert 0 <= region_box.top_left.y and region_box.bottom_right.y <= 2000
+        for line in region.textlines.values():
+            assert len(line.coords.polygon) == 6
+            assert 2 <= len(list(line.words())) <= 4
+            assert region_box.contains_box(line.coords.polygon.bounding_box())
+
+
+def test_generate_page_spans() -> None:
+    page = generate_page(Layout(lines_per_region=(0, 3), words_per_line=0))
+    assert all(0 <= count <= 3 for _, count in lines_of(page))
+    assert all(text == "" for text in page.all_text())
+
+
+@pytest.mark.parametrize(
+    "layout, message",
+    [
+        (Layout(columns=0), "columns"),
+        (Layout(lines_per_region=(5, 2)), "lines_per_region"),
+        (Layout(words_per_line=-1), "words_per_line"),
+        (Layout(vertices=3), "vertices"),
+        (Layout(width=100, margin=60), "too small"),
+        (Layout(height=500, lines_per_region=1000), "Too many lines"),
+    ],
+)
+def test_generate_page_invalid_layout(layout: Layout, message: str) -> None:
+    with pytest.raises(SynthError, match=message):
+        generate_page(layout)
+
+
+@settings(max_examples=20)
+@given(
+    st.integers(min_value=0, max_value=2**32),
+    st.integers(min_value=4, max_value=30),
+)
+def test_generate_page_roundtrip(seed: int, vertices: int) -> None:
+    page = generate_page(Layout(vertices=vertices, lines_per_region=(0, 5)), seed)
+    assert Page.from_xml_bytes(page.to_xml_bytes()) == page
+
+
+def test_write_corpus(tmp_path: Path) -> None:
+    layout = Layout(lines_per_region=3)
+    files = write_corpus(
+        tmp_path, 4, layout, seed=3, formats=("page", "alto"), executor="thread"
+    )
+    assert [file.relative_to(tmp_path).as_posix() for file in files[:2]] == [
+        "page/page-000000.xml",
+        "alto/page-000000.xml",
+    ]
+    assert len(files) == 8
+    page = Page.from_xml_file(tmp_path / "page" / "page-000003.xml")
+    assert page == generate_page(layout, seed=3, number=3)
+    alto = Page.from_alto_file(tmp_path / "alto" / "page-000003.xml")
+    assert list(alto.all_text()) == list(page.all_text())
+
+
+def test_write_corpus_invalid_options(tmp_path: Path) -> None:
+    with pytest.raises(BatchError, match="Unknown format"):
+        write_corpus(tmp_path, 1, formats=("nope",))  # type: ignore[arg-type]
+    with pytest.raises(SynthError):
+        write_corpus(tmp_path, 1, Layout(vertices=2))
+    assert list(tmp_path.iterdir()) == []